@@ -8,6 +8,8 @@
 #define servo2_rotation_angle 25
 #define default_angle 90
 #define delay_time 2500
+#define movepath_step_delay 8   // ms between HID reports, about one BLE connection interval
+#define movepath_max_count 1000 // upper bound on repeats per MOVEPATH token
 
 Servo servo1;
 Servo servo2;
@@ -33,7 +35,15 @@ void loop() {
       String command = Serial.readStringUntil('\n'); // Read a command from Serial
       command.trim(); // Remove leading and trailing whitespace
 
-      if (command.startsWith("MOVE")) {
+      if (command.equalsIgnoreCase("PING")) {
+        // Health check command
+        Serial.println("PONG");
+      }
+      else if (command.startsWith("MOVEPATH")) {
+        // Format: MOVEPATH dx:dy:count [dx:dy:count ...]
+        movePath(command.substring(8));
+      }
+      else if (command.startsWith("MOVE")) {
         // Format: MOVE x y
         int x, y;
         sscanf(command.c_str(), "MOVE %d %d", &x, &y);
@@ -131,10 +141,6 @@ void loop() {
           delay(100);
           Keyboard.releaseAll();
         }
-        else if (command.equalsIgnoreCase("PING")) {
-        // Health check command
-        Serial.println("PONG");
-      }
         else if (action.equalsIgnoreCase("SPACE")) {
           Serial.println("Sending Space (Activate selected item)...");
           Keyboard.press(' ');
@@ -344,7 +350,7 @@ void loop() {
         }
       }
       else {
-        Serial.println("Unknown command. Use: MOVE, SCROLL, CLICK, PRINT, WRITE, KEYPRESS, or TOUCH.");
+        Serial.println("Unknown command. Use: PING, MOVE, MOVEPATH, SCROLL, CLICK, PRINT, WRITE, KEYPRESS, or TOUCH.");
       }
     }
   }
@@ -356,6 +362,35 @@ void moveMouse(int x, int y) {
   Mouse.move(x, y);
 }
 
+// Function to replay a list of relative steps and acknowledge once
+void movePath(String path) {
+  path.trim();
+  char buffer[path.length() + 1];
+  path.toCharArray(buffer, sizeof(buffer));
+
+  long totalX = 0, totalY = 0;
+  int reports = 0;
+  char *saveptr;
+  for (char *token = strtok_r(buffer, " ", &saveptr); token != NULL; token = strtok_r(NULL, " ", &saveptr)) {
+    int dx, dy, count;
+    if (sscanf(token, "%d:%d:%d", &dx, &dy, &count) != 3) {
+      Serial.printf("MOVEPATH error: bad step '%s'\n", token);
+      return;
+    }
+    dx = constrain(dx, -127, 127);
+    dy = constrain(dy, -127, 127);
+    count = constrain(count, 0, movepath_max_count);
+    for (int i = 0; i < count; i++) {
+      Mouse.move(dx, dy);
+      reports++;
+      delay(movepath_step_delay);
+    }
+    totalX += (long)dx * count;
+    totalY += (long)dy * count;
+  }
+  Serial.printf("Moved path: reports=%d, x=%ld, y=%ld\n", reports, totalX, totalY);
+}
+
 // Function to scroll the mouse
 void scrollMouse(int scrollX, int scrollY) {
   Serial.printf("Scrolling mouse: scrollX=%d, scrollY=%d\n", scrollX, scrollY);
@@ -15,7 +15,8 @@ import pointer_recognize
 class AppManager:
     
 
-    def __init__(self, config: Config, esp32, screenshot_manager=None, omniparser_client=None):
+    def __init__(self, config: Config, esp32, screenshot_manager=None, omniparser_client=None,
+                 mouse_controller=None):
         self.config = config
         self.esp32 = esp32
         self.screenshot_manager = screenshot_manager
@@ -25,8 +26,10 @@ class AppManager:
         self._load_app_cache()
 
         
-        from mouse_controller import MouseController
-        self.mouse_controller = MouseController(self.config, self.esp32)
+        if mouse_controller is None:
+            from mouse_controller import MouseController
+            mouse_controller = MouseController(self.config, self.esp32)
+        self.mouse_controller = mouse_controller
 
         
         self._initialize_mouse_system()
@@ -206,8 +209,7 @@ class AppManager:
             if 'ocr' not in element.get('source', ''):
                 continue
 
-            similarity = StateGraph.text_similarity(element.get('content', ''), app_name)
-            if similarity > 0.8:
+            if StateGraph.text_similarity_exceeds(element.get('content', ''), app_name, 0.8):
                 position = self._get_element_center(element)
                 self.logger.info(f"Found cached app {app_name} at {position}")
                 return True, position
@@ -243,8 +245,7 @@ class AppManager:
                 if 'ocr' not in element.get('source', ''):
                     continue
 
-                similarity = StateGraph.text_similarity(element.get('content', ''), app_name)
-                if similarity > 0.8:
+                if StateGraph.text_similarity_exceeds(element.get('content', ''), app_name, 0.8):
                     position = self._get_element_center(element)
                     self.logger.info(f"Found app {app_name} on page {current_page} at {position}")
                     self._update_app_cache(app_name, current_page)
@@ -297,8 +298,7 @@ class AppManager:
         current_content = ''.join(sorted([elem.get('content', '') for elem in current_elements]))
         previous_content = ''.join(sorted([elem.get('content', '') for elem in previous_elements]))
 
-        similarity = StateGraph.text_similarity(current_content, previous_content)
-        return similarity > 0.8
+        return StateGraph.text_similarity_exceeds(current_content, previous_content, 0.8)
 
     def _get_element_center(self, element: Dict) -> Tuple[int, int]:
         
@@ -350,8 +350,7 @@ class AppManager:
     def _get_cached_app_info(self, app_name: str) -> Optional[AppCacheEntry]:
         
         for cached_name, entry in self.app_cache.items():
-            similarity = StateGraph.text_similarity(app_name, cached_name)
-            if similarity > 0.8:
+            if StateGraph.text_similarity_exceeds(app_name, cached_name, 0.8):
                 return entry
         return None
 
@@ -359,8 +358,7 @@ class AppManager:
         
         
         for cached_name in list(self.app_cache.keys()):
-            similarity = StateGraph.text_similarity(app_name, cached_name)
-            if similarity > 0.8:
+            if StateGraph.text_similarity_exceeds(app_name, cached_name, 0.8):
                 if cached_name != app_name:
                     
                     entry = self.app_cache.pop(cached_name)
@@ -397,14 +395,21 @@ class AppManager:
             if self.screenshot_manager:
                 screenshot_result = self.screenshot_manager.take_screenshot()
                 
-                if hasattr(screenshot_result, 'file_path'):
-                    screenshot_path = screenshot_result.file_path
+                if hasattr(screenshot_result, 'image'):
+                    screenshot = screenshot_result.image
                 else:
                     
-                    screenshot_path = screenshot_result
-
-                if screenshot_path:
-                    pointer = pointer_recognize.find_pointer_centers(screenshot_path)
+                    screenshot = screenshot_result
+
+                if screenshot is not None:
+                    if self.config.mouse.pyramid_detection:
+                        return pointer_recognize.find_pointer_pyramid(
+                            screenshot, scale=self.config.mouse.pyramid_scale,
+                            debug=self.config.mouse.pointer_debug
+                        )
+                    pointer = pointer_recognize.find_pointer_centers(
+                        screenshot, debug=self.config.mouse.pointer_debug
+                    )
                     return pointer
         except Exception as e:
             self.logger.warning(f"Pointer detection failed: {e}")
@@ -0,0 +1,137 @@
+import io
+import os
+import sys
+import glob
+import time
+import argparse
+import contextlib
+import statistics
+
+import cv2
+
+from config import Config
+import pointer_recognize
+
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.webp")
+
+
+def find_screenshots(screenshot_dir: str, limit: int = None):
+
+    paths = []
+    for pattern in IMAGE_PATTERNS:
+        paths.extend(glob.glob(os.path.join(screenshot_dir, "**", pattern), recursive=True))
+    paths = sorted(p for p in paths if "pointer_template" not in os.path.basename(p))
+    return paths[:limit] if limit else paths
+
+
+def time_detector(detector, image, repeat: int):
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = detector(image)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+
+    config = Config()
+    parser = argparse.ArgumentParser(
+        description="Compare full-frame and pyramid pointer detection on saved screenshots"
+    )
+    parser.add_argument(
+        '--screenshots',
+        type=str,
+        default=config.paths.screenshot_dir,
+        help=f'Directory of saved screenshots (default: {config.paths.screenshot_dir})'
+    )
+    parser.add_argument(
+        '--template',
+        type=str,
+        default='../screenshots/pointer_template_main.png',
+        help='Pointer template image (default: ../screenshots/pointer_template_main.png)'
+    )
+    parser.add_argument(
+        '--scale',
+        type=int,
+        default=config.mouse.pyramid_scale,
+        help=f'Pyramid downscale factor (default: {config.mouse.pyramid_scale})'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=int,
+        default=config.mouse.tolerance,
+        help=f'Maximum distance in pixels for results to agree (default: {config.mouse.tolerance})'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timed runs per image and detector, best run is reported (default: 3)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Limit number of screenshots'
+    )
+    args = parser.parse_args()
+
+    pointer_recognize.analyze_pointer_template(args.template)
+
+    paths = find_screenshots(args.screenshots, args.limit)
+    if not paths:
+        print(f"No screenshots found in {args.screenshots}")
+        return 1
+
+    full_times, pyramid_times = [], []
+    agree, both_missing, disagreements = 0, 0, []
+
+    for path in paths:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"Skipping unreadable image: {path}")
+            continue
+
+        full, full_time = time_detector(pointer_recognize.find_pointer_centers, image, args.repeat)
+        pyramid, pyramid_time = time_detector(
+            lambda img: pointer_recognize.find_pointer_pyramid(img, scale=args.scale), image, args.repeat
+        )
+        full_times.append(full_time)
+        pyramid_times.append(pyramid_time)
+
+        if full is None and pyramid is None:
+            both_missing += 1
+            agree += 1
+        elif full is not None and pyramid is not None and \
+                ((full[0] - pyramid[0]) ** 2 + (full[1] - pyramid[1]) ** 2) ** 0.5 <= args.tolerance:
+            agree += 1
+        else:
+            disagreements.append((path, full, pyramid))
+
+    count = len(full_times)
+    if count == 0:
+        print("No readable screenshots")
+        return 1
+
+    print(f"\n{'='*60}")
+    print(f"Pointer detection benchmark ({count} screenshots, scale 1/{args.scale})")
+    print(f"{'='*60}")
+    print(f"Full frame: mean {statistics.mean(full_times) * 1000:.1f}ms, "
+          f"median {statistics.median(full_times) * 1000:.1f}ms")
+    print(f"Pyramid:    mean {statistics.mean(pyramid_times) * 1000:.1f}ms, "
+          f"median {statistics.median(pyramid_times) * 1000:.1f}ms")
+    print(f"Speedup:    {sum(full_times) / max(sum(pyramid_times), 1e-9):.1f}x")
+    print(f"Agreement within {args.tolerance}px: {agree}/{count} ({both_missing} with no pointer)")
+
+    for path, full, pyramid in disagreements:
+        print(f"  - {os.path.basename(path)}: full={full} pyramid={pyramid}")
+
+    return 0 if not disagreements else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
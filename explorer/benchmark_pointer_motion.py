@@ -0,0 +1,182 @@
+import sys
+import time
+import random
+import logging
+import argparse
+import statistics
+
+from config import Config
+from core_types import ScreenshotResult
+from motion_model import MotionModel
+import mouse_controller
+from mouse_controller import MouseController
+
+
+class SimulatedClock:
+
+    @staticmethod
+    def time():
+        return time.time()
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+class SimulatedDevice:
+
+
+    def __init__(self, config: Config, gain_x: float, gain_y: float, noise: float, nonlinearity: float,
+                 width: int, height: int, rng: random.Random):
+        self.config = config
+        self.gain = (gain_x, gain_y)
+        self.noise = noise
+        self.nonlinearity = nonlinearity
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.x = width / 2
+        self.y = height / 2
+        self.round_trips = 0
+
+    def _displacement(self, value: int, axis: int) -> float:
+
+        magnitude = abs(value)
+        if magnitude == 20:
+            displacement = self.config.mouse.step20
+        elif magnitude == 10:
+            displacement = self.config.mouse.step10
+        else:
+            displacement = magnitude
+        position = self.x / self.width if axis == 0 else self.y / self.height
+        displacement *= self.gain[axis] * (1 + self.nonlinearity * (position - 0.5))
+        displacement *= 1 + self.rng.gauss(0, self.noise)
+        return displacement if value > 0 else -displacement
+
+    def _report(self, dx: int, dy: int):
+
+        self.x = min(max(self.x + self._displacement(dx, 0), 0), self.width - 1)
+        self.y = min(max(self.y + self._displacement(dy, 1), 0), self.height - 1)
+
+    def move_mouse(self, x, y):
+        self.round_trips += 1
+        self._report(x, y)
+        return True
+
+    def move_burst(self, moves):
+        self.round_trips += 1
+        for dx, dy in moves:
+            self._report(dx, dy)
+        return True
+
+    def move_path(self, steps):
+        self.round_trips += 1
+        for dx, dy, count in steps:
+            for _ in range(count):
+                self._report(dx, dy)
+        return True
+
+
+class SimulatedScreen:
+
+
+    def __init__(self, device: SimulatedDevice):
+        self.device = device
+
+    def get_screen_dimensions(self):
+        return self.device.width, self.device.height
+
+    def wait_for_frame_after(self, after, timeout=None, source=None):
+        return ScreenshotResult(success=True, file_path=None, timestamp="", image=self.device)
+
+    take_screenshot = wait_for_frame_after
+
+
+class SimulatedMouseController(MouseController):
+
+
+    def _find_pointer_full_frame(self, screenshot):
+        return int(round(screenshot.x)), int(round(screenshot.y))
+
+    def _check_password_input(self, screenshot):
+        return False
+
+
+def run_mode(mode: str, args, motion_model: MotionModel = None, seed: int = None) -> dict:
+
+    rng = random.Random(args.seed if seed is None else seed)
+    config = Config()
+    config.mouse.motion_mode = mode
+    config.mouse.roi_tracking = False
+    config.motion_model.persist = False
+    device = SimulatedDevice(config, args.gain_x, args.gain_y, args.noise, args.nonlinearity,
+                             args.width, args.height, rng)
+    screen = SimulatedScreen(device)
+    controller = SimulatedMouseController(config, device, motion_model)
+
+    margin = 100
+    successes, screenshots, round_trips, errors = 0, [], [], []
+    for _ in range(args.moves):
+        target_x = rng.randint(margin, args.width - margin)
+        target_y = rng.randint(margin, args.height - margin)
+        start_trips = device.round_trips
+        result = controller.move_to_target(target_x, target_y, screen, tolerance=config.mouse.tolerance)
+        if result.success:
+            successes += 1
+        screenshots.append(result.screenshots or 0)
+        round_trips.append(device.round_trips - start_trips)
+        errors.append(max(abs(device.x - target_x), abs(device.y - target_y)))
+
+    return {
+        'success_rate': successes / args.moves * 100,
+        'screenshots': statistics.mean(screenshots),
+        'round_trips': statistics.mean(round_trips),
+        'final_error': statistics.mean(errors),
+        'first_screenshots': statistics.mean(screenshots[:args.warmup]),
+        'motion_model': controller.motion_model,
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compare closed-loop and predictive pointer motion on a simulated device"
+    )
+    parser.add_argument('--moves', type=int, default=200, help='Random target moves per mode (default: 200)')
+    parser.add_argument('--gain-x', type=float, default=1.15,
+                        help='True device gain on x relative to the step model (default: 1.15)')
+    parser.add_argument('--gain-y', type=float, default=0.9,
+                        help='True device gain on y relative to the step model (default: 0.9)')
+    parser.add_argument('--noise', type=float, default=0.03,
+                        help='Relative per-report displacement noise (default: 0.03)')
+    parser.add_argument('--nonlinearity', type=float, default=0.4,
+                        help='Gain change across the screen, relative to the centre gain (default: 0.4)')
+    parser.add_argument('--warmup', type=int, default=10,
+                        help='Number of initial moves reported separately (default: 10)')
+    parser.add_argument('--width', type=int, default=3024, help='Screen width (default: 3024)')
+    parser.add_argument('--height', type=int, default=1964, help='Screen height (default: 1964)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    mouse_controller.time = SimulatedClock
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger('mouse_controller').setLevel(logging.CRITICAL)
+
+    print(f"\n{'='*60}")
+    print(f"Pointer motion benchmark ({args.moves} moves, gain=({args.gain_x}, {args.gain_y}), "
+          f"nonlinearity={args.nonlinearity}, noise={args.noise})")
+    print(f"{'='*60}")
+    closed_loop = run_mode("closed_loop", args)
+    cold = run_mode("predictive", args)
+    warm = run_mode("predictive", args, motion_model=cold['motion_model'], seed=args.seed + 1)
+    for name, stats in (("closed_loop", closed_loop), ("predictive", cold), ("warm model", warm)):
+        print(f"{name:12s} success {stats['success_rate']:.1f}%, "
+              f"screenshots/move {stats['screenshots']:.2f} (first {args.warmup}: {stats['first_screenshots']:.2f}), "
+              f"serial round-trips/move {stats['round_trips']:.2f}, "
+              f"mean final error {stats['final_error']:.1f}px")
+    print(f"Learned motion model: {warm['motion_model'].summary()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import sys
+import time
+import random
+import logging
+import argparse
+import statistics
+
+from config import Config
+from core_types import Button, State
+from state_comparator import LayoutAwareComparator
+from state_graph import StateGraph
+
+
+WORDS = ["Settings", "Wi-Fi", "Bluetooth", "Display", "Sound", "Battery", "Storage", "About", "Privacy",
+         "Apps", "Library", "Store", "Camera", "Guardian", "Controllers", "Accounts", "Notifications",
+         "Help", "Cancel", "Save", "Open", "Back", "Next", "Search", "Friends", "Party", "Explore",
+         "Home", "Profile", "Install", "Update", "Download", "Play", "Pause", "Volume", "Brightness"]
+
+
+def random_label(rng: random.Random) -> str:
+
+    return " ".join(rng.sample(WORDS, rng.choice((1, 1, 2, 3))))
+
+
+def random_state(rng: random.Random, min_buttons: int, max_buttons: int) -> State:
+
+    buttons = []
+    for i in range(rng.randint(min_buttons, max_buttons)):
+        x, y = rng.uniform(0, 0.9), rng.uniform(0, 0.95)
+        buttons.append(Button(id=str(i), content=random_label(rng),
+                              bbox=[x, y, x + rng.uniform(0.03, 0.1), y + rng.uniform(0.02, 0.05)],
+                              interactivity=True, source='box_ocr_content_ocr'))
+    return State(buttons)
+
+
+def perturb(rng: random.Random, state: State) -> State:
+
+    buttons = []
+    for button in state.buttons:
+        content = button.content
+        if content and rng.random() < 0.15:
+            i = rng.randrange(len(content))
+            content = content[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + content[i + 1:]
+        shift = rng.uniform(-0.01, 0.01)
+        bbox = [button.bbox[0] + shift, button.bbox[1], button.bbox[2] + shift, button.bbox[3]]
+        buttons.append(Button(id=button.id, content=content, bbox=bbox,
+                              interactivity=button.interactivity, source=button.source))
+    if buttons and rng.random() < 0.5:
+        buttons.pop(rng.randrange(len(buttons)))
+    return State(buttons)
+
+
+def time_matcher(matcher, pairs, repeat: int):
+
+    timings = []
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [matcher(state1, state2) for state1, state2 in pairs]
+        timings.append(time.perf_counter() - start)
+    return results, min(timings) / max(len(pairs), 1)
+
+
+def main():
+
+    config = Config()
+    parser = argparse.ArgumentParser(
+        description="Compare check_same_states and the layout-aware comparator on state pairs"
+    )
+    parser.add_argument('--graph', type=str,
+                        help='State graph JSON export to take states from (default: synthetic states)')
+    parser.add_argument('--states', type=int, default=60, help='Synthetic states to generate (default: 60)')
+    parser.add_argument('--min-buttons', type=int, default=6, help='Minimum buttons per synthetic state (default: 6)')
+    parser.add_argument('--max-buttons', type=int, default=30, help='Maximum buttons per synthetic state (default: 30)')
+    parser.add_argument('--pairs', type=int, default=2000, help='State pairs to compare (default: 2000)')
+    parser.add_argument('--text-floor', type=float, default=config.state_matching.text_floor,
+                        help=f'Comparator text floor (default: {config.state_matching.text_floor})')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per matcher, best run is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    rng = random.Random(args.seed)
+    if args.graph:
+        graph = StateGraph(use_index=False)
+        graph.warm_start_from_json(args.graph)
+        states = graph.nodes
+    else:
+        states = [random_state(rng, args.min_buttons, args.max_buttons) for _ in range(args.states)]
+    if len(states) < 2:
+        print("Need at least two states")
+        return 1
+
+    pairs = []
+    for i in range(args.pairs):
+        state = rng.choice(states)
+        other = perturb(rng, state) if i % 2 == 0 else rng.choice(states)
+        pairs.append((other, state))
+
+    matching = config.state_matching
+    unbounded = LayoutAwareComparator.from_config(config)
+    unbounded.text_floor = 0.0
+    bounded = LayoutAwareComparator.from_config(config)
+    bounded.text_floor = args.text_floor
+
+    matchers = (
+        ("check_same_states", lambda s1, s2: StateGraph.check_same_states(s1, s2, matching.tolerance)),
+        ("layout (no floor)", unbounded.same_states),
+        (f"layout (floor {args.text_floor})", bounded.same_states),
+    )
+    results = {}
+    print(f"\n{'='*60}")
+    print(f"State matching benchmark ({len(pairs)} pairs over {len(states)} states, "
+          f"mean {statistics.mean(len(s.buttons) for s in states):.1f} buttons)")
+    print(f"{'='*60}")
+    for name, matcher in matchers:
+        results[name], per_pair = time_matcher(matcher, pairs, args.repeat)
+        print(f"{name:22s} {per_pair * 1e6:8.1f}us/pair, {sum(results[name])} matches")
+
+    baseline = results["check_same_states"]
+    for name, _ in matchers[1:]:
+        agree = sum(a == b for a, b in zip(results[name], baseline))
+        print(f"{name:22s} agrees with check_same_states on {agree}/{len(pairs)} pairs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,10 @@
 
 
 import os
+import re
 import time
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 
 @dataclass
@@ -37,11 +38,16 @@ class MouseConfig:
     bouncing_leg_step: int = 1
     tolerance: int = 15
     max_attempts: int = 10
+    batched_moves: bool = True  
+    motion_mode: str = "closed_loop"  
 
     
-    ratio_learning_samples: int = 3
-    ratio_learning_rate: float = 0.3
-    min_ratio_samples: int = 3
+    roi_tracking: bool = True
+    roi_margin: int = 150  
+    roi_motion_error: float = 0.5  
+    pyramid_detection: bool = True
+    pyramid_scale: int = 4
+    pointer_debug: bool = False  
 
 
 @dataclass
@@ -63,6 +69,76 @@ class ExplorationConfig:
     enable_home_detection: bool = True  
     max_home_returns: int = 3  
     max_no_movement_attempts: int = 5  
+    max_resume_attempts: int = 3  
+    post_click_delay: float = 1.0  
+    post_restart_delay: float = 3.0  
+    warm_start: bool = False  
+    warm_start_file: str = ""  
+
+
+@dataclass
+class StateMatchingConfig:
+    
+    use_index: bool = True
+    use_layout: bool = False  
+    tolerance: float = 0.7
+    text_weight: float = 0.6
+    layout_weight: float = 0.4
+    center_scale: float = 0.1
+    size_tolerance: float = 0.7
+    text_floor: float = 0.5  
+
+
+@dataclass
+class FrameGrabberConfig:
+    
+    enabled: bool = True  
+    buffer_size: int = 4
+    max_frame_age: float = 0.5  
+    wait_timeout: float = 10.0
+    reconnect_delay: float = 1.0
+    pipeline_latency: float = 0.05  
+
+
+@dataclass
+class ScreenshotPersistenceConfig:
+    
+    enabled: bool = True
+    sample_every: int = 10  
+    queue_size: int = 8  
+
+
+@dataclass
+class SettleConfig:
+    
+    enabled: bool = True
+    diff_threshold: float = 2.0  
+    stable_frames: int = 3
+    timeout: float = 5.0
+    min_wait: float = 0.15  
+    width: int = 64
+
+
+@dataclass
+class MotionModelConfig:
+    
+    persist: bool = True
+    grid_rows: int = 3
+    grid_cols: int = 3
+    magnitude_edges: Tuple[float, ...] = (80.0, 250.0, 700.0)  
+    learning_rate: float = 0.3
+    prior_weight: float = 2.0  
+    min_distance: int = 40  
+    save_every: int = 5
+
+
+@dataclass
+class FingerprintConfig:
+    
+    enabled: bool = True
+    hash_size: int = 16
+    max_distance: int = 6  
+    max_fingerprints_per_state: int = 4
 
 
 @dataclass
@@ -73,6 +149,10 @@ class OmniParserConfig:
     use_paddleocr: bool = False
     imgsz: int = 640
     timeout: float = 60.0
+    cache_enabled: bool = True
+    cache_max_entries: int = 500
+    cache_max_bytes: int = 200 * 1024 * 1024
+    cache_max_distance: int = 0  
 
 
 @dataclass
@@ -81,6 +161,11 @@ class PathConfig:
     screenshot_dir: str = "/mnt/ssd2/VR_monkey/screenshots"
     exploration_results_dir: str = "exploration_results"
     app_cache_file: str = "app_cache.pkl"
+    state_store_file: str = "state_graph.db"
+    state_graph_file: str = "state_graph.json"
+    state_graph_format: str = "json"  
+    omniparser_cache_dir: str = "omniparser_cache"
+    motion_model_dir: str = "motion_models"
     use_timestamp: bool = True  
 
     def get_app_dir(self, app_name: str, run_timestamp: Optional[str] = None) -> str:
@@ -92,6 +177,23 @@ class PathConfig:
             
             return os.path.join(self.exploration_results_dir, app_name)
 
+    def get_state_graph_filenames(self) -> List[str]:
+        
+        stem = os.path.splitext(self.state_graph_file)[0]
+        filenames = [f"{stem}.json", f"{stem}.jsonl"]
+        return filenames[::-1] if self.state_graph_format == "jsonl" else filenames
+
+    def get_omniparser_cache_dir(self, app_name: str) -> str:
+        return os.path.join(self.exploration_results_dir, app_name, self.omniparser_cache_dir)
+
+    def get_motion_model_file(self, esp32_port: str, headset_name: str = "") -> str:
+        
+        device = os.path.basename(esp32_port.rstrip("/")) or "default"
+        if headset_name:
+            device = f"{device}-{headset_name}"
+        device = re.sub(r"[^A-Za-z0-9_.-]+", "_", device)
+        return os.path.join(self.exploration_results_dir, self.motion_model_dir, f"{device}.json")
+
     def get_state_images_dir(self, app_name: str, run_timestamp: Optional[str] = None) -> str:
         return os.path.join(self.get_app_dir(app_name, run_timestamp), "state_images")
 
@@ -113,6 +215,9 @@ class AppConfig:
     name: str = "Linkeeper"
     esp32_port: str = "/dev/serial/by-id/usb-Arduino_Nano_ESP32_DCDA0C20E178-if01"
     esp32_debug: bool = False
+    headset_name: str = ""  
+    esp32_heartbeat_interval: float = 5.0  
+    esp32_heartbeat_timeout: float = 3.0
     enable_metrics: bool = True
     screenshot_source: str = "remote"  
 
@@ -124,8 +229,14 @@ class Config:
         self.network = NetworkConfig()
         self.mouse = MouseConfig()
         self.screen = ScreenConfig()
+        self.frame_grabber = FrameGrabberConfig()
+        self.screenshot_persistence = ScreenshotPersistenceConfig()
         self.exploration = ExplorationConfig()
+        self.state_matching = StateMatchingConfig()
         self.omniparser = OmniParserConfig()
+        self.fingerprint = FingerprintConfig()
+        self.settle = SettleConfig()
+        self.motion_model = MotionModelConfig()
         self.paths = PathConfig()
         self.app = AppConfig()
         self.video_recorder = VideoRecorderConfig()
@@ -147,6 +258,18 @@ class Config:
         if os.getenv("TIMEOUT_MINUTES"):
             self.exploration.timeout_minutes = int(os.getenv("TIMEOUT_MINUTES"))
 
+        if os.getenv("WARM_START"):
+            self.exploration.warm_start = os.getenv("WARM_START").lower() in ("1", "true", "yes")
+
+        if os.getenv("STATE_GRAPH_FORMAT"):
+            self.paths.state_graph_format = os.getenv("STATE_GRAPH_FORMAT")
+
+        if os.getenv("HEADSET_NAME"):
+            self.app.headset_name = os.getenv("HEADSET_NAME")
+
+        if os.getenv("MOTION_MODE"):
+            self.mouse.motion_mode = os.getenv("MOTION_MODE")
+
     def validate(self) -> bool:
         
         if not self.app.name:
@@ -155,4 +278,10 @@ class Config:
         if not os.path.exists(os.path.dirname(self.paths.screenshot_dir)):
             raise ValueError(f"Screenshot directory parent does not exist: {self.paths.screenshot_dir}")
 
+        if self.paths.state_graph_format not in ("json", "compact", "jsonl"):
+            raise ValueError(f"Unknown state graph format: {self.paths.state_graph_format}")
+
+        if self.mouse.motion_mode not in ("closed_loop", "predictive"):
+            raise ValueError(f"Unknown motion mode: {self.mouse.motion_mode}")
+
         return True
\ No newline at end of file
@@ -2,19 +2,32 @@
 
 import json
 import time
+import struct
+import hashlib
+from array import array
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple, Set
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Set
+
+import numpy as np
+
+from text_matching import canonical_text
 
 
 @dataclass
 class Button:
     
+    __slots__ = ('id', 'content', 'bbox', 'interactivity', 'source', 'canonical')
+
     id: str
     content: str
-    bbox: List[float]  
+    bbox: Sequence[float]  
     interactivity: bool
     source: str
 
+    def __post_init__(self):
+        self.bbox = array('d', self.bbox)
+        self.canonical = canonical_text(self.content)
+
     def get_center(self, screen_width: int, screen_height: int) -> Tuple[int, int]:
         
         x_min, y_min, x_max, y_max = self.bbox
@@ -41,11 +54,26 @@ class State:
 
         
         self.unexplored_buttons = sorted(buttons.copy(), key=distance_to_center)
+        self.button_ids: Set[str] = {b.id for b in buttons}
+        self.explored_ids: Set[str] = set()
+        self.on_button_explored: Optional[Callable[['State', Button], None]] = None
+        self.fingerprints: List[int] = []
         self.state_id = self._generate_state_id()
 
     def _generate_state_id(self) -> str:
         
-        button_info = [(b.content, b.bbox) for b in self.buttons]
+        digest = hashlib.blake2b(digest_size=16)
+        for b in self.buttons:
+            content = b.content.encode('utf-8')
+            digest.update(struct.pack('<I', len(content)))
+            digest.update(content)
+            digest.update(struct.pack('<4d', *b.bbox))
+        return digest.hexdigest()
+
+    @property
+    def readable_id(self) -> str:
+        
+        button_info = [(b.content, list(b.bbox)) for b in self.buttons]
         return json.dumps(button_info, sort_keys=True)
 
     def has_unexplored_buttons(self) -> bool:
@@ -55,9 +83,40 @@ class State:
     def get_next_unexplored_button(self) -> Optional[Button]:
         
         if self.has_unexplored_buttons():
-            return self.unexplored_buttons.pop(0)
+            button = self.unexplored_buttons.pop(0)
+            self.explored_ids.add(button.id)
+            if self.on_button_explored is not None:
+                self.on_button_explored(self, button)
+            return button
+        return None
+
+    def restore_explored(self, button_ids) -> None:
+        
+        self.explored_ids.update(button_ids)
+        self.unexplored_buttons = [b for b in self.unexplored_buttons
+                                   if b.id not in self.explored_ids]
+
+    def defer_buttons(self, button_ids) -> None:
+        
+        deferred = set(button_ids)
+        self.unexplored_buttons = (
+            [b for b in self.unexplored_buttons if b.id not in deferred] +
+            [b for b in self.unexplored_buttons if b.id in deferred]
+        )
+
+    def add_fingerprint(self, fingerprint: int, max_fingerprints: int = 4) -> Optional[int]:
+        
+        if fingerprint in self.fingerprints:
+            return None
+        self.fingerprints.append(fingerprint)
+        if len(self.fingerprints) > max_fingerprints:
+            return self.fingerprints.pop(0)
         return None
 
+    def is_explored(self, button: Button) -> bool:
+        
+        return button.id in self.explored_ids
+
     def get_back_button(self) -> Optional[Button]:
         
         back_keywords = ['back', 'return', 'previous', 'close', 'cancel']
@@ -73,16 +132,6 @@ class State:
         return min(self.buttons, key=lambda b: (b.bbox[1], b.bbox[0]))
 
 
-@dataclass
-class MouseRatioData:
-    
-    effective_ratio_x: float
-    effective_ratio_y: float
-    distance: float
-    attempts: int
-    timestamp: float
-
-
 @dataclass
 class MetricsData:
     
@@ -95,10 +144,17 @@ class MetricsData:
     pointer_moves_success: int = 0
     pointer_moves_failed: int = 0
     pointer_move_accuracy: List[float] = None
+    fingerprint_hits: int = 0
+    fingerprint_misses: int = 0
+    pointer_move_screenshots: int = 0
+    pointer_moves_measured: int = 0
+    timing_components: Dict[str, float] = None
 
     def __post_init__(self):
         if self.pointer_move_accuracy is None:
             self.pointer_move_accuracy = []
+        if self.timing_components is None:
+            self.timing_components = {}
 
     def is_timeout_reached(self) -> bool:
         
@@ -114,6 +170,12 @@ class MetricsData:
         
         return time.time() - self.start_time
 
+    def get_average_screenshots_per_move(self) -> float:
+        
+        if not self.pointer_moves_measured:
+            return 0.0
+        return self.pointer_move_screenshots / self.pointer_moves_measured
+
     def get_average_accuracy(self) -> float:
         
         if not self.pointer_move_accuracy:
@@ -128,6 +190,10 @@ class ScreenshotResult:
     file_path: Optional[str]
     timestamp: str
     error_message: Optional[str] = None
+    image: Optional[np.ndarray] = None
+    jpeg_bytes: Optional[bytes] = None
+    seq: Optional[int] = None
+    capture_time: Optional[float] = None
 
 
 @dataclass
@@ -140,6 +206,7 @@ class PointerMoveResult:
     attempts: Optional[int] = None
     error_message: Optional[str] = None
     password_detected: bool = False  
+    screenshots: Optional[int] = None
 
 
 @dataclass
@@ -156,6 +223,7 @@ class AppCacheEntry:
 
 class StateGraphEdge:
     
+    __slots__ = ('from_state_id', 'to_state_id', 'button', 'traversal_count', 'last_traversed')
 
     def __init__(self, from_state_id: str, to_state_id: str, button: Button):
         self.from_state_id = from_state_id
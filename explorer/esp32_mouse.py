@@ -3,17 +3,39 @@ import time
 import threading
 import subprocess
 import os
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 DEUBG=False
 
 class ESP32Mouse:
-    def __init__(self, port, baud_rate=115200, timeout=1, debug=True):
+    UNSOLICITED_PREFIXES = ("Starting BLE",)
+
+    def __init__(self, port, baud_rate=115200, timeout=1, debug=True, max_in_flight=8,
+                 heartbeat_interval=5.0, heartbeat_timeout=3.0, heartbeat_max_misses=2):
         
         self.port = port
         self.baud_rate = baud_rate
         self.debug = debug
         self.command_timeout = 15  
         self.last_command_time = 0
+        self.last_response_time = time.time()
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.heartbeat_max_misses = heartbeat_max_misses
+        self.heartbeat_thread = None
+        self.missed_heartbeats = 0
+        self.heartbeat_count = 0
+        self.heartbeat_misses_total = 0
+        self.heartbeat_latencies = deque(maxlen=200)
+        self.reset_count = 0
+        self.reset_durations = []
         self.command_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.pending = deque()
+        self.running = threading.Event()
+        self.stopped = threading.Event()
+        self.reader_thread = None
         try:
             self.connection = serial.Serial(port, baud_rate, timeout=timeout)
             print(f"Connected to ESP32 on {port}")
@@ -21,9 +43,151 @@ class ESP32Mouse:
             print(f"Error connecting to ESP32: {e}")
             self.connection = None
 
+        if self.connection is not None:
+            self.running.set()
+            self.reader_thread = threading.Thread(target=self._read_responses, name="esp32-reader", daemon=True)
+            self.reader_thread.start()
+            if self.heartbeat_interval and self.heartbeat_interval > 0:
+                self.heartbeat_thread = threading.Thread(target=self._heartbeat, name="esp32-heartbeat", daemon=True)
+                self.heartbeat_thread.start()
+
+    def _read_responses(self):
+        
+        while self.running.is_set():
+            connection = self.connection
+            if connection is None:
+                time.sleep(0.1)
+                continue
+            try:
+                line = connection.readline()
+            except Exception:
+                
+                time.sleep(0.1)
+                continue
+            if not line:
+                continue
+
+            response = line.decode('utf-8', errors='replace').strip()
+            if not response:
+                continue
+            self.last_response_time = time.time()
+            if self.debug:
+                print(f"ESP32 Response: {response}")
+            self._resolve(response)
+
+    def _resolve(self, response):
+        
+        with self.write_lock:
+            if not self.pending or response.startswith(self.UNSOLICITED_PREFIXES) or \
+                    (response == "PONG" and self.pending[0][0] != "PING"):
+                if self.debug:
+                    print(f"Ignoring unsolicited ESP32 output: {response}")
+                return
+            command, future = self.pending.popleft()
+        self.in_flight.release()
+        if not future.done():
+            future.set_result(response)
+
+    def _fail_pending(self, error):
+        
+        with self.write_lock:
+            pending, self.pending = self.pending, deque()
+        for command, future in pending:
+            self.in_flight.release()
+            if not future.done():
+                future.set_exception(error)
+
+    def send_async(self, command):
+        
+        future = Future()
+        if self.connection is None:
+            future.set_exception(ConnectionError("Not connected to ESP32."))
+            return future
+
+        if not self.in_flight.acquire(timeout=self.command_timeout):
+            future.set_exception(TimeoutError(f"No free command slot for '{command}'"))
+            return future
+
+        with self.write_lock:
+            try:
+                self.connection.write((command + '\n').encode('utf-8'))
+                self.pending.append((command, future))
+            except Exception as e:
+                self.in_flight.release()
+                future.set_exception(e)
+        self.last_command_time = time.time()
+        return future
+
+    def _heartbeat(self):
+        
+        while not self.stopped.wait(self.heartbeat_interval):
+            if not self.running.is_set() or self.connection is None:
+                continue
+            if time.time() - self.last_response_time < self.heartbeat_interval:
+                continue
+            if not self.command_lock.acquire(blocking=False):
+                
+                continue
+            try:
+                resets = self.reset_count
+                if self.ping() or self.reset_count != resets:
+                    self.missed_heartbeats = 0
+                    continue
+
+                self.missed_heartbeats += 1
+                self.heartbeat_misses_total += 1
+                print(f"ESP32 missed heartbeat ({self.missed_heartbeats}/{self.heartbeat_max_misses})")
+                if self.missed_heartbeats >= self.heartbeat_max_misses and self.running.is_set():
+                    print("ESP32 stopped answering heartbeats, resetting device...")
+                    self.reset_arduino_device()
+                    self.missed_heartbeats = 0
+            finally:
+                self.command_lock.release()
+
+    def ping(self):
+        
+        start_time = time.time()
+        try:
+            response = self.send_async("PING").result(timeout=self.heartbeat_timeout)
+        except Exception:
+            self._fail_pending(TimeoutError("PING timed out"))
+            return False
+
+        if response != "PONG":
+            print(f"Unexpected heartbeat reply '{response}', ESP32 replies are out of sync, resetting device...")
+            self._fail_pending(ConnectionError("ESP32 replies out of sync"))
+            self.reset_arduino_device()
+            return False
+
+        self.heartbeat_count += 1
+        self.heartbeat_latencies.append(time.time() - start_time)
+        return True
+
+    def get_stats(self):
+        
+        latencies = list(self.heartbeat_latencies)
+        return {
+            'resets': self.reset_count,
+            'reset_time_total': sum(self.reset_durations),
+            'heartbeats': self.heartbeat_count,
+            'missed_heartbeats': self.heartbeat_misses_total,
+            'heartbeat_latency_avg_ms': (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+            'heartbeat_latency_max_ms': max(latencies) * 1000 if latencies else 0.0,
+        }
+
     def reset_arduino_device(self):
         
+        self.reset_count += 1
+        start_time = time.time()
+        try:
+            return self._reset_device()
+        finally:
+            self.reset_durations.append(time.time() - start_time)
+
+    def _reset_device(self):
+        
         try:
+            self._fail_pending(ConnectionError("ESP32 device reset"))
             print("ESP32 timeout detected, attempting device reset...")
             script_path = os.path.join(os.path.dirname(__file__), 'reset_arduino.py')
             if os.path.exists(script_path):
@@ -33,14 +197,17 @@ class ESP32Mouse:
                 if result.returncode == 0:
                     print("Device reset successful, reconnecting...")
                     
-                    if self.connection:
-                        try:
-                            self.connection.close()
-                        except:
-                            pass
+                    with self.write_lock:
+                        if self.connection:
+                            try:
+                                self.connection.close()
+                            except:
+                                pass
+                        self.connection = None
                     time.sleep(2)
                     try:
                         self.connection = serial.Serial(self.port, self.baud_rate, timeout=1)
+                        self.connection.reset_input_buffer()
                         print(f"Reconnected to ESP32 on {self.port}")
                         return True
                     except Exception as e:
@@ -57,51 +224,76 @@ class ESP32Mouse:
             print(f"Error during reset: {e}")
             return False
 
-    def send_command_with_timeout(self, command):
+    def send_commands(self, commands):
         
         if self.connection is None:
             print("Not connected to ESP32.")
             return False
 
         with self.command_lock:
-            try:
-                
-                current_time = time.time()
-                if current_time - self.last_command_time > self.command_timeout:
-                    print("Previous command may have timed out, resetting device...")
-                    if not self.reset_arduino_device():
-                        return False
-                
-                self.last_command_time = current_time
-                
-                
-                self.connection.write((command + '\n').encode('utf-8'))
-                
-                
-                start_time = time.time()
-                response = None
-                
-                while time.time() - start_time < self.command_timeout:
-                    if self.connection.in_waiting:
-                        response = self.connection.readline().decode('utf-8').strip()
-                        break
-                    time.sleep(0.01)  
-                
-                if response and self.debug:
-                    print(f"ESP32 Response: {response}")
-                
-                
-                if time.time() - start_time >= self.command_timeout:
-                    print(f"Command '{command}' timed out after {self.command_timeout} seconds")
-                    print("Attempting device reset...")
-                    if self.reset_arduino_device():
-                        
-                        print("Retrying command after reset...")
-                        return self.send_command_with_timeout(command)
-                    else:
-                        return False
-                
+            confirmed, command, error = self._run_pipelined(commands)
+            if error is None:
                 return True
+
+            if isinstance(error, FutureTimeoutError):
+                print(f"Command '{command}' timed out after {self.command_timeout} seconds")
+            else:
+                print(f"Error sending command '{command}': {error}")
+            print("Attempting device reset...")
+            if not self.reset_arduino_device():
+                return False
+
+            remaining = commands[confirmed:]
+            print(f"Retrying {len(remaining)} commands after reset...")
+            _, command, error = self._run_pipelined(remaining)
+            if error is not None:
+                print(f"Retry of command '{command}' failed: {error}")
+                return False
+            return True
+
+    def _run_pipelined(self, commands):
+        
+        failed = threading.Event()
+
+        def on_done(future):
+            if future.exception() is not None:
+                failed.set()
+
+        futures = []
+        for command in commands:
+            if failed.is_set():
+                break
+            future = self.send_async(command)
+            future.add_done_callback(on_done)
+            futures.append((command, future))
+
+        for confirmed, (command, future) in enumerate(futures):
+            try:
+                future.result(timeout=self.command_timeout)
+            except Exception as e:
+                return confirmed, command, e
+        return len(futures), None, None
+
+    def send_command_with_timeout(self, command, expect=None):
+        
+        if self.connection is None:
+            print("Not connected to ESP32.")
+            return False
+
+        with self.command_lock:
+            try:
+                response = self.send_async(command).result(timeout=self.command_timeout)
+                return self._check_reply(command, response, expect)
+
+            except FutureTimeoutError:
+                print(f"Command '{command}' timed out after {self.command_timeout} seconds")
+                print("Attempting device reset...")
+                if self.reset_arduino_device():
+                    
+                    print("Retrying command after reset...")
+                    return self._retry_command(command, expect)
+                else:
+                    return False
                 
             except Exception as e:
                 print(f"Error sending command '{command}': {e}")
@@ -109,19 +301,52 @@ class ESP32Mouse:
                 if self.reset_arduino_device():
                     
                     print("Retrying command after reset...")
-                    return self.send_command_with_timeout(command)
+                    return self._retry_command(command, expect)
                 else:
                     return False
 
-    def send_command(self, command):
+    def _retry_command(self, command, expect=None):
         
-        return self.send_command_with_timeout(command)
+        try:
+            response = self.send_async(command).result(timeout=self.command_timeout)
+            return self._check_reply(command, response, expect)
+        except Exception as e:
+            print(f"Retry of command '{command}' failed: {e}")
+            return False
+
+    def _check_reply(self, command, response, expect):
+        
+        if expect is None or response.startswith(expect):
+            return True
+        print(f"ESP32 rejected '{command}': {response}")
+        return False
+
+    def send_command(self, command, expect=None):
+        
+        return self.send_command_with_timeout(command, expect)
 
     def move_mouse(self, x, y):
         
         command = f"MOVE {x} {y}"
         return self.send_command(command)
 
+    def move_burst(self, moves):
+        
+        return self.send_commands([f"MOVE {x} {y}" for x, y in moves])
+
+    def move_path(self, steps):
+        
+        tokens = []
+        for dx, dy, count in steps:
+            if not (-127 <= dx <= 127 and -127 <= dy <= 127):
+                raise ValueError(f"MOVEPATH step ({dx}, {dy}) exceeds the HID report range")
+            if count > 0:
+                tokens.append(f"{int(dx)}:{int(dy)}:{int(count)}")
+        if not tokens:
+            return True
+        command = "MOVEPATH " + " ".join(tokens)
+        return self.send_command(command, expect="Moved path")
+
     def scroll_mouse(self, x, y):
         
         command = f"SCROLL {x} {y}"
@@ -159,6 +384,15 @@ class ESP32Mouse:
         
     def close(self):
         
+        self.running.clear()
+        self.stopped.set()
+        if self.heartbeat_thread is not None and self.heartbeat_thread is not threading.current_thread():
+            self.heartbeat_thread.join(timeout=self.heartbeat_timeout + 2)
+        self.heartbeat_thread = None
+        self._fail_pending(ConnectionError("ESP32 connection closed"))
         if self.connection:
             self.connection.close()
             print("Disconnected from ESP32.")
+        if self.reader_thread is not None:
+            self.reader_thread.join(timeout=2)
+            self.reader_thread = None
@@ -5,7 +5,7 @@ def quick_detect_center_ui(image_path, template_path="/mnt/ssd2/VR_monkey/templa
                           threshold=0.85, roi_scale=0.5):
     
     
-    img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    img = cv2.imread(image_path, cv2.IMREAD_COLOR) if isinstance(image_path, str) else image_path
     template = cv2.imread(template_path, cv2.IMREAD_COLOR)
     
     if img is None or template is None:
@@ -50,7 +50,7 @@ def batch_detect(image_list, template_path="/mnt/ssd2/VR_monkey/templates/center
     mask_template = cv2.inRange(hsv_template, lower, upper)
     
     for img_path in image_list:
-        img = cv2.imread(img_path, cv2.IMREAD_COLOR)
+        img = cv2.imread(img_path, cv2.IMREAD_COLOR) if isinstance(img_path, str) else img_path
         if img is None:
             results.append(False)
             continue
@@ -0,0 +1,41 @@
+import cv2
+import numpy as np
+from typing import Optional, Union
+
+
+class FrameFingerprinter:
+
+
+    def __init__(self, hash_size: int = 16, max_distance: int = 6):
+        self.hash_size = hash_size
+        self.max_distance = max_distance
+
+    @classmethod
+    def from_config(cls, config) -> 'FrameFingerprinter':
+
+        return cls(hash_size=config.fingerprint.hash_size, max_distance=config.fingerprint.max_distance)
+
+    def fingerprint(self, image: Union[str, np.ndarray]) -> Optional[int]:
+
+        if isinstance(image, str):
+            image = cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        if image is None or image.size == 0:
+            return None
+
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        small = cv2.resize(image, (self.hash_size + 1, self.hash_size), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+    @staticmethod
+    def distance(fingerprint1: int, fingerprint2: int) -> int:
+
+        return (fingerprint1 ^ fingerprint2).bit_count()
+
+    def matches(self, fingerprint1: Optional[int], fingerprint2: Optional[int]) -> bool:
+
+        if fingerprint1 is None or fingerprint2 is None:
+            return False
+        return self.distance(fingerprint1, fingerprint2) <= self.max_distance
@@ -0,0 +1,338 @@
+import abc
+import time
+import socket
+import logging
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+import cv2
+import numpy as np
+import requests
+
+
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+
+class Frame:
+
+
+    __slots__ = ('seq', 'timestamp', 'jpeg', '_image')
+
+    def __init__(self, seq: int, timestamp: float, jpeg: bytes):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.jpeg = jpeg
+        self._image: Optional[np.ndarray] = None
+
+    @property
+    def image(self) -> Optional[np.ndarray]:
+
+        if self._image is None:
+            image = cv2.imdecode(np.frombuffer(self.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is not None:
+                
+                image.flags.writeable = False
+            self._image = image
+        return self._image
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class JPEGScanner:
+
+
+    def __init__(self, capacity: int = 16 * 1024 * 1024, compact_threshold: int = 1024 * 1024):
+        self.buffer = bytearray(capacity)
+        self.capacity = capacity
+        self.compact_threshold = min(compact_threshold, capacity // 2)
+        self.filled = 0
+        self._view = memoryview(self.buffer)
+        self._start = -1
+        self._scan_from = 0
+
+    def writable(self, size: int) -> memoryview:
+
+        if self.capacity - self.filled < self.compact_threshold:
+            self._compact()
+        return self._view[self.filled:min(self.filled + size, self.capacity)]
+
+    def commit(self, size: int) -> List[bytes]:
+
+        self.filled += size
+        return self.scan()
+
+    def feed(self, data) -> List[bytes]:
+
+        frames = []
+        data = memoryview(data)
+        offset = 0
+        while offset < len(data):
+            target = self.writable(len(data) - offset)
+            count = len(target)
+            target[:] = data[offset:offset + count]
+            offset += count
+            frames.extend(self.commit(count))
+        return frames
+
+    def scan(self) -> List[bytes]:
+
+        frames = []
+        buffer = self.buffer
+        filled = self.filled
+        while True:
+            if self._start < 0:
+                start = buffer.find(JPEG_SOI, self._scan_from, filled)
+                if start < 0:
+                    
+                    keep = 1 if filled and buffer[filled - 1] == 0xff else 0
+                    if keep:
+                        buffer[0] = 0xff
+                    self.filled = keep
+                    self._scan_from = 0
+                    return frames
+                self._start = start
+                self._scan_from = start + 2
+
+            end = buffer.find(JPEG_EOI, self._scan_from, filled)
+            if end < 0:
+                self._scan_from = max(self._start + 2, filled - 1)
+                break
+
+            frames.append(self._view[self._start:end + 2].tobytes())
+            self._start = -1
+            self._scan_from = end + 2
+
+        if self.filled >= self.capacity:
+            if self._start > 0:
+                self._compact()
+            else:
+                
+                self.reset()
+        return frames
+
+    def _compact(self) -> None:
+
+        start = self._start if self._start >= 0 else self._scan_from
+        if start <= 0:
+            return
+        remaining = self.filled - start
+        self._view[:remaining] = self._view[start:self.filled]
+        self.filled = remaining
+        self._scan_from -= start
+        if self._start >= 0:
+            self._start = 0
+
+    def reset(self) -> None:
+
+        self.filled = 0
+        self._start = -1
+        self._scan_from = 0
+
+
+class FrameSource(abc.ABC):
+
+
+    def __init__(self, name: str, buffer_size: int = 4, reconnect_delay: float = 1.0):
+        self.name = name
+        self.reconnect_delay = reconnect_delay
+        self.logger = logging.getLogger(__name__)
+        self.frames: Deque[Frame] = deque(maxlen=buffer_size)
+        self.frames_received = 0
+        self.reconnects = 0
+        self._next_seq = 1
+        self._condition = threading.Condition()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-reader", daemon=True)
+        self._thread.start()
+        self.logger.info(f"{self.name} frame source started")
+
+    def stop(self, timeout: float = 2.0) -> None:
+
+        self._running.clear()
+        self._disconnect()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            self._condition.notify_all()
+
+    def is_running(self) -> bool:
+        return self._running.is_set()
+
+    def _run(self) -> None:
+
+        while self._running.is_set():
+            try:
+                self._connect()
+                self._read_frames()
+            except Exception as e:
+                if self._running.is_set():
+                    self.logger.warning(f"{self.name} frame source error: {e}")
+            finally:
+                self._disconnect()
+
+            if self._running.is_set():
+                self.reconnects += 1
+                time.sleep(self.reconnect_delay)
+
+    @abc.abstractmethod
+    def _connect(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _read_frames(self) -> None:
+        ...
+
+    def _disconnect(self) -> None:
+        pass
+
+    def _publish(self, jpeg: bytes, timestamp: Optional[float] = None) -> None:
+
+        with self._condition:
+            frame = Frame(self._next_seq, timestamp if timestamp is not None else time.time(), jpeg)
+            self._next_seq += 1
+            self.frames.append(frame)
+            self.frames_received += 1
+            self._condition.notify_all()
+
+    def latest(self) -> Optional[Frame]:
+
+        frames = self.frames
+        return frames[-1] if frames else None
+
+    def wait_for_frame(self, max_age: float = 1.0, timeout: float = 10.0) -> Optional[Frame]:
+
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                frame = self.latest()
+                if frame is not None and frame.age <= max_age:
+                    return frame
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._running.is_set():
+                    return None
+                self._condition.wait(remaining)
+
+    def wait_for_frame_after(self, after: float, timeout: float = 10.0) -> Optional[Frame]:
+
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                frame = self.latest()
+                if frame is not None and frame.timestamp > after:
+                    return frame
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._running.is_set():
+                    return None
+                self._condition.wait(remaining)
+
+
+class MJPEGStreamSource(FrameSource):
+
+
+    def __init__(self, url: str, buffer_size: int = 4, reconnect_delay: float = 1.0,
+                 connect_timeout: float = 10.0, chunk_size: int = 16 * 1024):
+        super().__init__("MJPEG", buffer_size, reconnect_delay)
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.chunk_size = chunk_size
+        self.scanner = JPEGScanner()
+        self._response: Optional[requests.Response] = None
+
+    def _connect(self) -> None:
+
+        self.scanner.reset()
+        self._response = requests.get(self.url, stream=True, timeout=self.connect_timeout)
+        self._response.raise_for_status()
+        self.logger.info(f"Connected to MJPEG stream: {self.url}")
+
+    def _chunks(self):
+
+        raw = self._response.raw
+        if hasattr(raw, 'read1'):
+            
+            while True:
+                chunk = raw.read1(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from self._response.iter_content(chunk_size=self.chunk_size)
+
+    def _read_frames(self) -> None:
+
+        for chunk in self._chunks():
+            if not self._running.is_set():
+                return
+            if not chunk:
+                continue
+            timestamp = time.time()
+            for jpeg in self.scanner.feed(chunk):
+                self._publish(jpeg, timestamp)
+        raise ConnectionError("MJPEG stream ended")
+
+    def _disconnect(self) -> None:
+
+        response, self._response = self._response, None
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+
+class GStreamerSocketSource(FrameSource):
+
+
+    def __init__(self, host: str, port: int, buffer_size: int = 4, reconnect_delay: float = 1.0,
+                 connect_timeout: float = 10.0, recv_size: int = 256 * 1024):
+        super().__init__("GStreamer", buffer_size, reconnect_delay)
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.recv_size = recv_size
+        self.scanner = JPEGScanner()
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> None:
+
+        self.scanner.reset()
+        sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self._sock = sock
+        self.logger.info(f"Connected to GStreamer stream: {self.host}:{self.port}")
+
+    def _read_frames(self) -> None:
+
+        scanner = self.scanner
+        while self._running.is_set():
+            sock = self._sock
+            if sock is None:
+                return
+            received = sock.recv_into(scanner.writable(self.recv_size))
+            if received == 0:
+                raise ConnectionError("GStreamer stream closed by peer")
+            timestamp = time.time()
+            for jpeg in scanner.commit(received):
+                self._publish(jpeg, timestamp)
+
+    def _disconnect(self) -> None:
+
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
@@ -1,6 +1,7 @@
 
 
 
+import os
 import sys
 import time
 import logging
@@ -13,6 +14,8 @@ from screenshot_manager import ScreenshotManager
 from mouse_controller import MouseController
 from omniparser_client import OmniParserClient
 from state_graph import StateGraph
+from state_comparator import LayoutAwareComparator
+from state_store import StateGraphStore
 from metrics_manager import MetricsManager
 from app_manager import AppManager
 from simple_state_explorer import StateExplorer
@@ -24,10 +27,11 @@ import pointer_recognize
 class StateExplorerApp:
     
 
-    def __init__(self, app_name: str, timeout_minutes: int = 10):
+    def __init__(self, app_name: str, timeout_minutes: int = 10, resume: bool = False):
         
         self.app_name = app_name
         self.timeout_minutes = timeout_minutes
+        self.resume = resume
 
         
         self.config = Config(app_name)
@@ -44,6 +48,7 @@ class StateExplorerApp:
         self.mouse_controller: Optional[MouseController] = None
         self.omniparser_client: Optional[OmniParserClient] = None
         self.state_graph: Optional[StateGraph] = None
+        self.state_store: Optional[StateGraphStore] = None
         self.metrics_manager: Optional[MetricsManager] = None
         self.app_manager: Optional[AppManager] = None
         self.state_explorer: Optional[StateExplorer] = None
@@ -73,7 +78,9 @@ class StateExplorerApp:
             self.logger.info("Initializing ESP32 connection...")
             self.esp32 = ESP32Mouse(
                 port=self.config.app.esp32_port,
-                debug=self.config.app.esp32_debug
+                debug=self.config.app.esp32_debug,
+                heartbeat_interval=self.config.app.esp32_heartbeat_interval,
+                heartbeat_timeout=self.config.app.esp32_heartbeat_timeout
             )
 
             
@@ -103,7 +110,9 @@ class StateExplorerApp:
 
             
             self.logger.info("Initializing state graph...")
-            self.state_graph = StateGraph()
+            matching = self.config.state_matching
+            comparator = LayoutAwareComparator.from_config(self.config) if matching.use_layout else None
+            self.state_graph = StateGraph(use_index=matching.use_index, comparator=comparator)
 
             
             self.logger.info("Initializing metrics manager...")
@@ -112,10 +121,14 @@ class StateExplorerApp:
                 raise Exception("Metrics manager initialization failed")
 
             
+            self._setup_state_store()
+
+            
             self.logger.info("Initializing app manager...")
             self.app_manager = AppManager(
                 self.config, self.esp32,
-                self.screenshot_manager, self.omniparser_client
+                self.screenshot_manager, self.omniparser_client,
+                mouse_controller=self.mouse_controller
             )
 
             
@@ -147,6 +160,66 @@ class StateExplorerApp:
             self.logger.error(f"Setup failed: {e}")
             return False
 
+    def _find_previous_run_file(self, file_name: str) -> Optional[str]:
+        
+        current_dir = self.metrics_manager.get_app_dir()
+        if not self.config.paths.use_timestamp:
+            path = os.path.join(current_dir, file_name)
+            return path if os.path.exists(path) else None
+
+        runs_dir = os.path.join(self.config.paths.exploration_results_dir, self.app_name)
+        if not os.path.isdir(runs_dir):
+            return None
+
+        current_run = os.path.basename(os.path.normpath(current_dir))
+        for run_name in sorted(os.listdir(runs_dir), reverse=True):
+            if not run_name.startswith("run_") or run_name == current_run:
+                continue
+            candidate = os.path.join(runs_dir, run_name, file_name)
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _warm_start(self, screen_width: int, screen_height: int):
+        
+        exploration = self.config.exploration
+        graph_path = exploration.warm_start_file
+        for file_name in self.config.paths.get_state_graph_filenames():
+            graph_path = graph_path or self._find_previous_run_file(file_name)
+        if not graph_path or not os.path.exists(graph_path):
+            self.logger.warning("No previous state graph found - starting with an empty graph")
+            return
+
+        try:
+            self.state_graph.warm_start_from_json(graph_path, screen_width, screen_height)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Could not warm start from {graph_path}: {e}")
+
+    def _setup_state_store(self):
+        
+        store_path = os.path.join(self.metrics_manager.get_app_dir(), self.config.paths.state_store_file)
+
+        resume_path = self._find_previous_run_file(self.config.paths.state_store_file) if self.resume else None
+        if self.resume and resume_path is None:
+            self.logger.warning("No previous state graph store found - starting a fresh exploration")
+
+        screen_width, screen_height = self.screenshot_manager.get_screen_dimensions()
+        if resume_path is not None and resume_path != store_path:
+            previous_store = StateGraphStore(resume_path)
+            try:
+                self.state_graph.restore_from_store(previous_store, screen_width, screen_height)
+            finally:
+                previous_store.close()
+        elif resume_path is None and self.config.exploration.warm_start:
+            self._warm_start(screen_width, screen_height)
+
+        self.state_store = StateGraphStore(store_path)
+        if resume_path == store_path:
+            self.state_graph.restore_from_store(self.state_store, screen_width, screen_height)
+            self.state_graph.attach_store(self.state_store, write_snapshot=False)
+        else:
+            self.state_graph.attach_store(self.state_store)
+
     def run(self) -> bool:
         
         try:
@@ -164,7 +237,9 @@ class StateExplorerApp:
             
 
             
-            if self.config.exploration.enable_home_detection:
+            if self.config.exploration.enable_home_detection and self.state_graph.home_state is not None:
+                self.logger.info("🏠 Using home screen state restored from previous run")
+            elif self.config.exploration.enable_home_detection:
                 self.logger.info("📱 Capturing home screen state before opening app...")
                 _, home_state = self.state_explorer.check_current_state()
 
@@ -228,7 +303,7 @@ class StateExplorerApp:
                 return False
 
             
-            initial_pointer = self.mouse_controller.find_pointer(screenshot_result.file_path)
+            initial_pointer = self.mouse_controller.find_pointer(screenshot_result.image)
             if initial_pointer is None:
                 self.logger.warning("Cannot find initial pointer, attempting recovery...")
                 
@@ -241,11 +316,15 @@ class StateExplorerApp:
                 if not screenshot_result.success:
                     return False
 
-                initial_pointer = self.mouse_controller.find_pointer(screenshot_result.file_path)
+                initial_pointer = self.mouse_controller.find_pointer(screenshot_result.image)
                 if initial_pointer is None:
                     return False
 
             
+            if self.mouse_controller.motion_model.samples > 0:
+                self.logger.info(f"Using stored motion model: {self.mouse_controller.motion_model.summary()}")
+                return True
+
             calibration_result = self.mouse_controller.calibrate_ratio(
                 self.screenshot_manager, delta_x=300, delta_y=300
             )
@@ -253,7 +332,7 @@ class StateExplorerApp:
             if calibration_result:
                 self.logger.info("Mouse calibration completed successfully")
             else:
-                self.logger.warning("Mouse calibration failed, using default ratio")
+                self.logger.warning("Mouse calibration failed, using default motion model")
 
             return True
 
@@ -286,13 +365,34 @@ class StateExplorerApp:
                 time.sleep(2)  
 
             
+            if self.mouse_controller:
+                if self.mouse_controller.motion_model.save():
+                    self.logger.info(f"Motion model saved: {self.mouse_controller.motion_model.summary()}")
+
+            
             if self.esp32:
+                stats = self.esp32.get_stats()
+                self.logger.info(
+                    f"ESP32 link: {stats['resets']} resets ({stats['reset_time_total']:.1f}s), "
+                    f"{stats['heartbeats']} heartbeats, {stats['missed_heartbeats']} missed, "
+                    f"latency avg {stats['heartbeat_latency_avg_ms']:.1f}ms / max {stats['heartbeat_latency_max_ms']:.1f}ms"
+                )
                 self.esp32.close()
 
             
             if self.metrics_manager:
                 self.metrics_manager.finalize()
 
+            
+            if self.state_store:
+                self.state_store.close()
+
+            if self.omniparser_client:
+                self.omniparser_client.close()
+
+            if self.screenshot_manager:
+                self.screenshot_manager.close()
+
             self.logger.info("Cleanup completed")
 
         except Exception as e:
@@ -345,6 +445,8 @@ Examples:
   python state_explorer_refactored.py Linkeeper
   python state_explorer_refactored.py "My App" --timeout 15
   python state_explorer_refactored.py Calculator --debug
+  python state_explorer_refactored.py Calculator --resume
+  python state_explorer_refactored.py Calculator --warm-start
 
   # Task management operations
   python state_explorer_refactored.py dummy --close-all-apps
@@ -392,6 +494,21 @@ Examples:
         help='Force quit ALL applications including system apps and exit'
     )
 
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume exploration from the state graph store of the most recent run'
+    )
+
+    parser.add_argument(
+        '--warm-start',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='STATE_GRAPH_JSON',
+        help='Warm start from a previous state_graph.json (default: the most recent run)'
+    )
+
     parser.add_argument(
         '--enable-recording',
         action='store_true',
@@ -405,13 +522,18 @@ Examples:
         logging.getLogger().setLevel(logging.DEBUG)
 
     
-    app = StateExplorerApp(args.app_name, args.timeout)
+    app = StateExplorerApp(args.app_name, args.timeout, resume=args.resume)
 
     
     if args.enable_recording:
         app.config.video_recorder.enabled = True
 
     
+    if args.warm_start is not None:
+        app.config.exploration.warm_start = True
+        app.config.exploration.warm_start_file = args.warm_start
+
+    
     if args.config_info:
         app.print_system_info()
         return 0
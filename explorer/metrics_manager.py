@@ -128,11 +128,33 @@ class MetricsManager:
             self.metrics.pointer_moves_success += 1
             self.metrics.pointer_move_accuracy.append(accuracy)
 
+    def record_pointer_move_screenshots(self, count: int):
+        
+        if self.is_enabled():
+            self.metrics.pointer_move_screenshots += count
+            self.metrics.pointer_moves_measured += 1
+
     def record_pointer_move_failure(self):
         
         if self.is_enabled():
             self.metrics.pointer_moves_failed += 1
 
+    def record_fingerprint_hit(self):
+        
+        if self.is_enabled():
+            self.metrics.fingerprint_hits += 1
+
+    def record_fingerprint_miss(self):
+        
+        if self.is_enabled():
+            self.metrics.fingerprint_misses += 1
+
+    def record_timing(self, component: str, seconds: float):
+        
+        if self.is_enabled():
+            components = self.metrics.timing_components
+            components[component] = components.get(component, 0.0) + seconds
+
     def save_state_image(self, state_index: int, source_image_path: str) -> bool:
         
         if not self.is_enabled():
@@ -171,8 +193,14 @@ Metrics Summary:
 - Pointer moves successful: {self.metrics.pointer_moves_success}
 - Pointer moves failed: {self.metrics.pointer_moves_failed}
 - Average pointer move accuracy: {avg_accuracy:.2f}%
+- Average screenshots per pointer move: {self.metrics.get_average_screenshots_per_move():.2f}
+- Fingerprint hits (OmniParser skipped): {self.metrics.fingerprint_hits}
+- Fingerprint misses: {self.metrics.fingerprint_misses}
 """
 
+        for component, seconds in self.metrics.timing_components.items():
+            metrics_summary += f"- {component} time: {seconds:.2f} seconds\n"
+
         if additional_info:
             metrics_summary += f"- Additional info: {additional_info}\n"
 
@@ -219,6 +247,11 @@ Metrics Summary:
                 f.write(f"- Successful pointer moves: {self.metrics.pointer_moves_success}\n")
                 f.write(f"- Failed pointer moves: {self.metrics.pointer_moves_failed}\n")
                 f.write(f"- Average move accuracy: {self.metrics.get_average_accuracy():.2f}%\n")
+                f.write(f"- Average screenshots per move: {self.metrics.get_average_screenshots_per_move():.2f}\n")
+                f.write(f"- Fingerprint hits (OmniParser skipped): {self.metrics.fingerprint_hits}\n")
+                f.write(f"- Fingerprint misses: {self.metrics.fingerprint_misses}\n")
+                for component, seconds in self.metrics.timing_components.items():
+                    f.write(f"- {component} time: {seconds:.2f} seconds\n")
 
                 if self.metrics.pointer_moves_success > 0:
                     success_rate = (self.metrics.pointer_moves_success /
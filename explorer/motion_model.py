@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MotionModel:
+
+
+    MIN_SAMPLE = 0.25
+    MAX_SAMPLE = 4.0
+    MAX_DEVIATION = 0.5
+
+    def __init__(self, path: Optional[str] = None, grid: Tuple[int, int] = (3, 3),
+                 magnitude_edges: Sequence[float] = (80.0, 250.0, 700.0), learning_rate: float = 0.3,
+                 prior_weight: float = 2.0, min_distance: float = 40, save_every: int = 5):
+        self.path = path
+        self.rows, self.cols = grid
+        self.magnitude_edges = tuple(float(edge) for edge in magnitude_edges)
+        self.learning_rate = learning_rate
+        self.prior_weight = prior_weight
+        self.min_distance = min_distance
+        self.save_every = save_every
+        self.logger = logging.getLogger(__name__)
+
+        shape = (self.rows, self.cols, len(self.magnitude_edges) + 1, 2)
+        self.gains = np.ones(shape)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.global_gain = np.ones(2)
+        self.samples = 0
+        self.rejected = 0
+        self._unsaved = 0
+
+        if path:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config) -> 'MotionModel':
+
+        settings = config.motion_model
+        path = None
+        if settings.persist:
+            path = config.paths.get_motion_model_file(config.app.esp32_port, config.app.headset_name)
+        return cls(
+            path=path,
+            grid=(settings.grid_rows, settings.grid_cols),
+            magnitude_edges=settings.magnitude_edges,
+            learning_rate=settings.learning_rate,
+            prior_weight=settings.prior_weight,
+            min_distance=settings.min_distance,
+            save_every=settings.save_every
+        )
+
+    def _index(self, position: Tuple[float, float], delta: Tuple[float, float], axis: int,
+               screen_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+
+        width, height = screen_size
+        mid_x = position[0] + delta[0] / 2
+        mid_y = position[1] + delta[1] / 2
+        col = min(max(int(mid_x * self.cols / max(width, 1)), 0), self.cols - 1)
+        row = min(max(int(mid_y * self.rows / max(height, 1)), 0), self.rows - 1)
+        magnitude = int(np.searchsorted(self.magnitude_edges, abs(delta[axis]), side='right'))
+        return row, col, magnitude, axis
+
+    def axis_gain(self, position: Tuple[float, float], delta: Tuple[float, float], axis: int,
+                  screen_size: Tuple[int, int]) -> float:
+
+        index = self._index(position, delta, axis, screen_size)
+        count = self.counts[index]
+        return float((count * self.gains[index] + self.prior_weight * self.global_gain[axis])
+                     / (count + self.prior_weight))
+
+    def gain(self, position: Tuple[float, float], delta: Tuple[float, float],
+             screen_size: Tuple[int, int]) -> Tuple[float, float]:
+
+        return (self.axis_gain(position, delta, 0, screen_size),
+                self.axis_gain(position, delta, 1, screen_size))
+
+    def update(self, position: Tuple[float, float], planned: Tuple[float, float],
+               observed: Tuple[float, float], screen_size: Tuple[int, int], trusted: bool = False) -> bool:
+
+        rate = self.learning_rate
+        updated = False
+        for axis in (0, 1):
+            if abs(planned[axis]) < self.min_distance:
+                continue
+            sample = observed[axis] / planned[axis]
+            expected = self.axis_gain(position, observed, axis, screen_size)
+            if not self.MIN_SAMPLE <= sample <= self.MAX_SAMPLE or \
+                    (not trusted and abs(sample - expected) > self.MAX_DEVIATION * expected):
+                self.rejected += 1
+                continue
+
+            index = self._index(position, observed, axis, screen_size)
+            if self.counts[index] == 0:
+                self.gains[index] = sample
+            else:
+                self.gains[index] = self.gains[index] * (1 - rate) + sample * rate
+            self.counts[index] += 1
+            self.global_gain[axis] = self.global_gain[axis] * (1 - rate) + sample * rate
+            updated = True
+
+        if updated:
+            self.samples += 1
+            self._unsaved += 1
+            if self.save_every and self._unsaved >= self.save_every:
+                self.save()
+        return updated
+
+    def load(self) -> bool:
+
+        if not self.path or not os.path.exists(self.path):
+            self.logger.info(f"No motion model at {self.path}, starting from unit gain")
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+            self.global_gain = np.array(data['global_gain'], dtype=float)
+            self.samples = int(data.get('samples', 0))
+            gains = np.array(data['gains'], dtype=float)
+            counts = np.array(data['counts'], dtype=np.int64)
+            if gains.shape != self.gains.shape or counts.shape != self.counts.shape or \
+                    tuple(data.get('magnitude_edges', ())) != self.magnitude_edges:
+                self.logger.warning(f"Motion model layout changed, keeping only the global gain from {self.path}")
+                return True
+
+            self.gains = gains
+            self.counts = counts
+            self.logger.info(f"Loaded motion model from {self.path}: {self.summary()}")
+            return True
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Failed to load motion model from {self.path}: {e}")
+            return False
+
+    def save(self) -> bool:
+
+        if not self.path:
+            return False
+
+        data = {
+            'grid': [self.rows, self.cols],
+            'magnitude_edges': list(self.magnitude_edges),
+            'global_gain': self.global_gain.tolist(),
+            'samples': self.samples,
+            'updated': time.time(),
+            'gains': self.gains.tolist(),
+            'counts': self.counts.tolist(),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+            self._unsaved = 0
+            return True
+
+        except OSError as e:
+            self.logger.warning(f"Failed to save motion model to {self.path}: {e}")
+            return False
+
+    def summary(self) -> str:
+
+        populated = int(np.count_nonzero(self.counts.sum(axis=3)))
+        return (f"gain=({self.global_gain[0]:.3f}, {self.global_gain[1]:.3f}), samples={self.samples}, "
+                f"cells={populated}/{self.counts[..., 0].size}")
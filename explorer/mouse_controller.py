@@ -2,11 +2,15 @@
 
 import time
 import logging
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
+
+import cv2
+import numpy as np
 
 from config import Config
-from core_types import PointerMoveResult, MouseRatioData
+from core_types import PointerMoveResult
 from esp32_mouse import ESP32Mouse
+from motion_model import MotionModel
 import pointer_recognize
 from password_input_detector import quick_test
 
@@ -14,33 +18,104 @@ from password_input_detector import quick_test
 class MouseController:
     
 
-    def __init__(self, config: Config, esp32: ESP32Mouse):
+    def __init__(self, config: Config, esp32: ESP32Mouse, motion_model: Optional[MotionModel] = None):
         self.config = config
         self.esp32 = esp32
         self.logger = logging.getLogger(__name__)
 
         
         self.mouse_ratio: Tuple[float, float] = (0.60, 0.91)  
-        self.ratio_history: List[MouseRatioData] = []
+        self.motion_model = motion_model if motion_model is not None else MotionModel.from_config(config)
         self.consecutive_failures = 0
 
         
         self.consecutive_no_movement = 0
         self.last_pointer_position: Optional[Tuple[int, int]] = None
 
-    def find_pointer(self, screenshot_path: str) -> Optional[Tuple[int, int]]:
+        
+        self.last_motion_time = 0.0
+
+        
+        self.tracked_position: Optional[Tuple[int, int]] = None
+        self.pending_motion: Tuple[float, float] = (0.0, 0.0)
+        self.moves_since_detection = 0
+        self.roi_hits = 0
+        self.roi_misses = 0
+
+        
+        self.move_screenshots = 0
+
+    def find_pointer(self, screenshot: Union[str, np.ndarray]) -> Optional[Tuple[int, int]]:
         
         try:
-            pointer = pointer_recognize.find_pointer_centers(screenshot_path)
+            if isinstance(screenshot, str):
+                screenshot = cv2.imread(screenshot)
+
+            roi = self._tracking_roi()
+            pointer = None
+            if roi is not None:
+                pointer = pointer_recognize.find_pointer_centers(
+                    screenshot, roi=roi, debug=self.config.mouse.pointer_debug
+                )
+                if pointer is not None:
+                    self.roi_hits += 1
+                else:
+                    self.roi_misses += 1
+                    self.logger.debug(f"Pointer not found in tracking window {roi}, searching full frame")
+
+            if pointer is None:
+                pointer = self._find_pointer_full_frame(screenshot)
+
+            self.tracked_position = pointer
+            self.pending_motion = (0.0, 0.0)
+            if pointer is not None:
+                self.moves_since_detection = 0
             return pointer
         except Exception as e:
             self.logger.error(f"Error finding pointer: {e}")
             return None
 
-    def _check_password_input(self, screenshot_path: str) -> bool:
+    def _find_pointer_full_frame(self, screenshot: np.ndarray) -> Optional[Tuple[int, int]]:
+        
+        debug = self.config.mouse.pointer_debug
+        if self.config.mouse.pyramid_detection:
+            return pointer_recognize.find_pointer_pyramid(
+                screenshot, scale=self.config.mouse.pyramid_scale, debug=debug
+            )
+        return pointer_recognize.find_pointer_centers(screenshot, debug=debug)
+
+    def _tracking_roi(self) -> Optional[Tuple[int, int, int, int]]:
+        
+        predicted = self._predicted_position()
+        if not self.config.mouse.roi_tracking or predicted is None:
+            return None
+
+        dx, dy = self.pending_motion
+        predicted_x, predicted_y = predicted
+        error = self.config.mouse.roi_motion_error
+        half_width = self.config.mouse.roi_margin + int(abs(dx) * error)
+        half_height = self.config.mouse.roi_margin + int(abs(dy) * error)
+        return (predicted_x - half_width, predicted_y - half_height,
+                predicted_x + half_width, predicted_y + half_height)
+
+    def _record_motion(self, steps: List[Tuple[int, int, int]]):
+        
+        planned = self.model_displacement(steps)
+        screen_size = (self.config.screen.width, self.config.screen.height)
+        position = self._predicted_position() or (screen_size[0] // 2, screen_size[1] // 2)
+        gain_x, gain_y = self.motion_model.gain(position, planned, screen_size)
+        self.pending_motion = (self.pending_motion[0] + gain_x * planned[0],
+                               self.pending_motion[1] + gain_y * planned[1])
+
+    def reset_tracking(self):
+        
+        self.tracked_position = None
+        self.pending_motion = (0.0, 0.0)
+
+    def _check_password_input(self, screenshot: Union[str, np.ndarray]) -> bool:
         
         try:
-            is_password = quick_test(screenshot_path)
+            is_password = quick_test(screenshot)
             if is_password:
                 self.logger.warning("🔐 Password input dialog detected!")
             return is_password
@@ -48,82 +123,55 @@ class MouseController:
             self.logger.error(f"Error checking for password input: {e}")
             return False
 
-    def move_pixel(self, x: int, y: int) -> bool:
+    def plan_steps(self, x: int, y: int) -> List[Tuple[int, int, int]]:
         
-        try:
-            
-            x_sign = 1 if x == 0 else int(abs(x) / x)
-            y_sign = 1 if y == 0 else int(abs(y) / y)
-
-            
-            x = int(x * self.mouse_ratio[0])
-            y = int(y * self.mouse_ratio[1])
-
-            
-            step20 = self.config.mouse.step20
-            step10 = self.config.mouse.step10
-
-            move_x_20_times = int(abs(x) / step20)
-            move_x_10_times = int((abs(x) % step20) / step10)
-            move_x_1_times = int((abs(x) % step10) / 1)
+        x_sign = 1 if x == 0 else int(abs(x) / x)
+        y_sign = 1 if y == 0 else int(abs(y) / y)
 
-            move_y_20_times = int(abs(y) / step20)
-            move_y_10_times = int((abs(y) % step20) / step10)
-            move_y_1_times = int((abs(y) % step10) / 1)
+        
+        x = int(x * self.mouse_ratio[0])
+        y = int(y * self.mouse_ratio[1])
 
-            
-            if (move_x_20_times == 0 and move_x_10_times == 0 and
-                    move_y_20_times == 0 and move_y_10_times == 0):
-                if move_x_1_times != 0:
-                    if not self.esp32.move_mouse(x_sign * move_x_1_times, 0):
-                        self.logger.error(f"Failed to move mouse by {x_sign * move_x_1_times} pixels")
-                        return False
-
-                if move_y_1_times != 0:
-                    if not self.esp32.move_mouse(0, y_sign * move_y_1_times):
-                        self.logger.error(f"Failed to move mouse by {y_sign * move_y_1_times} pixels")
-                        return False
-
-                time.sleep(0.1)
-                self._bounce_leg()
-                return True
+        
+        step20 = self.config.mouse.step20
+        step10 = self.config.mouse.step10
 
-            
-            
-            for _ in range(move_x_20_times):
-                if not self.esp32.move_mouse(x_sign * 20, 0):
-                    self.logger.error(f"Failed to move mouse by {x_sign * 20} pixels")
-                    return False
+        move_x_20_times = int(abs(x) / step20)
+        move_x_10_times = int((abs(x) % step20) / step10)
+        move_x_1_times = int((abs(x) % step10) / 1)
 
-            for _ in range(move_x_10_times):
-                if not self.esp32.move_mouse(x_sign * 10, 0):
-                    self.logger.error(f"Failed to move mouse by {x_sign * 10} pixels")
-                    return False
+        move_y_20_times = int(abs(y) / step20)
+        move_y_10_times = int((abs(y) % step20) / step10)
+        move_y_1_times = int((abs(y) % step10) / 1)
 
-            
-            if move_x_1_times != 0:
-                if not self.esp32.move_mouse(x_sign * move_x_1_times, 0):
-                    self.logger.error(f"Failed to move mouse by {x_sign * move_x_1_times} pixels")
-                    return False
+        
+        steps = [
+            (x_sign * 20, 0, move_x_20_times),
+            (x_sign * 10, 0, move_x_10_times),
+            (x_sign * move_x_1_times, 0, 1 if move_x_1_times else 0),
+            (0, y_sign * 20, move_y_20_times),
+            (0, y_sign * 10, move_y_10_times),
+            (0, y_sign * move_y_1_times, 1 if move_y_1_times else 0),
+        ]
+        return [step for step in steps if step[2] > 0]
 
-            
-            for _ in range(move_y_20_times):
-                if not self.esp32.move_mouse(0, y_sign * 20):
-                    self.logger.error(f"Failed to move mouse by {y_sign * 20} pixels")
-                    return False
+    def move_pixel(self, x: int, y: int) -> bool:
+        
+        try:
+            steps = self.plan_steps(x, y)
+            self._record_motion(steps)
+            self.moves_since_detection += 1
 
-            for _ in range(move_y_10_times):
-                if not self.esp32.move_mouse(0, y_sign * 10):
-                    self.logger.error(f"Failed to move mouse by {y_sign * 10} pixels")
+            if self.config.mouse.batched_moves:
+                if not self.esp32.move_path(steps):
+                    self.logger.error(f"Failed to move mouse along path {steps}")
                     return False
-
-            
-            if move_y_1_times != 0:
-                if not self.esp32.move_mouse(0, y_sign * move_y_1_times):
-                    self.logger.error(f"Failed to move mouse by {y_sign * move_y_1_times} pixels")
+            else:
+                moves = [(dx, dy) for dx, dy, count in steps for _ in range(count)]
+                if not self.esp32.move_burst(moves):
+                    self.logger.error(f"Failed to move mouse by {len(moves)} pipelined steps")
                     return False
 
-            time.sleep(0.1)
             self._bounce_leg()
             return True
 
@@ -138,6 +186,125 @@ class MouseController:
         if tolerance is None:
             tolerance = self.config.mouse.tolerance
 
+        self.move_screenshots = 0
+        result = None
+        if self.config.mouse.motion_mode == "predictive":
+            result = self._move_predictive(target_x, target_y, screenshot_manager, tolerance)
+            if result is None:
+                self.logger.debug("Predictive move did not converge, falling back to closed loop")
+
+        if result is None:
+            result = self._move_closed_loop(target_x, target_y, screenshot_manager, tolerance)
+
+        result.screenshots = self.move_screenshots
+        return result
+
+    def model_displacement(self, steps: List[Tuple[int, int, int]]) -> Tuple[float, float]:
+        
+        step20 = self.config.mouse.step20
+        step10 = self.config.mouse.step10
+        total_x = total_y = 0.0
+        for dx, dy, count in steps:
+            for value, axis in ((dx, 0), (dy, 1)):
+                magnitude = abs(value)
+                if magnitude == 20:
+                    displacement = step20
+                elif magnitude == 10:
+                    displacement = step10
+                else:
+                    displacement = magnitude
+                displacement *= count * (1 if value > 0 else -1)
+                if axis == 0:
+                    total_x += displacement
+                else:
+                    total_y += displacement
+        return total_x, total_y
+
+    def _predicted_position(self) -> Optional[Tuple[int, int]]:
+        
+        if self.tracked_position is None:
+            return None
+        return (self.tracked_position[0] + round(self.pending_motion[0]),
+                self.tracked_position[1] + round(self.pending_motion[1]))
+
+    def _command_for(self, position: Tuple[int, int], delta: Tuple[int, int],
+                     screen_size: Tuple[int, int]) -> Tuple[float, float]:
+        
+        gain_x, gain_y = self.motion_model.gain(position, delta, screen_size)
+        ratio_x = self.mouse_ratio[0] if self.mouse_ratio[0] > 0 else 1.0
+        ratio_y = self.mouse_ratio[1] if self.mouse_ratio[1] > 0 else 1.0
+        return delta[0] / gain_x / ratio_x, delta[1] / gain_y / ratio_y
+
+    def _move_predictive(self, target_x: int, target_y: int, screenshot_manager,
+                         tolerance: int) -> Optional[PointerMoveResult]:
+        
+        self._bounce_leg()
+
+        screen_size = screenshot_manager.get_screen_dimensions()
+        position = self._predicted_position() if self.moves_since_detection == 0 else None
+        verified = False
+        if position is None:
+            screenshot_result = self._capture_after_motion(screenshot_manager)
+            if not screenshot_result.success:
+                return None
+            position = self.find_pointer(screenshot_result.image)
+            if position is None:
+                return None
+            verified = True
+
+        x_now, y_now = position
+        for leg in range(2):
+            delta_x = target_x - x_now
+            delta_y = target_y - y_now
+            planned = None
+            start_verified = verified
+            if abs(delta_x) > tolerance or abs(delta_y) > tolerance:
+                
+                command_x, command_y = self._command_for((x_now, y_now), (delta_x, delta_y), screen_size)
+                planned = self.model_displacement(self.plan_steps(command_x, command_y))
+                if not self.move_pixel(command_x, command_y):
+                    return None
+            elif verified:
+                break
+
+            screenshot_result = self._capture_after_motion(screenshot_manager)
+            if not screenshot_result.success:
+                return None
+            pointer_pos = self.find_pointer(screenshot_result.image)
+            if pointer_pos is None:
+                return None
+
+            if planned is not None and start_verified:
+                self.motion_model.update((x_now, y_now), planned,
+                                         (pointer_pos[0] - x_now, pointer_pos[1] - y_now), screen_size)
+            x_now, y_now = pointer_pos
+            verified = True
+
+        if not verified or abs(target_x - x_now) > tolerance or abs(target_y - y_now) > tolerance:
+            return None
+
+        screen_width, screen_height = screen_size
+        accuracy_x = 1 - abs(x_now - target_x) / screen_width
+        accuracy_y = 1 - abs(y_now - target_y) / screen_height
+        accuracy = (accuracy_x + accuracy_y) / 2 * 100
+
+        self.consecutive_failures = 0
+        self.consecutive_no_movement = 0
+        self.last_pointer_position = (x_now, y_now)
+
+        self.logger.info(f"Predictive movement successful: screenshots={self.move_screenshots}, "
+                         f"accuracy={accuracy:.2f}%, {self.motion_model.summary()}")
+        return PointerMoveResult(
+            success=True,
+            final_x=x_now,
+            final_y=y_now,
+            accuracy=accuracy,
+            attempts=leg + 1
+        )
+
+    def _move_closed_loop(self, target_x: int, target_y: int, screenshot_manager,
+                          tolerance: int) -> PointerMoveResult:
+        
         max_attempts = self.config.mouse.max_attempts
         attempts = 0
         lost_pointer_count = 0
@@ -149,7 +316,7 @@ class MouseController:
         self._bounce_leg()
 
         
-        screenshot_result = screenshot_manager.take_screenshot()
+        screenshot_result = self._capture_after_motion(screenshot_manager)
         if not screenshot_result.success:
             return PointerMoveResult(
                 success=False,
@@ -158,10 +325,10 @@ class MouseController:
                 error_message="Failed to take initial screenshot"
             )
 
-        pointer_pos = self.find_pointer(screenshot_result.file_path)
+        pointer_pos = self.find_pointer(screenshot_result.image)
         if pointer_pos is None:
             
-            if self._check_password_input(screenshot_result.file_path):
+            if self._check_password_input(screenshot_result.image):
                 self.logger.warning("Lost pointer due to password input dialog")
                 self.consecutive_failures += 1
                 return PointerMoveResult(
@@ -183,7 +350,7 @@ class MouseController:
                 )
 
             
-            screenshot_result = screenshot_manager.take_screenshot()
+            screenshot_result = self._capture_after_motion(screenshot_manager)
             if not screenshot_result.success:
                 return PointerMoveResult(
                     success=False,
@@ -192,10 +359,10 @@ class MouseController:
                     error_message="Failed to take screenshot after recovery"
                 )
 
-            pointer_pos = self.find_pointer(screenshot_result.file_path)
+            pointer_pos = self.find_pointer(screenshot_result.image)
             if pointer_pos is None:
                 
-                if self._check_password_input(screenshot_result.file_path):
+                if self._check_password_input(screenshot_result.image):
                     self.logger.warning("Lost pointer due to password input dialog (after recovery)")
                     self.consecutive_failures += 1
                     return PointerMoveResult(
@@ -214,8 +381,7 @@ class MouseController:
                     error_message="Still cannot find pointer after recovery"
                 )
 
-        initial_x, initial_y = pointer_pos
-        x_now, y_now = initial_x, initial_y
+        x_now, y_now = pointer_pos
         self.logger.debug(f"Starting position: ({x_now}, {y_now})")
 
         
@@ -224,24 +390,21 @@ class MouseController:
 
         
         
-        move_step_x = abs(delta_x) / self.mouse_ratio[0] if self.mouse_ratio[0] > 0 else abs(delta_x)
-        move_step_y = abs(delta_y) / self.mouse_ratio[1] if self.mouse_ratio[1] > 0 else abs(delta_y)
+        screen_size = screenshot_manager.get_screen_dimensions()
+        command_x, command_y = self._command_for((x_now, y_now), (delta_x, delta_y), screen_size)
+        move_step_x = abs(command_x)
+        move_step_y = abs(command_y)
         x_direction = 1 if delta_x > 0 else -1
         y_direction = 1 if delta_y > 0 else -1
 
         
-        total_x_movement = 0
-        total_y_movement = 0
-
-        
         while abs(delta_x) > tolerance or abs(delta_y) > tolerance:
             
             x_step = move_step_x * x_direction
             y_step = move_step_y * y_direction
 
             
-            total_x_movement += x_step
-            total_y_movement += y_step
+            planned = self.model_displacement(self.plan_steps(x_step, y_step))
 
             
             if not self.move_pixel(x_step, y_step):
@@ -256,7 +419,7 @@ class MouseController:
                 )
 
             
-            screenshot_result = screenshot_manager.take_screenshot()
+            screenshot_result = self._capture_after_motion(screenshot_manager)
             if not screenshot_result.success:
                 return PointerMoveResult(
                     success=False,
@@ -266,10 +429,10 @@ class MouseController:
                     error_message="Failed to take screenshot during movement"
                 )
 
-            pointer_pos = self.find_pointer(screenshot_result.file_path)
+            pointer_pos = self.find_pointer(screenshot_result.image)
             if pointer_pos is None:
                 
-                if self._check_password_input(screenshot_result.file_path):
+                if self._check_password_input(screenshot_result.image):
                     self.logger.warning("Lost pointer during movement due to password input dialog")
                     return PointerMoveResult(
                         success=False,
@@ -296,12 +459,12 @@ class MouseController:
                     continue
 
                 
-                screenshot_result = screenshot_manager.take_screenshot()
+                screenshot_result = self._capture_after_motion(screenshot_manager)
                 if screenshot_result.success:
-                    pointer_pos = self.find_pointer(screenshot_result.file_path)
+                    pointer_pos = self.find_pointer(screenshot_result.image)
                     if pointer_pos is None:
                         
-                        if self._check_password_input(screenshot_result.file_path):
+                        if self._check_password_input(screenshot_result.image):
                             self.logger.warning("Password input detected after recovery attempt")
                             return PointerMoveResult(
                                 success=False,
@@ -318,6 +481,8 @@ class MouseController:
             
             prev_x, prev_y = x_now, y_now
             x_now, y_now = pointer_pos
+            if lost_pointer_count == 0:
+                self.motion_model.update((prev_x, prev_y), planned, (x_now - prev_x, y_now - prev_y), screen_size)
 
             
             distance_moved = ((x_now - prev_x) ** 2 + (y_now - prev_y) ** 2) ** 0.5
@@ -330,9 +495,9 @@ class MouseController:
                     self.logger.info("Attempting to recover stuck pointer...")
                     if self._recover_pointer(screenshot_manager):
                         
-                        screenshot_result = screenshot_manager.take_screenshot()
+                        screenshot_result = self._capture_after_motion(screenshot_manager)
                         if screenshot_result.success:
-                            recovered_pos = self.find_pointer(screenshot_result.file_path)
+                            recovered_pos = self.find_pointer(screenshot_result.image)
                             if recovered_pos:
                                 x_now, y_now = recovered_pos
                                 self.consecutive_no_movement = 0  
@@ -362,6 +527,7 @@ class MouseController:
             prev_delta_y = delta_y
             delta_x = target_x - x_now
             delta_y = target_y - y_now
+            command_x, command_y = self._command_for((x_now, y_now), (delta_x, delta_y), screen_size)
 
             
             
@@ -373,17 +539,17 @@ class MouseController:
             elif abs(delta_x) < abs(prev_delta_x) * 0.5:
                 
                 
-                move_step_x = max(move_step_x, abs(delta_x) / self.mouse_ratio[0] if self.mouse_ratio[0] > 0 else abs(delta_x))
+                move_step_x = max(move_step_x, abs(command_x))
                 x_direction = 1 if delta_x > 0 else -1
                 self.logger.debug(f"X good progress, step size: {move_step_x:.1f}")
             elif abs(delta_x) > abs(prev_delta_x) * 0.9:
                 
-                move_step_x = min(move_step_x * 1.5, abs(delta_x) / self.mouse_ratio[0] if self.mouse_ratio[0] > 0 else abs(delta_x))
+                move_step_x = min(move_step_x * 1.5, abs(command_x))
                 x_direction = 1 if delta_x > 0 else -1
                 self.logger.debug(f"X slow progress, increasing step to {move_step_x:.1f}")
             else:
                 
-                move_step_x = abs(delta_x) / self.mouse_ratio[0] if self.mouse_ratio[0] > 0 else abs(delta_x)
+                move_step_x = abs(command_x)
                 x_direction = 1 if delta_x > 0 else -1
 
             
@@ -394,17 +560,17 @@ class MouseController:
                 self.logger.debug(f"Y overshoot, halving step to {move_step_y:.1f}")
             elif abs(delta_y) < abs(prev_delta_y) * 0.5:
                 
-                move_step_y = max(move_step_y, abs(delta_y) / self.mouse_ratio[1] if self.mouse_ratio[1] > 0 else abs(delta_y))
+                move_step_y = max(move_step_y, abs(command_y))
                 y_direction = 1 if delta_y > 0 else -1
                 self.logger.debug(f"Y good progress, step size: {move_step_y:.1f}")
             elif abs(delta_y) > abs(prev_delta_y) * 0.9:
                 
-                move_step_y = min(move_step_y * 1.5, abs(delta_y) / self.mouse_ratio[1] if self.mouse_ratio[1] > 0 else abs(delta_y))
+                move_step_y = min(move_step_y * 1.5, abs(command_y))
                 y_direction = 1 if delta_y > 0 else -1
                 self.logger.debug(f"Y slow progress, increasing step to {move_step_y:.1f}")
             else:
                 
-                move_step_y = abs(delta_y) / self.mouse_ratio[1] if self.mouse_ratio[1] > 0 else abs(delta_y)
+                move_step_y = abs(command_y)
                 y_direction = 1 if delta_y > 0 else -1
 
             attempts += 1
@@ -425,18 +591,12 @@ class MouseController:
 
         
         final_x, final_y = x_now, y_now
-        screen_width, screen_height = screenshot_manager.get_screen_dimensions()
+        screen_width, screen_height = screen_size
         accuracy_x = 1 - abs(final_x - target_x) / screen_width
         accuracy_y = 1 - abs(final_y - target_y) / screen_height
         accuracy = (accuracy_x + accuracy_y) / 2 * 100
 
         
-        self._update_ratio_from_movement(
-            initial_x, initial_y, target_x, target_y,
-            total_x_movement, total_y_movement, attempts
-        )
-
-        
         self.consecutive_failures = 0
 
         self.logger.info(f"Movement successful: attempts={attempts}, accuracy={accuracy:.2f}%")
@@ -455,8 +615,9 @@ class MouseController:
                 if not self.esp32.move_mouse(self.config.mouse.bouncing_leg_step, 0):
                     self.logger.warning("Failed to perform bounce leg movement")
                     return False
-                time.sleep(0.1)
+                self._record_motion([(self.config.mouse.bouncing_leg_step, 0, 1)])
 
+            self.last_motion_time = time.time()
             
             self.config.mouse.bouncing_leg_step *= -1
             return True
@@ -464,6 +625,11 @@ class MouseController:
             self.logger.error(f"Error in bounce_leg: {e}")
             return False
 
+    def _capture_after_motion(self, screenshot_manager):
+        
+        self.move_screenshots += 1
+        return screenshot_manager.wait_for_frame_after(self.last_motion_time)
+
     def _recover_pointer(self, screenshot_manager) -> bool:
         
         self.logger.info("Attempting to recover lost pointer")
@@ -478,10 +644,9 @@ class MouseController:
 
         for x, y in recovery_positions:
             if self.move_pixel(x, y):
-                time.sleep(0.5)
-                screenshot_result = screenshot_manager.take_screenshot()
+                screenshot_result = self._capture_after_motion(screenshot_manager)
                 if screenshot_result.success:
-                    pointer_pos = self.find_pointer(screenshot_result.file_path)
+                    pointer_pos = self.find_pointer(screenshot_result.image)
                     if pointer_pos is not None:
                         self.logger.info("Successfully recovered pointer")
                         return True
@@ -489,10 +654,9 @@ class MouseController:
         
         screen_width, screen_height = screenshot_manager.get_screen_dimensions()
         if self.move_pixel(screen_width // 2, screen_height // 2):
-            time.sleep(0.5)
-            screenshot_result = screenshot_manager.take_screenshot()
+            screenshot_result = self._capture_after_motion(screenshot_manager)
             if screenshot_result.success:
-                pointer_pos = self.find_pointer(screenshot_result.file_path)
+                pointer_pos = self.find_pointer(screenshot_result.image)
                 if pointer_pos is not None:
                     self.logger.info("Successfully recovered pointer at center")
                     return True
@@ -500,81 +664,17 @@ class MouseController:
         self.logger.error("Failed to recover pointer")
         return False
 
-    def _update_ratio_from_movement(self, initial_x: int, initial_y: int,
-                                   target_x: int, target_y: int,
-                                   total_x_movement: int, total_y_movement: int,
-                                   attempts: int):
-        
-        
-        actual_delta_x = target_x - initial_x
-        actual_delta_y = target_y - initial_y
-
-        effective_ratio_x = (abs(actual_delta_x) / abs(total_x_movement)
-                            if total_x_movement != 0 else self.mouse_ratio[0])
-        effective_ratio_y = (abs(actual_delta_y) / abs(total_y_movement)
-                            if total_y_movement != 0 else self.mouse_ratio[1])
-
-        
-        ratio_data = MouseRatioData(
-            effective_ratio_x=effective_ratio_x,
-            effective_ratio_y=effective_ratio_y,
-            distance=abs(actual_delta_x) + abs(actual_delta_y),
-            attempts=attempts,
-            timestamp=time.time()
-        )
-        self.ratio_history.append(ratio_data)
-
-        self.logger.debug(f"Effective ratios: x={effective_ratio_x:.3f}, y={effective_ratio_y:.3f}")
-
-        
-        if len(self.ratio_history) >= self.config.mouse.min_ratio_samples:
-            self._apply_ratio_learning()
-
-    def _apply_ratio_learning(self):
-        
-        
-        recent_samples = self.ratio_history[-self.config.mouse.ratio_learning_samples:]
-
-        
-        x_ratios = [s.effective_ratio_x for s in recent_samples]
-        y_ratios = [s.effective_ratio_y for s in recent_samples]
-
-        x_ratios.sort()
-        y_ratios.sort()
-        median_ratio_x = x_ratios[len(x_ratios) // 2]
-        median_ratio_y = y_ratios[len(y_ratios) // 2]
-
-        
-        x_mean = sum(x_ratios) / len(x_ratios)
-        y_mean = sum(y_ratios) / len(y_ratios)
-        x_std = (sum((x - x_mean) ** 2 for x in x_ratios) / len(x_ratios)) ** 0.5
-        y_std = (sum((y - y_mean) ** 2 for y in y_ratios) / len(y_ratios)) ** 0.5
-
-        
-        if x_std < 0.1 and y_std < 0.1:
-            rate = self.config.mouse.ratio_learning_rate
-            new_ratio_x = self.mouse_ratio[0] * (1 - rate) + median_ratio_x * rate
-            new_ratio_y = self.mouse_ratio[1] * (1 - rate) + median_ratio_y * rate
-            self.mouse_ratio = (new_ratio_x, new_ratio_y)
-
-            self.logger.info(f"Updated mouse ratio: {self.mouse_ratio} "
-                           f"(std dev: x={x_std:.3f}, y={y_std:.3f})")
-        else:
-            self.logger.debug(f"Ratios too inconsistent, skipping update "
-                            f"(std dev: x={x_std:.3f}, y={y_std:.3f})")
-
     def calibrate_ratio(self, screenshot_manager, delta_x: int = 500, delta_y: int = 500) -> bool:
         
         self.logger.info("Starting mouse ratio calibration")
-        time.sleep(2)
 
         
-        screenshot_result = screenshot_manager.take_screenshot()
+        screenshot_result = self._capture_after_motion(screenshot_manager)
         if not screenshot_result.success:
             self.logger.error("Failed to take initial calibration screenshot")
             return False
 
-        initial_pos = self.find_pointer(screenshot_result.file_path)
+        initial_pos = self.find_pointer(screenshot_result.image)
         if initial_pos is None:
             self.logger.error("Cannot find pointer for calibration")
             return False
@@ -587,15 +687,13 @@ class MouseController:
             self.logger.error("Failed to perform calibration movement")
             return False
 
-        time.sleep(2)
-
         
-        screenshot_result = screenshot_manager.take_screenshot()
+        screenshot_result = self._capture_after_motion(screenshot_manager)
         if not screenshot_result.success:
             self.logger.error("Failed to take final calibration screenshot")
             return False
 
-        final_pos = self.find_pointer(screenshot_result.file_path)
+        final_pos = self.find_pointer(screenshot_result.image)
         if final_pos is None:
             self.logger.error("Cannot find pointer after calibration movement")
             return False
@@ -604,11 +702,15 @@ class MouseController:
         self.logger.info(f"Final calibration position: ({x_target}, {y_target})")
 
         
-        ratio_x = abs(x_target - x_now) / delta_x if delta_x != 0 else 1.0
-        ratio_y = abs(y_target - y_now) / delta_y if delta_y != 0 else 1.0
-        self.mouse_ratio = (ratio_x, ratio_y)
+        planned = self.model_displacement(self.plan_steps(delta_x, delta_y))
+        screen_size = screenshot_manager.get_screen_dimensions()
+        if not self.motion_model.update((x_now, y_now), planned, (x_target - x_now, y_target - y_now),
+                                        screen_size, trusted=True):
+            self.logger.warning("Calibration movement did not produce a usable motion sample")
+            return False
 
-        self.logger.info(f"Calibrated mouse ratio: {self.mouse_ratio}")
+        self.motion_model.save()
+        self.logger.info(f"Calibrated motion model: {self.motion_model.summary()}")
         return True
 
     def get_consecutive_failures(self) -> int:
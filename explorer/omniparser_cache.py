@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class OmniParserCache:
+
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT, params TEXT NOT NULL, fingerprint TEXT NOT NULL,"
+        " elements TEXT NOT NULL, labeled_image TEXT, image_bytes INTEGER NOT NULL DEFAULT 0,"
+        " created REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)",
+    )
+
+    def __init__(self, cache_dir: str, max_entries: int = 500,
+                 max_bytes: int = 200 * 1024 * 1024, max_distance: int = 0):
+        self.cache_dir = cache_dir
+        self.images_dir = os.path.join(cache_dir, "labeled_images")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        os.makedirs(self.images_dir, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(cache_dir, "cache.db"),
+                                          isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+
+        self._fingerprints: Dict[int, Tuple[str, int]] = {
+            entry_id: (params, int(fingerprint, 16))
+            for entry_id, params, fingerprint in self.connection.execute(
+                "SELECT id, params, fingerprint FROM entries")
+        }
+
+    @staticmethod
+    def params_key(box_threshold: float, iou_threshold: float, imgsz: int, use_paddleocr: bool,
+                   hash_size: int) -> str:
+
+        return json.dumps([box_threshold, iou_threshold, imgsz, use_paddleocr, hash_size])
+
+    def _closest_entry(self, params: str, fingerprint: int) -> Optional[int]:
+
+        best_id, best_distance = None, self.max_distance + 1
+        for entry_id, (entry_params, entry_fingerprint) in self._fingerprints.items():
+            if entry_params != params:
+                continue
+            distance = (fingerprint ^ entry_fingerprint).bit_count()
+            if distance < best_distance:
+                best_id, best_distance = entry_id, distance
+                if distance == 0:
+                    break
+        return best_id
+
+    def get(self, params: str, fingerprint: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+
+        try:
+            with self._lock:
+                entry_id = self._closest_entry(params, fingerprint)
+                if entry_id is None:
+                    return None
+
+                row = self.connection.execute(
+                    "SELECT elements, labeled_image FROM entries WHERE id = ?", (entry_id,)
+                ).fetchone()
+                if row is None:
+                    self._fingerprints.pop(entry_id, None)
+                    return None
+
+                self.connection.execute(
+                    "UPDATE entries SET last_used = ?, hits = hits + 1 WHERE id = ?",
+                    (time.time(), entry_id)
+                )
+
+            elements, labeled_image = row
+            if labeled_image and not os.path.exists(labeled_image):
+                labeled_image = None
+            return json.loads(elements), labeled_image
+
+        except sqlite3.Error as e:
+            self.logger.warning(f"OmniParser cache lookup failed: {e}")
+            return None
+
+    def put(self, params: str, fingerprint: int, elements: List[Dict[str, Any]],
+            labeled_image: Optional[str] = None) -> bool:
+
+        try:
+            with self._lock:
+                now = time.time()
+                cursor = self.connection.execute(
+                    "INSERT INTO entries (params, fingerprint, elements, created, last_used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (params, format(fingerprint, 'x'), json.dumps(elements), now, now)
+                )
+                entry_id = cursor.lastrowid
+                self._fingerprints[entry_id] = (params, fingerprint)
+
+                if labeled_image and os.path.exists(labeled_image):
+                    extension = os.path.splitext(labeled_image)[1] or ".webp"
+                    cached_image = os.path.join(self.images_dir, f"{entry_id}{extension}")
+                    shutil.copyfile(labeled_image, cached_image)
+                    self.connection.execute(
+                        "UPDATE entries SET labeled_image = ?, image_bytes = ? WHERE id = ?",
+                        (cached_image, os.path.getsize(cached_image), entry_id)
+                    )
+
+                self._evict()
+            return True
+
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"OmniParser cache store failed: {e}")
+            return False
+
+    def _evict(self) -> None:
+
+        count, total_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(image_bytes), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = []
+        for entry_id, labeled_image, image_bytes in self.connection.execute(
+                "SELECT id, labeled_image, image_bytes FROM entries ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            evicted.append((entry_id,))
+            count -= 1
+            total_bytes -= image_bytes
+            self._fingerprints.pop(entry_id, None)
+            if labeled_image and os.path.exists(labeled_image):
+                os.remove(labeled_image)
+
+        self.connection.executemany("DELETE FROM entries WHERE id = ?", evicted)
+        self.logger.debug(f"Evicted {len(evicted)} OmniParser cache entries")
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def close(self):
+
+        try:
+            with self._lock:
+                self.connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error closing OmniParser cache: {e}")
@@ -1,13 +1,19 @@
 
 
+import os
 import json
 import logging
-from typing import List, Dict, Optional, Any
+import tempfile
+from typing import List, Dict, Optional, Any, Union
 from gradio_client import Client, handle_file
 from PIL import Image
+import cv2
 import numpy as np
 
 from config import Config
+from core_types import ScreenshotResult
+from frame_fingerprint import FrameFingerprinter
+from omniparser_cache import OmniParserCache
 from fast_ui_detector import quick_detect_center_ui
 
 
@@ -20,9 +26,38 @@ class OmniParserClient:
         self.logger = logging.getLogger(__name__)
         self.client: Optional[Client] = None
         self.last_labeled_image: Optional[str] = None
+        self.upload_path = os.path.join(tempfile.gettempdir(), f"omniparser_upload_{os.getpid()}")
+
+        
+        self.cache: Optional[OmniParserCache] = None
+        self.fingerprinter = FrameFingerprinter.from_config(config)
+        omniparser = config.omniparser
+        self.cache_params = OmniParserCache.params_key(
+            omniparser.box_threshold, omniparser.iou_threshold, omniparser.imgsz, omniparser.use_paddleocr,
+            self.fingerprinter.hash_size
+        )
+        if omniparser.cache_enabled:
+            self._initialize_cache()
 
         self._initialize_client()
 
+    def _initialize_cache(self) -> bool:
+        
+        try:
+            cache_dir = self.config.paths.get_omniparser_cache_dir(self.config.app.name)
+            self.cache = OmniParserCache(
+                cache_dir,
+                max_entries=self.config.omniparser.cache_max_entries,
+                max_bytes=self.config.omniparser.cache_max_bytes,
+                max_distance=self.config.omniparser.cache_max_distance
+            )
+            self.logger.info(f"OmniParser cache: {cache_dir} ({len(self.cache)} entries)")
+            return True
+        except Exception as e:
+            self.logger.warning(f"OmniParser cache disabled: {e}")
+            self.cache = None
+            return False
+
     def _initialize_client(self) -> bool:
         
         try:
@@ -36,22 +71,35 @@ class OmniParserClient:
             self.logger.error(f"Failed to initialize OmniParser client: {e}")
             return False
 
-    def get_ui_elements(self, retry: bool = True) -> Optional[List[Dict[str, Any]]]:
-        
-        if not self.client:
-            if not self._initialize_client():
-                return None
-
+    def get_ui_elements(self, retry: bool = True,
+                        screenshot_result: Optional[ScreenshotResult] = None,
+                        fingerprint: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         
-        screenshot_result = self.screenshot_manager.take_screenshot()
+        if screenshot_result is None:
+            screenshot_result = self.screenshot_manager.take_screenshot()
         if not screenshot_result.success:
             self.logger.error("Failed to take screenshot for OmniParser")
             return []  
 
+        
+        if self.cache is not None:
+            if fingerprint is None:
+                fingerprint = self.fingerprinter.fingerprint(screenshot_result.image)
+            if fingerprint is not None:
+                cached = self.cache.get(self.cache_params, fingerprint)
+                if cached is not None:
+                    icons, self.last_labeled_image = cached
+                    self.logger.info(f"OmniParser cache hit ({len(icons)} UI elements)")
+                    return icons
+
+        if not self.client:
+            if not self._initialize_client():
+                return None
+
         try:
             
             result = self.client.predict(
-                image_input=handle_file(screenshot_result.file_path),
+                image_input=handle_file(self._upload_file(screenshot_result)),
                 box_threshold=self.config.omniparser.box_threshold,
                 iou_threshold=self.config.omniparser.iou_threshold,
                 use_paddleocr=self.config.omniparser.use_paddleocr,
@@ -69,10 +117,12 @@ class OmniParserClient:
                 
                 if icons_raw is None or not icons_raw:
                     self.logger.info("OmniParser returned empty result (no UI elements detected, possibly plain background)")
+                    self._store_in_cache(fingerprint, [])
                     return []  
 
                 icons = self._validate_and_filter_icons(icons_raw)
                 self.logger.debug(f"OmniParser found {len(icons)} valid UI elements")
+                self._store_in_cache(fingerprint, icons)
                 return icons
             else:
                 self.logger.warning("OmniParser returned incomplete result")
@@ -89,15 +139,21 @@ class OmniParserClient:
             
             if 'could not execute a primitive' in str(e) and retry:
                 self.logger.info("Retrying OmniParser call...")
-                return self.get_ui_elements(retry=False)
+                return self.get_ui_elements(retry=False, screenshot_result=screenshot_result,
+                                            fingerprint=fingerprint)
 
             
-            if self._check_for_password_ui(screenshot_result.file_path):
+            if self._check_for_password_ui(screenshot_result.image):
                 self.logger.warning("Password UI detected")
                 return []  
 
             return []  
 
+    def _store_in_cache(self, fingerprint: Optional[int], icons: List[Dict[str, Any]]) -> None:
+        
+        if self.cache is not None and fingerprint is not None:
+            self.cache.put(self.cache_params, fingerprint, icons, self.last_labeled_image)
+
     def _validate_and_filter_icons(self, icons_raw: List[Any]) -> List[Dict[str, Any]]:
         
         
@@ -142,10 +198,25 @@ class OmniParserClient:
 
         return validated_icons
 
-    def _check_for_password_ui(self, screenshot_path: str) -> bool:
+    def _upload_file(self, screenshot_result: ScreenshotResult) -> str:
+        
+        if screenshot_result.jpeg_bytes is not None:
+            upload_path = self.upload_path + ".jpg"
+            with open(upload_path, 'wb') as f:
+                f.write(screenshot_result.jpeg_bytes)
+            return upload_path
+
+        if screenshot_result.file_path and os.path.exists(screenshot_result.file_path):
+            return screenshot_result.file_path
+
+        upload_path = self.upload_path + ".png"
+        cv2.imwrite(upload_path, screenshot_result.image)
+        return upload_path
+
+    def _check_for_password_ui(self, screenshot: Union[str, np.ndarray]) -> bool:
         
         try:
-            return quick_detect_center_ui(screenshot_path)
+            return quick_detect_center_ui(screenshot)
         except Exception as e:
             self.logger.error(f"Error checking for password UI: {e}")
             return False
@@ -176,5 +247,12 @@ class OmniParserClient:
             'iou_threshold': self.config.omniparser.iou_threshold,
             'use_paddleocr': self.config.omniparser.use_paddleocr,
             'imgsz': self.config.omniparser.imgsz,
-            'connected': self.client is not None
-        }
\ No newline at end of file
+            'connected': self.client is not None,
+            'cache_entries': len(self.cache) if self.cache is not None else 0
+        }
+
+    def close(self):
+        
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
\ No newline at end of file
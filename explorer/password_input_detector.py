@@ -2,7 +2,7 @@
 
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
 
 class PasswordInputDetector:
@@ -15,9 +15,9 @@ class PasswordInputDetector:
         self.aspect_ratio_range = (1.5, 6.0)  
         self.min_brightness_threshold = 180  
 
-    def detect(self, image_path: str) -> bool:
+    def detect(self, image: Union[str, np.ndarray]) -> bool:
         
-        img = cv2.imread(image_path)
+        img = cv2.imread(image) if isinstance(image, str) else image
         if img is None:
             return False
 
@@ -186,10 +186,10 @@ class PasswordInputDetector:
 
 
 
-def quick_test(image_path: str) -> bool:
+def quick_test(image: Union[str, np.ndarray]) -> bool:
     
     detector = PasswordInputDetector()
-    return detector.detect(image_path)
+    return detector.detect(image)
 
 
 if __name__ == "__main__":
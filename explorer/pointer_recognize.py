@@ -15,7 +15,8 @@ pointer_template = {
     }
 }
 
-def update_custom_center(main_image, threshold=0.3, temp_save_path='temp_filtered_image.png', show_visualization=False):
+def update_custom_center(main_image, threshold=0.3, temp_save_path='temp_filtered_image.png', show_visualization=False,
+                         debug=False):
     
     global custom_center
     
@@ -33,7 +34,8 @@ def update_custom_center(main_image, threshold=0.3, temp_save_path='temp_filtere
     hsv_main = cv2.cvtColor(main_image, cv2.COLOR_BGR2HSV)
     mask_main = cv2.inRange(hsv_main, lower_green, upper_green)
     filtered_main = cv2.bitwise_and(main_image, main_image, mask=mask_main)
-    cv2.imwrite(temp_save_path, filtered_main)
+    if debug:
+        cv2.imwrite(temp_save_path, filtered_main)
     
     
     if show_visualization:
@@ -135,7 +137,53 @@ def update_custom_center(main_image, threshold=0.3, temp_save_path='temp_filtere
     
     return closest_circle
 
-def find_pointer_centers(main_image, threshold=0.3, temp_save_path='temp_filtered_image.png', show_visualization=False):
+_ring_offset_cache = {}
+
+def ring_offsets(radius):
+    
+    offsets = _ring_offset_cache.get(radius)
+    if offsets is None:
+        size = 2 * radius + 1
+        ring = np.zeros((size, size), dtype=np.uint8)
+        cv2.circle(ring, (radius, radius), radius, 255, 1)
+        dy, dx = np.nonzero(ring)
+        offsets = (dy - radius, dx - radius)
+        _ring_offset_cache[radius] = offsets
+    return offsets
+
+def candidate_boldness(gray, circles, center_roi_size=5):
+    
+    circles = np.asarray(circles, dtype=np.int64).reshape(-1, 3)
+    img_h, img_w = gray.shape[:2]
+    
+    
+    ids, ys, xs = [], [], []
+    for index, (x, y, r) in enumerate(circles):
+        dy, dx = ring_offsets(int(r))
+        ids.append(np.full(dy.shape, index))
+        ys.append(dy + y)
+        xs.append(dx + x)
+    ids, ys, xs = np.concatenate(ids), np.concatenate(ys), np.concatenate(xs)
+    inside = (ys >= 0) & (ys < img_h) & (xs >= 0) & (xs < img_w)
+    ids, ys, xs = ids[inside], ys[inside], xs[inside]
+    ring_sums = np.bincount(ids, weights=gray[ys, xs], minlength=len(circles))
+    ring_counts = np.bincount(ids, minlength=len(circles))
+    
+    
+    integral = cv2.integral(gray)
+    x, y = circles[:, 0], circles[:, 1]
+    x1, x2 = np.clip(x - center_roi_size, 0, img_w), np.clip(x + center_roi_size, 0, img_w)
+    y1, y2 = np.clip(y - center_roi_size, 0, img_h), np.clip(y + center_roi_size, 0, img_h)
+    center_sums = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+    center_counts = (x2 - x1) * (y2 - y1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        circle_boldness = ring_sums / ring_counts / 255.0
+        center_boldness = center_sums / center_counts / 255.0
+    return circle_boldness, center_boldness
+
+def find_pointer_centers(main_image, threshold=0.3, temp_save_path='temp_filtered_image.png', show_visualization=False,
+                         roi=None, debug=False):
     
     global custom_center, pointer_template
     
@@ -150,18 +198,34 @@ def find_pointer_centers(main_image, threshold=0.3, temp_save_path='temp_filtere
         raise ValueError("Main image is empty or not loaded correctly.")
     
     
-    hsv_main = cv2.cvtColor(main_image, cv2.COLOR_BGR2HSV)
+    img_h, img_w = main_image.shape[:2]
+    offset_x, offset_y = 0, 0
+    search_image = main_image
+    if roi is not None:
+        x1, y1 = max(0, int(roi[0])), max(0, int(roi[1]))
+        x2, y2 = min(img_w, int(roi[2])), min(img_h, int(roi[3]))
+        if x2 - x1 < 2 * pointer_template['circle_radius'] or y2 - y1 < 2 * pointer_template['circle_radius']:
+            return None
+        search_image = main_image[y1:y2, x1:x2]
+        offset_x, offset_y = x1, y1
+    
+    
+    hsv_main = cv2.cvtColor(search_image, cv2.COLOR_BGR2HSV)
     mask_main = cv2.inRange(hsv_main, pointer_template['hsv_range']['lower'], pointer_template['hsv_range']['upper'])
-    filtered_main = cv2.bitwise_and(main_image, main_image, mask=mask_main)
-    cv2.imwrite(temp_save_path, filtered_main)
     
     
-    if show_visualization:
-        cv2.imshow('Filtered Image (Green)', filtered_main)
-        cv2.waitKey(1)  
+    visualize = show_visualization or debug
+    if visualize:
+        filtered_main = cv2.bitwise_and(search_image, search_image, mask=mask_main)
+        if debug:
+            cv2.imwrite(temp_save_path, filtered_main)
+        if show_visualization:
+            cv2.imshow('Filtered Image (Green)', filtered_main)
+            cv2.waitKey(1)  
     
     
-    gray = cv2.cvtColor(filtered_main, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(search_image, cv2.COLOR_BGR2GRAY)
+    gray = cv2.bitwise_and(gray, gray, mask=mask_main)
     
     
     blurred = cv2.GaussianBlur(gray, (9, 9), 2)
@@ -203,66 +267,54 @@ def find_pointer_centers(main_image, threshold=0.3, temp_save_path='temp_filtere
         if circles is None:
             continue
         
-        circles = np.uint16(np.around(circles))
+        circles = np.uint16(np.around(circles))[0]
         
         
-        img_h, img_w = main_image.shape[:2]
         if custom_center is not None:
             center_x, center_y = custom_center
         else:
             center_x, center_y = img_w // 2, img_h // 2
         
         
-        visualization = filtered_main.copy()
+        visualization = filtered_main.copy() if visualize else None
         
         
+        circle_boldness, center_boldness = candidate_boldness(gray, circles)
+        matches = (
+            (np.abs(circle_boldness - pointer_template['circle_boldness']) <= boldness_tolerance) &
+            (np.abs(center_boldness - pointer_template['center_boldness']) <= boldness_tolerance)
+        )
+        
         valid_circles = []
-        for circle in circles[0, :]:
-            x, y, r = circle
-            
-            
-            circle_mask = np.zeros_like(gray)
-            cv2.circle(circle_mask, (x, y), r, 255, 1)
-            circle_pixels = gray[circle_mask > 0]
-            circle_boldness = np.mean(circle_pixels) / 255.0
-            
+        for x, y, r in circles[matches]:
+            frame_x, frame_y = int(x) + offset_x, int(y) + offset_y
+            distance = np.sqrt((frame_x - center_x)**2 + (frame_y - center_y)**2)
+            valid_circles.append(((x, y), distance))
             
-            center_roi_size = 5
-            center_roi = gray[
-                max(0, y - center_roi_size):min(gray.shape[0], y + center_roi_size),
-                max(0, x - center_roi_size):min(gray.shape[1], x + center_roi_size)
-            ]
-            center_boldness = np.mean(center_roi) / 255.0
-            
-            
-            circle_boldness_match = abs(circle_boldness - pointer_template['circle_boldness']) <= boldness_tolerance
-            center_boldness_match = abs(center_boldness - pointer_template['center_boldness']) <= boldness_tolerance
-            
-            if circle_boldness_match and center_boldness_match:
-                distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-                valid_circles.append(((x, y), distance))
+            if visualize:
                 
-                if show_visualization:
-                    
-                    cv2.circle(visualization, (x, y), r, (0, 255, 0), 2)
-                    
-                    cv2.circle(visualization, (x, y), 2, (0, 0, 255), 3)
-        print(valid_circles)
+                cv2.circle(visualization, (x, y), r, (0, 255, 0), 2)
+                
+                cv2.circle(visualization, (x, y), 2, (0, 0, 255), 3)
+        if debug:
+            print(valid_circles)
         if valid_circles:
             
             selected = max(valid_circles, key=lambda x: x[1])
             selected_center = selected[0]
             
             
-            cv2.circle(visualization, selected_center, 5, (255, 0, 0), -1)  
-            cv2.imwrite('temp_filtered_image.png',visualization)
+            if visualize:
+                cv2.circle(visualization, selected_center, 5, (255, 0, 0), -1)  
+            if debug:
+                cv2.imwrite(temp_save_path, visualization)
             
             if show_visualization:
                 cv2.imshow('Final Selection', visualization)
                 cv2.waitKey(0)  
                 cv2.destroyAllWindows()
             
-            return (int(selected_center[0]), int(selected_center[1]))
+            return (int(selected_center[0]) + offset_x, int(selected_center[1]) + offset_y)
     
     
     if show_visualization:
@@ -270,6 +322,71 @@ def find_pointer_centers(main_image, threshold=0.3, temp_save_path='temp_filtere
         cv2.destroyAllWindows()
     return None
 
+def find_pointer_candidates(main_image, scale=4, max_candidates=8):
+    
+    template_radius = pointer_template['circle_radius']
+    img_h, img_w = main_image.shape[:2]
+    small = cv2.resize(main_image, (max(1, img_w // scale), max(1, img_h // scale)), interpolation=cv2.INTER_AREA)
+    
+    
+    hsv_small = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+    mask_small = cv2.inRange(hsv_small, pointer_template['hsv_range']['lower'], pointer_template['hsv_range']['upper'])
+    mask_small = cv2.morphologyEx(mask_small, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+    
+    
+    min_size = max(2, int(2 * template_radius * 0.2 / scale))
+    max_size = int(2 * min(100, template_radius * 1.8) / scale) + 2
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask_small, connectivity=8)
+    
+    expected_size = 2 * template_radius / scale
+    candidates = []
+    for label in range(1, count):
+        x, y, w, h, area = stats[label]
+        if min_size <= max(w, h) <= max_size and min(w, h) >= min_size // 2:
+            candidates.append((abs(max(w, h) - expected_size), x, y, w, h))
+    candidates.sort()
+    
+    
+    margin = min(100, int(template_radius * 1.8)) + 10
+    patches = []
+    for _, x, y, w, h in candidates[:max_candidates]:
+        patches.append((
+            max(0, int(x) * scale - margin),
+            max(0, int(y) * scale - margin),
+            min(img_w, int(x + w) * scale + margin),
+            min(img_h, int(y + h) * scale + margin)
+        ))
+    return patches
+
+def find_pointer_pyramid(main_image, scale=4, max_candidates=8, show_visualization=False, debug=False):
+    
+    if pointer_template['circle_radius'] is None:
+        raise ValueError("Pointer template has not been analyzed. Call analyze_pointer_template first.")
+    
+    if isinstance(main_image, str):
+        main_image = cv2.imread(main_image)
+    if main_image is None or main_image.size == 0:
+        raise ValueError("Main image is empty or not loaded correctly.")
+    
+    
+    img_h, img_w = main_image.shape[:2]
+    if custom_center is not None:
+        center_x, center_y = custom_center
+    else:
+        center_x, center_y = img_w // 2, img_h // 2
+    
+    
+    selected, selected_distance = None, -1.0
+    for roi in find_pointer_candidates(main_image, scale, max_candidates):
+        pointer = find_pointer_centers(main_image, roi=roi, show_visualization=show_visualization, debug=debug)
+        if pointer is None:
+            continue
+        distance = np.sqrt((pointer[0] - center_x)**2 + (pointer[1] - center_y)**2)
+        if distance > selected_distance:
+            selected, selected_distance = pointer, distance
+    
+    return selected
+
 def analyze_pointer_template(template_image_path='../screenshots/pointer_template_main.png', show_visualization=False):
     
     global pointer_template
@@ -9,9 +9,6 @@ import json
 import os
 from datetime import datetime
 from state_explorer_refactored import StateExplorerApp
-from mouse_controller import MouseController
-from esp32_mouse import ESP32Mouse
-from screenshot_manager import ScreenshotManager
 from config import Config
 
 
@@ -132,13 +129,16 @@ def main():
     try:
         
         temp_app = StateExplorerApp("temp", timeout_minutes=args.timeout)
-        temp_app.esp32 = ESP32Mouse(port=temp_app.config.app.esp32_port, debug=temp_app.config.app.esp32_debug)
-        temp_app.screenshot_manager = ScreenshotManager(temp_app.config)
-        temp_app.config.update_from_env()
-        temp_app.mouse_controller = MouseController(temp_app.config, temp_app.esp32)
-        if not temp_app.setup():
-            print("❌ Failed to setup system, exiting...")
-            return
+        try:
+            if not temp_app.setup():
+                print("❌ Failed to setup system, exiting...")
+                return
+        finally:
+            
+            if temp_app.screenshot_manager:
+                temp_app.screenshot_manager.close()
+            if temp_app.esp32:
+                temp_app.esp32.close()
         print("✅ System setup complete!")
     except Exception as e:
         print(f"❌ Setup failed: {e}")
@@ -165,6 +165,8 @@ def main():
             print(f"Setting up {app_name}...")
             if not app.setup():
                 print(f"❌ Failed to setup {app_name}")
+                if app.esp32:
+                    app.esp32.close()
                 status[app_name] = {
                     "status": "Setup Failed",
                     "timestamp": datetime.now().isoformat(),
@@ -1,16 +1,68 @@
 
 
 import time
+import queue
 import socket
 import logging
+import threading
 import requests
 import cv2
 import numpy as np
 import mss
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from config import Config
 from core_types import ScreenshotResult
+from frame_grabber import Frame, FrameSource, GStreamerSocketSource, MJPEGStreamSource
+
+
+class ScreenshotWriter:
+    
+
+    def __init__(self, queue_size: int = 8):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.logger = logging.getLogger(__name__)
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, file_path: str, image: np.ndarray, jpeg_bytes: Optional[bytes] = None) -> bool:
+        
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+            self._thread.start()
+
+        try:
+            self.queue.put_nowait((file_path, image, jpeg_bytes))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            self.logger.debug(f"Screenshot writer busy, dropped {file_path}")
+            return False
+
+    def _run(self) -> None:
+        
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            file_path, image, jpeg_bytes = item
+            try:
+                if jpeg_bytes is not None:
+                    with open(file_path, 'wb') as f:
+                        f.write(jpeg_bytes)
+                else:
+                    cv2.imwrite(file_path, image)
+            except Exception as e:
+                self.logger.warning(f"Failed to save screenshot {file_path}: {e}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
 
 
 class ScreenshotManager:
@@ -19,6 +71,9 @@ class ScreenshotManager:
     def __init__(self, config: Config):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.frame_sources: Dict[str, FrameSource] = {}
+        self.capture_count = 0
+        self.writer = ScreenshotWriter(config.screenshot_persistence.queue_size)
 
     def take_screenshot(self, source: Optional[str] = None) -> ScreenshotResult:
         
@@ -26,15 +81,14 @@ class ScreenshotManager:
             source = self.config.app.screenshot_source
 
         timestamp = time.strftime("%Y%m%d-%H%M%S")
-        file_path = f"{self.config.paths.screenshot_dir}/screenshot_{timestamp}.png"
 
         try:
             if source == 'airplay':
-                return self._capture_airplay(file_path, timestamp)
+                return self._capture_airplay(timestamp)
             elif source == 'remote':
-                return self._capture_remote_stream(file_path, timestamp)
+                return self._capture_remote_stream(timestamp)
             elif source == 'gstreamer':
-                return self._capture_gstreamer(file_path, timestamp)
+                return self._capture_gstreamer(timestamp)
             else:
                 error_msg = f"Unknown screenshot source: {source}"
                 self.logger.error(error_msg)
@@ -54,7 +108,72 @@ class ScreenshotManager:
                 error_message=error_msg
             )
 
-    def _capture_airplay(self, file_path: str, timestamp: str) -> ScreenshotResult:
+    def wait_for_frame_after(self, after: float, timeout: Optional[float] = None,
+                             source: Optional[str] = None) -> ScreenshotResult:
+        
+        if source is None:
+            source = self.config.app.screenshot_source
+
+        frame_source = self._get_frame_source(source) if source in ('remote', 'gstreamer') else None
+        if frame_source is None:
+            
+            delay = after - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            return self.take_screenshot(source)
+
+        grabber = self.config.frame_grabber
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        timeout = grabber.wait_timeout if timeout is None else timeout
+        frame = frame_source.wait_for_frame_after(after + grabber.pipeline_latency, timeout)
+        if frame is None:
+            error_msg = f"No {frame_source.name} frame captured after action within {timeout:.1f}s"
+            self.logger.error(error_msg)
+            return ScreenshotResult(
+                success=False,
+                file_path=None,
+                timestamp=timestamp,
+                error_message=error_msg
+            )
+
+        try:
+            return self._result_from_frame(frame_source, frame, timestamp)
+        except Exception as e:
+            error_msg = f"Screenshot capture failed: {str(e)}"
+            self.logger.error(error_msg)
+            return ScreenshotResult(
+                success=False,
+                file_path=None,
+                timestamp=timestamp,
+                error_message=error_msg
+            )
+
+    def _build_result(self, image: np.ndarray, timestamp: str,
+                      jpeg_bytes: Optional[bytes] = None, seq: Optional[int] = None,
+                      capture_time: Optional[float] = None) -> ScreenshotResult:
+        
+        self.config.screen.height, self.config.screen.width = image.shape[:2]
+
+        self.capture_count += 1
+        file_path = None
+        persistence = self.config.screenshot_persistence
+        if persistence.enabled and self.capture_count % max(1, persistence.sample_every) == 0:
+            extension = "jpg" if jpeg_bytes is not None else "png"
+            file_path = f"{self.config.paths.screenshot_dir}/screenshot_{timestamp}_{self.capture_count:06d}.{extension}"
+            if not self.writer.submit(file_path, image, jpeg_bytes):
+                file_path = None
+
+        return ScreenshotResult(
+            success=True,
+            file_path=file_path,
+            timestamp=timestamp,
+            image=image,
+            jpeg_bytes=jpeg_bytes,
+            seq=seq if seq is not None else self.capture_count,
+            capture_time=capture_time if capture_time is not None else time.time()
+        )
+
+    def _capture_airplay(self, timestamp: str) -> ScreenshotResult:
         
         try:
             with mss.mss() as sct:
@@ -63,22 +182,68 @@ class ScreenshotManager:
                 frame = np.array(screenshot)
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
 
-                
-                self.config.screen.height, self.config.screen.width = frame.shape[:2]
-
-                cv2.imwrite(file_path, frame)
-                self.logger.debug(f"Airplay screenshot saved: {file_path}")
-
-                return ScreenshotResult(
-                    success=True,
-                    file_path=file_path,
-                    timestamp=timestamp
-                )
+                return self._build_result(frame, timestamp)
         except Exception as e:
             raise Exception(f"Airplay capture failed: {str(e)}")
 
-    def _capture_remote_stream(self, file_path: str, timestamp: str) -> ScreenshotResult:
+    def _get_frame_source(self, source: str) -> Optional[FrameSource]:
+        
+        if not self.config.frame_grabber.enabled:
+            return None
+
+        frame_source = self.frame_sources.get(source)
+        if frame_source is None:
+            grabber = self.config.frame_grabber
+            if source == 'remote':
+                frame_source = MJPEGStreamSource(
+                    self.config.network.remote_stream_url,
+                    buffer_size=grabber.buffer_size,
+                    reconnect_delay=grabber.reconnect_delay
+                )
+            elif source == 'gstreamer':
+                frame_source = GStreamerSocketSource(
+                    self.config.network.gstreamer_host,
+                    self.config.network.gstreamer_port,
+                    buffer_size=grabber.buffer_size,
+                    reconnect_delay=grabber.reconnect_delay
+                )
+            else:
+                return None
+            frame_source.start()
+            self.frame_sources[source] = frame_source
+
+        return frame_source
+
+    def _capture_from_source(self, frame_source: FrameSource, timestamp: str) -> ScreenshotResult:
+        
+        grabber = self.config.frame_grabber
+        frame = frame_source.latest()
+        if frame is None or frame.age > grabber.max_frame_age:
+            frame = frame_source.wait_for_frame(grabber.max_frame_age, grabber.wait_timeout)
+        if frame is None:
+            raise Exception(f"No frame received from {frame_source.name} source "
+                            f"within {grabber.wait_timeout:.1f}s")
+
+        return self._result_from_frame(frame_source, frame, timestamp)
+
+    def _result_from_frame(self, frame_source: FrameSource, frame: Frame, timestamp: str) -> ScreenshotResult:
         
+        img = frame.image
+        if img is None:
+            raise Exception(f"Could not decode {frame_source.name} frame")
+
+        self.logger.debug(f"{frame_source.name} frame #{frame.seq} captured (age {frame.age * 1000:.0f}ms)")
+        return self._build_result(img, timestamp, frame.jpeg, frame.seq, frame.timestamp)
+
+    def _capture_remote_stream(self, timestamp: str) -> ScreenshotResult:
+        
+        frame_source = self._get_frame_source('remote')
+        if frame_source is not None:
+            try:
+                return self._capture_from_source(frame_source, timestamp)
+            except Exception as e:
+                raise Exception(f"Remote stream capture failed: {str(e)}")
+
         try:
             url = self.config.network.remote_stream_url
             stream = requests.get(url, stream=True, timeout=10)
@@ -99,25 +264,23 @@ class ScreenshotManager:
                     )
 
                     if img is not None:
-                        
-                        self.config.screen.height, self.config.screen.width = img.shape[:2]
-
-                        cv2.imwrite(file_path, img)
-                        self.logger.debug(f"Remote stream screenshot saved: {file_path}")
-
-                        return ScreenshotResult(
-                            success=True,
-                            file_path=file_path,
-                            timestamp=timestamp
-                        )
+                        self.logger.debug("Remote stream screenshot captured")
+                        return self._build_result(img, timestamp, jpg)
 
             raise Exception("No valid JPEG frame received from remote stream")
 
         except Exception as e:
             raise Exception(f"Remote stream capture failed: {str(e)}")
 
-    def _capture_gstreamer(self, file_path: str, timestamp: str) -> ScreenshotResult:
+    def _capture_gstreamer(self, timestamp: str) -> ScreenshotResult:
         
+        frame_source = self._get_frame_source('gstreamer')
+        if frame_source is not None:
+            try:
+                return self._capture_from_source(frame_source, timestamp)
+            except Exception as e:
+                raise Exception(f"GStreamer capture failed: {str(e)}")
+
         sock = None
         try:
             
@@ -152,17 +315,8 @@ class ScreenshotManager:
                         frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
                         if frame is not None:
-                            
-                            self.config.screen.height, self.config.screen.width = frame.shape[:2]
-
-                            cv2.imwrite(file_path, frame)
-                            self.logger.debug(f"GStreamer screenshot saved: {file_path}")
-
-                            return ScreenshotResult(
-                                success=True,
-                                file_path=file_path,
-                                timestamp=timestamp
-                            )
+                            self.logger.debug("GStreamer screenshot captured")
+                            return self._build_result(frame, timestamp, jpeg_data)
 
                         
                         buffer = buffer[end_idx + 2:]
@@ -178,6 +332,13 @@ class ScreenshotManager:
             if sock:
                 sock.close()
 
+    def close(self):
+        
+        for frame_source in self.frame_sources.values():
+            frame_source.stop()
+        self.frame_sources.clear()
+        self.writer.close()
+
     def get_screen_dimensions(self) -> Tuple[int, int]:
         
         return self.config.screen.width, self.config.screen.height
\ No newline at end of file
@@ -0,0 +1,74 @@
+import time
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+from core_types import ScreenshotResult
+
+
+class SettleDetector:
+    
+
+    def __init__(self, diff_threshold: float = 2.0, stable_frames: int = 3,
+                 timeout: float = 5.0, min_wait: float = 0.15, width: int = 64):
+        self.diff_threshold = diff_threshold
+        self.stable_frames = stable_frames
+        self.timeout = timeout
+        self.min_wait = min_wait
+        self.width = width
+
+    @classmethod
+    def from_config(cls, config) -> 'SettleDetector':
+
+        settle = config.settle
+        return cls(
+            diff_threshold=settle.diff_threshold,
+            stable_frames=settle.stable_frames,
+            timeout=settle.timeout,
+            min_wait=settle.min_wait,
+            width=settle.width
+        )
+
+    def thumbnail(self, image: np.ndarray) -> np.ndarray:
+
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = image.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    @staticmethod
+    def difference(thumbnail1: np.ndarray, thumbnail2: np.ndarray) -> float:
+
+        if thumbnail1.shape != thumbnail2.shape:
+            return float('inf')
+        return float(np.abs(thumbnail1 - thumbnail2).mean())
+
+    def wait_until_settled(self, screenshot_manager, since: float) -> Tuple[ScreenshotResult, bool]:
+
+        deadline = time.time() + self.timeout
+        after = since + self.min_wait
+        result: Optional[ScreenshotResult] = None
+        previous: Optional[np.ndarray] = None
+        stable = 0
+
+        while True:
+            frame = screenshot_manager.wait_for_frame_after(
+                after, max(deadline - time.time(), self.min_wait)
+            )
+            if not frame.success:
+                return (result or frame), False
+
+            result = frame
+            current = self.thumbnail(frame.image)
+            if previous is not None and self.difference(previous, current) <= self.diff_threshold:
+                stable += 1
+                if stable >= self.stable_frames:
+                    return result, True
+            else:
+                stable = 0
+
+            previous = current
+            after = frame.capture_time
+            if time.time() >= deadline:
+                return result, False
@@ -4,7 +4,8 @@ import os
 import time
 import logging
 import cv2
-from typing import Optional, Tuple, List
+import numpy as np
+from typing import Optional, Tuple, List, Set
 
 from config import Config
 from core_types import State, Button, PointerMoveResult
@@ -12,6 +13,8 @@ from state_graph import StateGraph
 from mouse_controller import MouseController
 from screenshot_manager import ScreenshotManager
 from metrics_manager import MetricsManager
+from frame_fingerprint import FrameFingerprinter
+from settle_detector import SettleDetector
 
 
 class StateExplorer:
@@ -30,15 +33,21 @@ class StateExplorer:
         self.esp32 = esp32
         self.app_manager = app_manager
         self.logger = logging.getLogger(__name__)
+        self.fingerprinter = FrameFingerprinter.from_config(config) if config.fingerprint.enabled else None
+        self.settle_detector = SettleDetector.from_config(config) if config.settle.enabled else None
 
         self.current_state: Optional[State] = None
         self.clicks_since_new_state = 0
+        self.exploring_state_ids: Set[str] = set()
+        self.resume_pending = False
         self.last_trigger_button: Optional[Tuple[State, Button]] = None
         self.home_return_count = 0  
         
         
         self.click_counter = 0
         self.clicked_buttons_dir = ""
+        self.last_action_time = 0.0
+        self.last_action_delay = 0.0
         self._setup_clicked_buttons_dir()
 
     def _setup_clicked_buttons_dir(self):
@@ -53,17 +62,14 @@ class StateExplorer:
         except Exception as e:
             self.logger.warning(f"Could not setup clicked buttons directory: {e}")
 
-    def save_clicked_button_image(self, button: Button, screenshot_path: str) -> Optional[str]:
+    def save_clicked_button_image(self, button: Button, screenshot: np.ndarray) -> Optional[str]:
         
-        if not self.clicked_buttons_dir or not os.path.exists(screenshot_path):
+        if not self.clicked_buttons_dir or screenshot is None:
             return None
             
         try:
             
-            img = cv2.imread(screenshot_path)
-            if img is None:
-                self.logger.warning(f"Could not read screenshot: {screenshot_path}")
-                return None
+            img = screenshot.copy()
             
             height, width = img.shape[:2]
             
@@ -124,9 +130,45 @@ class StateExplorer:
             raise TimeoutError(f"Exploration timeout reached ({timeout_minutes} minutes)")
 
         
+        wait_start = time.time()
+        if self.settle_detector is not None:
+            screenshot_result, settled = self.settle_detector.wait_until_settled(
+                self.screenshot_manager, self.last_action_time
+            )
+            if not settled:
+                self.logger.warning("UI did not settle before timeout, using latest frame")
+        else:
+            screenshot_result = self.screenshot_manager.wait_for_frame_after(
+                self.last_action_time + self.last_action_delay
+            )
+        ui_wait_time = time.time() - wait_start
+        self.metrics_manager.record_timing("UI_Wait", ui_wait_time)
+        self.logger.info(f"⏱️ UI wait took {ui_wait_time:.2f}s")
+        fingerprint = None
+        if self.fingerprinter is not None and screenshot_result.success:
+            fingerprint = self.fingerprinter.fingerprint(screenshot_result.image)
+
+        if fingerprint is not None:
+            known_state = self.graph.find_state_by_fingerprint(
+                fingerprint, self.fingerprinter,
+                preferred=self.current_state if clicked_button_id is None else None
+            )
+            if known_state is not None:
+                self.metrics_manager.record_fingerprint_hit()
+                if clicked_button_id is not None:
+                    self.metrics_manager.record_button_explored()
+                total_time = time.time() - timing_start
+                self.logger.info(f"⏱️ State check total: {total_time:.2f}s (frame fingerprint hit, OmniParser skipped)")
+                return True, self._enter_known_state(known_state, clicked_button_id)
+            self.metrics_manager.record_fingerprint_miss()
+
+        
         try:
             omniparser_start = time.time()
-            ui_elements = self.omniparser_client.get_ui_elements()
+            ui_elements = self.omniparser_client.get_ui_elements(
+                screenshot_result=screenshot_result if screenshot_result.success else None,
+                fingerprint=fingerprint
+            )
             omniparser_time = time.time() - omniparser_start
             self.logger.info(f"⏱️ OmniParser took {omniparser_time:.2f}s")
 
@@ -168,19 +210,12 @@ class StateExplorer:
         total_time = time.time() - timing_start
         self.logger.info(f"⏱️ State check total: {total_time:.2f}s (OmniParser: {omniparser_time:.2f}s, state comparison: {state_check_time:.2f}s)")
         if similar_state:
-            
-            if (self.current_state and self.current_state != similar_state and
-                clicked_button_id is not None):
-                
-                clicked_button = self._find_button_by_id(self.current_state, clicked_button_id)
-                if clicked_button:
-                    self.graph.add_edge(self.current_state, similar_state, clicked_button)
-
-            self.current_state = similar_state
-            return True, similar_state
+            self._remember_fingerprint(similar_state, fingerprint)
+            return True, self._enter_known_state(similar_state, clicked_button_id)
 
         
         was_added = self.graph.add_state(new_state)
+        self._remember_fingerprint(new_state, fingerprint)
         if was_added:
             self.metrics_manager.record_state_found()
 
@@ -199,12 +234,45 @@ class StateExplorer:
         self.current_state = new_state
         return False, new_state
 
+    def _enter_known_state(self, known_state: State, clicked_button_id: Optional[str]) -> State:
+        
+        if (self.current_state and self.current_state != known_state and
+            clicked_button_id is not None):
+            
+            clicked_button = self._find_button_by_id(self.current_state, clicked_button_id)
+            if clicked_button:
+                self.graph.add_edge(self.current_state, known_state, clicked_button)
+
+        self.current_state = known_state
+        return known_state
+
+    def _remember_fingerprint(self, state: State, fingerprint: Optional[int]) -> None:
+        
+        if fingerprint is not None:
+            self.graph.add_fingerprint(state, fingerprint, self.config.fingerprint.max_fingerprints_per_state)
+
     def explore_state(self, state: State) -> None:
         
+        self.exploring_state_ids.add(state.state_id)
+        try:
+            self._explore_state_buttons(state)
+        finally:
+            self.exploring_state_ids.discard(state.state_id)
+
+    def _should_explore_known_state(self, state: State, new_state: State) -> bool:
+        
+        return (new_state != state and new_state.state_id not in self.exploring_state_ids
+                and self.graph.is_frontier_state(new_state))
+
+    def _explore_state_buttons(self, state: State) -> None:
+        
         self.metrics_manager.record_state_explored()
 
         button_count = 0
         while state.has_unexplored_buttons():
+            if self.resume_pending:
+                return
+
             iteration_start = time.time()
             button_count += 1
 
@@ -257,14 +325,21 @@ class StateExplorer:
                 self.logger.info(f"⏱️ TOTAL ITERATION TIME: {iteration_time:.2f}s")
 
                 if is_known_state:
-                    self.clicks_since_new_state += 1
-                    self.logger.debug(f"Reached known state (clicks since new: {self.clicks_since_new_state})")
-
                     
                     if self.config.exploration.enable_home_detection and self._handle_home_return(new_state):
                         return
 
                     
+                    if self._should_explore_known_state(state, new_state):
+                        self.last_trigger_button = (state, button)
+                        self.logger.info(f"🔍 Known state still has unexplored buttons, exploring it...")
+                        self.explore_state(new_state)
+                        continue
+
+                    self.clicks_since_new_state += 1
+                    self.logger.debug(f"Reached known state (clicks since new: {self.clicks_since_new_state})")
+
+                    
                     if self.clicks_since_new_state >= self.config.exploration.max_clicks_without_new_state:
                         self.logger.info("Too many clicks without new state, restarting")
                         self._restart_app_and_resume()
@@ -311,6 +386,7 @@ class StateExplorer:
 
             self.logger.info("📱 Starting comprehensive state exploration from app initial state")
             self.explore_state(initial_state)
+            self._explore_frontier()
 
         except TimeoutError:
             self.logger.info("Exploration stopped due to timeout")
@@ -319,6 +395,55 @@ class StateExplorer:
         finally:
             self._finalize_exploration()
 
+    def _explore_frontier(self) -> None:
+        
+        stalled_attempts = 0
+        while self.graph.has_unexplored_states() and not self.metrics_manager.is_timeout_reached():
+            self.resume_pending = False
+            progress = (self.graph.get_stats()['unexplored_buttons'], len(self.graph.nodes))
+
+            target_state = self._navigate_to_frontier()
+            if target_state is not None:
+                self.explore_state(target_state)
+
+            if (self.graph.get_stats()['unexplored_buttons'], len(self.graph.nodes)) != progress:
+                stalled_attempts = 0
+                continue
+
+            stalled_attempts += 1
+            if stalled_attempts > self.config.exploration.max_resume_attempts:
+                self.logger.warning(f"Could not reach any of the {self.graph.get_frontier_size()} states "
+                                    f"with unexplored buttons, ending exploration")
+                return
+            if not self.resume_pending:
+                self._restart_app()
+
+    def _navigate_to_frontier(self) -> Optional[State]:
+        
+        _, current_state = self.check_current_state()
+        if current_state is None:
+            return None
+
+        found = self.graph.find_path_to_frontier(current_state)
+        if found is None:
+            self.logger.info("No known path from the current state to a state with unexplored buttons")
+            return None
+
+        target_state, path = found
+        self.logger.info(f"🧭 Resuming toward state {target_state.state_id[:8]}... ({len(path)} clicks away, "
+                         f"{self.graph.get_frontier_size()} states with unexplored buttons)")
+        for button in path:
+            if not self._click_button(button):
+                return None
+            _, current_state = self.check_current_state(button.id)
+            if current_state is None:
+                return None
+
+        if current_state != target_state:
+            self.logger.warning(f"Navigation ended in state {current_state.state_id[:8]}... "
+                                f"instead of {target_state.state_id[:8]}...")
+        return current_state if self.graph.is_frontier_state(current_state) else None
+
     def _click_button(self, button: Button) -> bool:
         
         try:
@@ -333,8 +458,8 @@ class StateExplorer:
 
             
             pre_click_screenshot = self.screenshot_manager.take_screenshot()
-            if pre_click_screenshot.success and pre_click_screenshot.file_path:
-                self.save_clicked_button_image(button, pre_click_screenshot.file_path)
+            if pre_click_screenshot.success and pre_click_screenshot.image is not None:
+                self.save_clicked_button_image(button, pre_click_screenshot.image)
 
             
             move_start = time.time()
@@ -343,6 +468,8 @@ class StateExplorer:
             )
             move_time = time.time() - move_start
             self.logger.info(f"⏱️ Mouse movement took {move_time:.2f}s")
+            if result.screenshots is not None:
+                self.metrics_manager.record_pointer_move_screenshots(result.screenshots)
 
             if not result.success:
                 self.logger.warning(f"Failed to move to button {button.id}: {result.error_message}")
@@ -363,7 +490,8 @@ class StateExplorer:
 
             
             self.esp32.click_mouse(1)
-            time.sleep(1)  
+            self.last_action_time = time.time()
+            self.last_action_delay = self.config.exploration.post_click_delay
 
             total_click_time = time.time() - click_start
             self.logger.info(f"⏱️ Total click action took {total_click_time:.2f}s")
@@ -408,8 +536,7 @@ class StateExplorer:
             self.logger.info(f"Marked button '{last_button.content}' as dead")
 
         
-        unexplored_states = self.graph.get_unexplored_states()
-        if not unexplored_states:
+        if not self.graph.has_unexplored_states():
             self.logger.info("🏁 NO UNEXPLORED BUTTONS REMAINING - Exploration complete!")
             self.logger.info("All reachable states have been explored. Ending exploration.")
             
@@ -418,14 +545,21 @@ class StateExplorer:
                            f"{stats['exploration_progress']:.1f}% explored")
             return
 
-        self.logger.info(f"📊 States with unexplored buttons remaining: {len(unexplored_states)}")
+        self.logger.info(f"📊 States with unexplored buttons remaining: {self.graph.get_frontier_size()}")
+
+        self._restart_app()
+        self.resume_pending = True
 
+    def _restart_app(self) -> bool:
         
+        restarted = False
         if self.app_manager:
             self.logger.info("Closing and reopening app...")
             if self.app_manager.restart_app():
                 self.logger.info("✅ App restarted successfully")
-                time.sleep(3)  
+                self.last_action_time = time.time()
+                self.last_action_delay = self.config.exploration.post_restart_delay
+                restarted = True
             else:
                 self.logger.error("❌ Failed to restart app")
         else:
@@ -436,6 +570,8 @@ class StateExplorer:
         self.last_trigger_button = None
         self.home_return_count = 0  
         self.mouse_controller.reset_no_movement_counter()  
+        self.mouse_controller.reset_tracking()
+        return restarted
 
     def _find_button_by_id(self, state: State, button_id: str) -> Optional[Button]:
         
@@ -457,11 +593,9 @@ class StateExplorer:
 
         
         try:
-            import json
-            graph_data = self.graph.export_to_json()
-            export_path = f"{self.metrics_manager.get_app_dir()}/state_graph.json"
-            with open(export_path, 'w') as f:
-                json.dump(graph_data, f, indent=2)
+            paths = self.config.paths
+            export_path = f"{self.metrics_manager.get_app_dir()}/{paths.get_state_graph_filenames()[0]}"
+            self.graph.export(export_path, paths.state_graph_format)
             self.logger.info(f"State graph exported to: {export_path}")
         except Exception as e:
             self.logger.error(f"Failed to export state graph: {e}")
@@ -0,0 +1,122 @@
+import numpy as np
+from typing import List
+
+from core_types import State, Button
+from text_matching import PatternMatcher, distance_limit, same_semantic_group
+
+
+class LayoutAwareComparator:
+
+
+    def __init__(self, tolerance: float = 0.7, text_weight: float = 0.6,
+                 layout_weight: float = 0.4, center_scale: float = 0.1,
+                 size_tolerance: float = 0.7, text_floor: float = 0.5):
+        self.tolerance = tolerance
+        self.text_weight = text_weight
+        self.layout_weight = layout_weight
+        self.center_scale = center_scale
+        self.size_tolerance = size_tolerance
+        self.text_floor = text_floor
+
+    @classmethod
+    def from_config(cls, config) -> 'LayoutAwareComparator':
+
+        matching = config.state_matching
+        return cls(
+            tolerance=matching.tolerance,
+            text_weight=matching.text_weight,
+            layout_weight=matching.layout_weight,
+            center_scale=matching.center_scale,
+            size_tolerance=matching.size_tolerance,
+            text_floor=matching.text_floor
+        )
+
+    @staticmethod
+    def text_matrix(buttons1: List[Button], buttons2: List[Button], text_floor: float = 0.0) -> np.ndarray:
+
+        lowered2 = [b.content.lower().strip() if b.content else None for b in buttons2]
+
+        matrix = np.zeros((len(buttons1), len(buttons2)), dtype=np.float64)
+        for i, button in enumerate(buttons1):
+            if not button.content:
+                continue
+
+            lowered1 = button.content.lower().strip()
+            c1 = button.canonical
+            matcher = PatternMatcher(c1)
+            row = matrix[i]
+            for j, other in enumerate(buttons2):
+                l2 = lowered2[j]
+                if l2 is None:
+                    continue
+                if lowered1 == l2:
+                    row[j] = 1.0
+                    continue
+
+                c2 = other.canonical
+                max_len = max(len(c1), len(c2))
+                semantic = same_semantic_group(lowered1, l2)
+                if max_len == 0:
+                    similarity = 1.0
+                else:
+                    limit = distance_limit(text_floor, max_len, semantic)
+                    if limit < 0:
+                        continue
+                    distance = matcher.distance(c2, limit)
+                    if distance > limit:
+                        continue
+                    similarity = 1.0 - distance / max_len
+
+                if semantic:
+                    similarity = 0.7 + 0.3 * similarity
+                row[j] = similarity
+
+        return matrix
+
+    def layout_matrix(self, buttons1: List[Button], buttons2: List[Button]) -> np.ndarray:
+
+        boxes1 = np.asarray([b.bbox for b in buttons1], dtype=np.float64).reshape(-1, 4)
+        boxes2 = np.asarray([b.bbox for b in buttons2], dtype=np.float64).reshape(-1, 4)
+
+        x1 = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+        y1 = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+        x2 = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+        y2 = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+        intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+        area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+        area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+        union = area1[:, None] + area2[None, :] - intersection
+        iou = np.where(union > 0, intersection / np.maximum(union, 1e-12), 0.0)
+
+        centers1 = (boxes1[:, :2] + boxes1[:, 2:]) / 2
+        centers2 = (boxes2[:, :2] + boxes2[:, 2:]) / 2
+        center_distance = np.linalg.norm(centers1[:, None, :] - centers2[None, :, :], axis=2)
+        proximity = np.clip(1.0 - center_distance / self.center_scale, 0.0, 1.0)
+
+        return 0.5 * (iou + proximity)
+
+    def similarity_matrix(self, state1: State, state2: State) -> np.ndarray:
+
+        text = self.text_matrix(state1.buttons, state2.buttons, self.text_floor)
+        layout = self.layout_matrix(state1.buttons, state2.buttons)
+        return self.text_weight * text + self.layout_weight * layout
+
+    def similarity(self, state1: State, state2: State) -> float:
+
+        if len(state1.buttons) == 0 and len(state2.buttons) == 0:
+            return 1.0
+
+        if len(state1.buttons) == 0 or len(state2.buttons) == 0:
+            return 0.0
+
+        count1, count2 = len(state1.buttons), len(state2.buttons)
+        if min(count1, count2) / max(count1, count2) < self.size_tolerance:
+            return 0.0
+
+        matrix = self.similarity_matrix(state1, state2)
+        return float((matrix.max(axis=1).mean() + matrix.max(axis=0).mean()) / 2)
+
+    def same_states(self, state1: State, state2: State) -> bool:
+
+        return self.similarity(state1, state2) >= self.tolerance
@@ -1,20 +1,38 @@
 
 
+import os
 import json
 import logging
-from typing import List, Dict, Optional, Tuple, Set
+from collections import deque
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Set
 
 from core_types import State, Button, StateGraphEdge
+from frame_fingerprint import FrameFingerprinter
+from state_comparator import LayoutAwareComparator
+from state_index import StateIndex
+from state_store import StateGraphStore
+from text_matching import PatternMatcher, canonical_text, distance_limit, levenshtein, same_semantic_group
 
 
 class StateGraph:
     
 
-    def __init__(self):
+    def __init__(self, use_index: bool = True, comparator: Optional[LayoutAwareComparator] = None):
         self.nodes: List[State] = []
         self.edges: Dict[Tuple[str, str], StateGraphEdge] = {}
         self.dead_buttons: Set[Tuple[str, str]] = set()
         self.home_state: Optional[State] = None  
+        self._states_by_id: Dict[str, State] = {}
+        self._index_by_id: Dict[str, int] = {}
+        self._out_edges: Dict[str, List[StateGraphEdge]] = {}
+        self._total_buttons = 0
+        self._total_unexplored = 0
+        self._live_unexplored: Dict[str, int] = {}
+        self._frontier: Dict[str, State] = {}
+        self._states_by_fingerprint: Dict[int, State] = {}
+        self.index: Optional[StateIndex] = StateIndex() if use_index else None
+        self.comparator = comparator
+        self.store: Optional[StateGraphStore] = None
         self.logger = logging.getLogger(__name__)
 
     def add_state(self, state: State) -> bool:
@@ -23,46 +41,247 @@ class StateGraph:
             return False
 
         self.nodes.append(state)
+        self._register_state(state)
+
+        if self.store is not None:
+            self.store.record_state(len(self.nodes) - 1, state)
         self.logger.debug(f"Added new state to graph: {len(self.nodes)} total states")
         return True
 
+    def _register_state(self, state: State) -> None:
+        
+        position = len(self.nodes) - 1
+        self._states_by_id.setdefault(state.state_id, state)
+        self._index_by_id.setdefault(state.state_id, position)
+        if self.index is not None:
+            self.index.add(position, state)
+        for fingerprint in state.fingerprints:
+            self._states_by_fingerprint.setdefault(fingerprint, state)
+
+        
+        self._total_buttons += len(state.buttons)
+        self._total_unexplored += len(state.unexplored_buttons)
+        live = sum(1 for button in state.unexplored_buttons
+                   if not self.is_dead_button(state.state_id, button.id))
+        self._live_unexplored[state.state_id] = live
+        if live > 0:
+            self._frontier[state.state_id] = state
+        state.on_button_explored = self._on_button_explored
+
     def add_edge(self, from_state: State, to_state: State, button: Button) -> None:
         
         edge_key = (from_state.state_id, to_state.state_id)
 
         if edge_key in self.edges:
             
-            self.edges[edge_key].record_traversal()
+            edge = self.edges[edge_key]
+            edge.record_traversal()
         else:
             
             edge = StateGraphEdge(from_state.state_id, to_state.state_id, button)
             edge.record_traversal()
             self.edges[edge_key] = edge
+            self._out_edges.setdefault(from_state.state_id, []).append(edge)
+
+        if self.store is not None:
+            self.store.record_edge(edge)
 
         self.logger.debug(f"Added/updated edge: {from_state.state_id[:8]}... -> {to_state.state_id[:8]}...")
 
+    def attach_store(self, store: StateGraphStore, write_snapshot: bool = True) -> None:
+        
+        if write_snapshot:
+            store.write_snapshot(self)
+        self.store = store
+        self.logger.info(f"State graph is persisted to: {store.path}")
+
+    def restore_from_store(self, store: StateGraphStore,
+                           screen_width: int = 3024, screen_height: int = 1964) -> int:
+        
+        data = store.load()
+        attached_store, self.store = self.store, None
+
+        try:
+            states_by_stored_id: Dict[str, State] = {}
+            for stored_id, buttons in data['states']:
+                state = State(buttons, screen_width, screen_height)
+                state.restore_explored(data['explored'].get(stored_id, ()))
+                states_by_stored_id[stored_id] = state
+
+            for state_id, button_id in data['dead_buttons']:
+                state = states_by_stored_id.get(state_id)
+                self.dead_buttons.add((state.state_id if state else state_id, button_id))
+
+            for state in states_by_stored_id.values():
+                self.nodes.append(state)
+                self._register_state(state)
+
+            for from_id, to_id, button_id, traversal_count, last_traversed in data['edges']:
+                from_state = states_by_stored_id.get(from_id)
+                to_state = states_by_stored_id.get(to_id)
+                if from_state is None or to_state is None:
+                    continue
+                button = next((b for b in from_state.buttons if b.id == button_id), None)
+                if button is None:
+                    continue
+                edge = StateGraphEdge(from_state.state_id, to_state.state_id, button)
+                edge.traversal_count = traversal_count
+                edge.last_traversed = last_traversed
+                self.edges[(from_state.state_id, to_state.state_id)] = edge
+                self._out_edges.setdefault(from_state.state_id, []).append(edge)
+
+            home_state = states_by_stored_id.get(data['home_state_id'] or '')
+            if home_state is not None:
+                self.home_state = home_state
+        finally:
+            self.store = attached_store
+
+        self.logger.info(f"Restored state graph from {store.path}: {len(self.nodes)} states, "
+                         f"{len(self.edges)} edges, {len(self.dead_buttons)} dead buttons, "
+                         f"{len(self._frontier)} states with unexplored buttons")
+        return len(self.nodes)
+
+    def warm_start_from_json(self, path: str,
+                             screen_width: int = 3024, screen_height: int = 1964) -> int:
+        
+        data = self.load_export(path)
+
+        prior_states: List[State] = []
+        state_id_map: Dict[str, str] = {}
+        explored_counts = 0
+        for state_data in data.get('states', []):
+            buttons = [
+                Button(id=b['id'], content=b.get('content', ''), bbox=b.get('bbox', [0, 0, 0, 0]),
+                       interactivity=True, source=b.get('source', ''))
+                for b in state_data.get('buttons', [])
+            ]
+            state = State(buttons, screen_width, screen_height)
+            explored_ids = [b['id'] for b in state_data.get('buttons', []) if b.get('explored')]
+            state.defer_buttons(explored_ids)
+            explored_counts += len(explored_ids)
+
+            state_id_map[state_data.get('state_id', state.state_id)] = state.state_id
+            state_id_map[state.readable_id] = state.state_id
+            prior_states.append(state)
+
+        for state_id, button_id in data.get('dead_buttons', []):
+            self.dead_buttons.add((state_id_map.get(state_id, state_id), button_id))
+
+        positions: List[Optional[State]] = []
+        for state in prior_states:
+            if state.state_id in self._states_by_id:
+                positions.append(self._states_by_id[state.state_id])
+                continue
+            self.nodes.append(state)
+            self._register_state(state)
+            positions.append(state)
+
+        for edge_data in data.get('edges', []):
+            from_idx = edge_data.get('from_state_index')
+            to_idx = edge_data.get('to_state_index')
+            if not (isinstance(from_idx, int) and isinstance(to_idx, int)
+                    and 0 <= from_idx < len(positions) and 0 <= to_idx < len(positions)):
+                self.logger.warning(f"Skipping warm start edge with invalid state indexes: {from_idx} -> {to_idx}")
+                continue
+            from_state, to_state = positions[from_idx], positions[to_idx]
+            button = next((b for b in from_state.buttons if b.id == edge_data.get('button_id')), None)
+            edge_key = (from_state.state_id, to_state.state_id)
+            if button is None or edge_key in self.edges:
+                continue
+            edge = StateGraphEdge(from_state.state_id, to_state.state_id, button)
+            edge.traversal_count = edge_data.get('traversal_count', 0)
+            edge.last_traversed = edge_data.get('last_traversed', 0.0)
+            self.edges[edge_key] = edge
+            self._out_edges.setdefault(from_state.state_id, []).append(edge)
+
+        self.logger.info(f"Warm start from {path}: {len(prior_states)} states, {len(self.edges)} edges, "
+                         f"{len(self.dead_buttons)} dead buttons, "
+                         f"{explored_counts} previously explored buttons deferred")
+        return len(prior_states)
+
+    def find_state_by_fingerprint(self, fingerprint: int, fingerprinter: FrameFingerprinter,
+                                  preferred: Optional[State] = None) -> Optional[State]:
+        
+        if preferred is not None and any(fingerprinter.matches(fingerprint, known)
+                                         for known in preferred.fingerprints):
+            return preferred
+
+        return self._states_by_fingerprint.get(fingerprint)
+
+    def add_fingerprint(self, state: State, fingerprint: int, max_fingerprints: int = 4) -> None:
+        
+        evicted = state.add_fingerprint(fingerprint, max_fingerprints)
+        if evicted is not None and self._states_by_fingerprint.get(evicted) is state:
+            del self._states_by_fingerprint[evicted]
+        if self._states_by_id.get(state.state_id) is state:
+            self._states_by_fingerprint[fingerprint] = state
+
     def has_state(self, state: State) -> bool:
         
-        return any(self.check_same_states(state, existing_state)
-                  for existing_state in self.nodes)
+        return self.find_similar_state(state) is not None
 
     def get_state_by_id(self, state_id: str) -> Optional[State]:
         
-        for state in self.nodes:
-            if state.state_id == state_id:
-                return state
-        return None
+        return self._states_by_id.get(state_id)
+
+    def get_state_index(self, state_id: str) -> Optional[int]:
+        
+        return self._index_by_id.get(state_id)
+
+    def get_outgoing_edges(self, state_id: str) -> List[StateGraphEdge]:
+        
+        return self._out_edges.get(state_id, [])
 
     def find_similar_state(self, state: State) -> Optional[State]:
         
-        for existing_state in self.nodes:
-            if self.check_same_states(state, existing_state):
+        checked: Set[int] = set()
+        if self.index is not None:
+            for position in self.index.candidates(state):
+                existing_state = self.nodes[position]
+                if self.same_states(state, existing_state):
+                    return existing_state
+                checked.add(position)
+
+        for position, existing_state in enumerate(self.nodes):
+            if position not in checked and self.same_states(state, existing_state):
                 return existing_state
         return None
 
+    def same_states(self, state1: State, state2: State) -> bool:
+        
+        if self.comparator is not None:
+            return self.comparator.same_states(state1, state2)
+        return self.check_same_states(state1, state2)
+
+    def _on_button_explored(self, state: State, button: Button) -> None:
+        
+        self._total_unexplored -= 1
+        if not self.is_dead_button(state.state_id, button.id):
+            self._decrement_live(state.state_id)
+
+        if self.store is not None:
+            self.store.record_button_explored(state.state_id, button.id)
+
+    def _decrement_live(self, state_id: str) -> None:
+        
+        live = self._live_unexplored.get(state_id, 0) - 1
+        self._live_unexplored[state_id] = max(0, live)
+        if live <= 0:
+            self._frontier.pop(state_id, None)
+
     def add_dead_button(self, state_id: str, button_id: str) -> None:
         
+        if (state_id, button_id) in self.dead_buttons:
+            return
+
         self.dead_buttons.add((state_id, button_id))
+        if self.store is not None:
+            self.store.record_dead_button(state_id, button_id)
+
+        state = self.get_state_by_id(state_id)
+        if (state is not None and button_id in state.button_ids
+                and button_id not in state.explored_ids):
+            self._decrement_live(state_id)
         self.logger.info(f"Marked button {button_id} in state {state_id[:8]}... as dead")
 
     def is_dead_button(self, state_id: str, button_id: str) -> bool:
@@ -72,13 +291,15 @@ class StateGraph:
     def set_home_state(self, state: State) -> None:
         
         self.home_state = state
+        if self.store is not None:
+            self.store.set_meta('home_state_id', state.state_id)
         self.logger.info(f"Set home state: {state.state_id[:16]}...")
 
     def is_home_state(self, state: State) -> bool:
         
         if self.home_state is None:
             return False
-        return self.check_same_states(state, self.home_state)
+        return self.same_states(state, self.home_state)
 
     def find_path_to_state(self, from_state: State, to_state: State) -> Optional[List[Button]]:
         
@@ -86,42 +307,81 @@ class StateGraph:
             return []
 
         
-        queue = [(from_state, [])]  
-        visited = {from_state.state_id}
+        queue = deque([from_state.state_id])  
+        parents: Dict[str, Tuple[Optional[str], Optional[Button]]] = {from_state.state_id: (None, None)}
 
         while queue:
-            current_state, path = queue.pop(0)
+            current_id = queue.popleft()
 
             
-            for edge_key, edge in self.edges.items():
-                from_id, to_id = edge_key
-                if from_id == current_state.state_id:
-                    next_state = self.get_state_by_id(to_id)
-                    if next_state and next_state.state_id not in visited:
-                        new_path = path + [edge.button]
-                        if next_state == to_state:
-                            return new_path
-                        visited.add(next_state.state_id)
-                        queue.append((next_state, new_path))
+            for edge in self.get_outgoing_edges(current_id):
+                next_id = edge.to_state_id
+                if next_id in parents or next_id not in self._states_by_id:
+                    continue
+
+                parents[next_id] = (current_id, edge.button)
+                if self._states_by_id[next_id] == to_state:
+                    return self._path_from_parents(parents, next_id)
+                queue.append(next_id)
+
+        return None
+
+    def find_path_to_frontier(self, from_state: State) -> Optional[Tuple[State, List[Button]]]:
+        
+        if self.is_frontier_state(from_state):
+            return from_state, []
+
+        queue = deque([from_state.state_id])
+        parents: Dict[str, Tuple[Optional[str], Optional[Button]]] = {from_state.state_id: (None, None)}
+
+        while queue:
+            current_id = queue.popleft()
+            for edge in self.get_outgoing_edges(current_id):
+                next_id = edge.to_state_id
+                if (next_id in parents or next_id not in self._states_by_id
+                        or self.is_dead_button(current_id, edge.button.id)):
+                    continue
+
+                parents[next_id] = (current_id, edge.button)
+                if next_id in self._frontier:
+                    return self._frontier[next_id], self._path_from_parents(parents, next_id)
+                queue.append(next_id)
 
         return None
 
+    @staticmethod
+    def _path_from_parents(parents: Dict[str, Tuple[Optional[str], Optional[Button]]],
+                           state_id: Optional[str]) -> List[Button]:
+        
+        path = []
+        while state_id is not None:
+            parent_id, button = parents[state_id]
+            if button is not None:
+                path.append(button)
+            state_id = parent_id
+        path.reverse()
+        return path
+
     def get_unexplored_states(self) -> List[State]:
         
-        unexplored_states = []
-        for state in self.nodes:
-            if state.has_unexplored_buttons():
-                
-                for button in state.unexplored_buttons:
-                    if not self.is_dead_button(state.state_id, button.id):
-                        unexplored_states.append(state)
-                        break
-        return unexplored_states
+        return list(self._frontier.values())
+
+    def is_frontier_state(self, state: State) -> bool:
+        
+        return state.state_id in self._frontier
+
+    def has_unexplored_states(self) -> bool:
+        
+        return bool(self._frontier)
+
+    def get_frontier_size(self) -> int:
+        
+        return len(self._frontier)
 
     def get_stats(self) -> Dict[str, int]:
         
-        total_buttons = sum(len(state.buttons) for state in self.nodes)
-        total_unexplored = sum(len(state.unexplored_buttons) for state in self.nodes)
+        total_buttons = self._total_buttons
+        total_unexplored = self._total_unexplored
         total_dead_buttons = len(self.dead_buttons)
 
         return {
@@ -135,25 +395,9 @@ class StateGraph:
         }
 
     @staticmethod
-    def levenshtein_distance(s1: str, s2: str) -> int:
+    def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
         
-        if len(s1) < len(s2):
-            return StateGraph.levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        previous_row = list(range(len(s2) + 1))
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
+        return levenshtein(s1, s2, max_distance)
 
     @staticmethod
     def text_similarity(s1: str, s2: str) -> float:
@@ -161,71 +405,101 @@ class StateGraph:
         if not s1 or not s2:
             return 0.0
 
+        return StateGraph._canonical_similarity(
+            s1.lower().strip(), canonical_text(s1),
+            s2.lower().strip(), canonical_text(s2)
+        )
+
+    @staticmethod
+    def button_similarity(button1: Button, button2: Button) -> float:
         
-        s1 = s1.lower().strip()
-        s2 = s2.lower().strip()
+        if not button1.content or not button2.content:
+            return 0.0
 
+        return StateGraph._canonical_similarity(
+            button1.content.lower().strip(), button1.canonical,
+            button2.content.lower().strip(), button2.canonical
+        )
+
+    @staticmethod
+    def _canonical_similarity(s1: str, c1: str, s2: str, c2: str) -> float:
         
         if s1 == s2:
             return 1.0
 
-        
-        distance = StateGraph.levenshtein_distance(s1, s2)
-        max_len = max(len(s1), len(s2))
-        levenshtein_sim = 1.0 - (distance / max_len) if max_len > 0 else 0.0
+        max_len = max(len(c1), len(c2))
+        if max_len == 0:
+            best_sim = 1.0
+        else:
+            distance = StateGraph.levenshtein_distance(c1, c2)
+            best_sim = 1.0 - (distance / max_len)
 
         
-        ocr_confusions = {
-            '0': 'o', '1': 'i', '2': 'z', '5': 's', '8': 'b', '9': 'g',
-            'l': 'i', 'i': 'l', 'o': '0', 'z': '2', 's': '5', 'b': '8', 'g': '9'
-        }
+        if same_semantic_group(s1, s2):
+            return 0.7 + 0.3 * best_sim
+        return best_sim
 
+    @staticmethod
+    def text_similarity_exceeds(s1: str, s2: str, threshold: float) -> bool:
         
-        best_sim = levenshtein_sim
-        for char, replacement in ocr_confusions.items():
-            s1_alt = s1.replace(char, replacement)
-            s2_alt = s2.replace(char, replacement)
-            if s1_alt != s1 or s2_alt != s2:
-                alt_distance = StateGraph.levenshtein_distance(s1_alt, s2_alt)
-                alt_sim = 1.0 - (alt_distance / max_len) if max_len > 0 else 0.0
-                best_sim = max(best_sim, alt_sim)
-
-        
-        common_patterns = [
-            ('rn', 'm'), ('cl', 'd'), ('vv', 'w'), ('nn', 'm'),
-            ('ii', 'n'), ('il', 'n'), ('li', 'n')
-        ]
-
-        for pattern, replacement in common_patterns:
-            s1_alt = s1.replace(pattern, replacement)
-            s2_alt = s2.replace(pattern, replacement)
-            if s1_alt != s1 or s2_alt != s2:
-                alt_distance = StateGraph.levenshtein_distance(s1_alt, s2_alt)
-                alt_sim = 1.0 - (alt_distance / max_len) if max_len > 0 else 0.0
-                best_sim = max(best_sim, alt_sim)
-
-        
-        semantic_groups = {
-            'back': ['back', 'return', 'previous', 'go back'],
-            'next': ['next', 'continue', 'proceed', 'forward'],
-            'cancel': ['cancel', 'close', 'exit', 'quit'],
-            'ok': ['ok', 'confirm', 'accept', 'yes'],
-            'settings': ['settings', 'options', 'preferences', 'configuration'],
-            'help': ['help', 'support', 'assistance', 'guide']
-        }
+        if not s1 or not s2:
+            return 0.0 > threshold
 
-        
-        semantic_sim = 0.0
-        for group, words in semantic_groups.items():
-            if s1 in words and s2 in words:
-                semantic_sim = 1.0
-                break
+        l1, l2 = s1.lower().strip(), s2.lower().strip()
+        if l1 == l2:
+            return 1.0 > threshold
+
+        c1, c2 = canonical_text(s1), canonical_text(s2)
+        max_len = max(len(c1), len(c2))
+        semantic = same_semantic_group(l1, l2)
+        if max_len > 0:
+            limit = distance_limit(threshold, max_len, semantic)
+            if limit < 0 or StateGraph.levenshtein_distance(c1, c2, limit) > limit:
+                return False
+
+        return StateGraph._canonical_similarity(l1, c1, l2, c2) > threshold
 
+    @staticmethod
+    def max_button_similarity(button: Button, candidates: List[Button]) -> float:
         
-        if semantic_sim > 0.8:
-            return 0.7 * semantic_sim + 0.3 * best_sim
-        else:
-            return best_sim
+        if not button.content:
+            return 0.0
+
+        s1 = button.content.lower().strip()
+        c1 = button.canonical
+        matcher = PatternMatcher(c1)
+        best = 0.0
+
+        for other in candidates:
+            if not other.content:
+                continue
+
+            s2 = other.content.lower().strip()
+            if s1 == s2:
+                return 1.0
+
+            c2 = other.canonical
+            max_len = max(len(c1), len(c2))
+            semantic = same_semantic_group(s1, s2)
+            if max_len == 0:
+                similarity = 1.0
+            else:
+                limit = distance_limit(best, max_len, semantic)
+                if limit < 0:
+                    continue
+                distance = matcher.distance(c2, limit)
+                if distance > limit:
+                    continue
+                similarity = 1.0 - (distance / max_len)
+
+            if semantic:
+                similarity = 0.7 + 0.3 * similarity
+            if similarity > best:
+                best = similarity
+                if best >= 1.0:
+                    break
+
+        return best
 
     @staticmethod
     def check_same_states(state1: State, state2: State, tolerance: float = 0.7) -> bool:
@@ -237,29 +511,28 @@ class StateGraph:
             return False
 
         
-        contents1 = [b.content for b in state1.buttons]
-        contents2 = [b.content for b in state2.buttons]
+        buttons1 = state1.buttons
+        buttons2 = state2.buttons
 
         
-        size_ratio = min(len(contents1), len(contents2)) / max(len(contents1), len(contents2))
+        size_ratio = min(len(buttons1), len(buttons2)) / max(len(buttons1), len(buttons2))
         if size_ratio < 0.7:  
             return False
 
         
-        similarity_scores = []
-        for c1 in contents1:
-            max_similarity = 0
-            for c2 in contents2:
-                similarity = StateGraph.text_similarity(c1, c2)
-                max_similarity = max(max_similarity, similarity)
-            similarity_scores.append(max_similarity)
+        required_total = tolerance * len(buttons1)
+        total_similarity = 0.0
+        for i, b1 in enumerate(buttons1):
+            total_similarity += StateGraph.max_button_similarity(b1, buttons2)
 
-        
-        avg_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else 0
+            
+            if total_similarity >= required_total:
+                return True
+            remaining = len(buttons1) - i - 1
+            if total_similarity + remaining < required_total - 1e-9:
+                return False
 
-        
-        result = avg_similarity >= tolerance
-        return result
+        return total_similarity / len(buttons1) >= tolerance
 
     def print_graph_structure(self) -> str:
         
@@ -275,7 +548,7 @@ class StateGraph:
             graph_str += f"  Total buttons: {len(state.buttons)}\n"
             graph_str += f"  Unexplored buttons: {len(state.unexplored_buttons)}\n"
             for j, button in enumerate(state.buttons[:5]):  
-                status = "unexplored" if button in state.unexplored_buttons else "explored"
+                status = "explored" if state.is_explored(button) else "unexplored"
                 graph_str += f"    Button {j}: '{button.content}' ({status})\n"
             if len(state.buttons) > 5:
                 graph_str += f"    ... and {len(state.buttons) - 5} more buttons\n"
@@ -285,12 +558,10 @@ class StateGraph:
         graph_str += "Transitions:\n"
         for edge_key, edge in self.edges.items():
             from_id, to_id = edge_key
-            from_state = self.get_state_by_id(from_id)
-            to_state = self.get_state_by_id(to_id)
+            from_idx = self.get_state_index(from_id)
+            to_idx = self.get_state_index(to_id)
 
-            if from_state and to_state:
-                from_idx = self.nodes.index(from_state)
-                to_idx = self.nodes.index(to_state)
+            if from_idx is not None and to_idx is not None:
                 graph_str += (f"State {from_idx} -> State {to_idx} "
                             f"via button: '{edge.button.content}' "
                             f"(traversed {edge.traversal_count} times)\n")
@@ -298,48 +569,128 @@ class StateGraph:
         graph_str += "=" * 30 + "\n"
         return graph_str
 
-    def export_to_json(self) -> Dict:
+    def _state_record(self, position: int, state: State) -> Dict:
         
-        states_data = []
-        for i, state in enumerate(self.nodes):
-            state_data = {
-                'index': i,
-                'state_id': state.state_id,
-                'total_buttons': len(state.buttons),
-                'unexplored_buttons': len(state.unexplored_buttons),
-                'buttons': [
-                    {
-                        'id': button.id,
-                        'content': button.content,
-                        'bbox': button.bbox,
-                        'source': button.source,
-                        'explored': button not in state.unexplored_buttons
-                    }
-                    for button in state.buttons
-                ]
-            }
-            states_data.append(state_data)
-
-        edges_data = []
-        for edge_key, edge in self.edges.items():
-            from_id, to_id = edge_key
-            from_state = self.get_state_by_id(from_id)
-            to_state = self.get_state_by_id(to_id)
+        explored_ids = state.explored_ids
+        return {
+            'index': position,
+            'state_id': state.state_id,
+            'total_buttons': len(state.buttons),
+            'unexplored_buttons': len(state.unexplored_buttons),
+            'buttons': [
+                {
+                    'id': button.id,
+                    'content': button.content,
+                    'bbox': list(button.bbox),
+                    'source': button.source,
+                    'explored': button.id in explored_ids
+                }
+                for button in state.buttons
+            ]
+        }
+
+    def _edge_records(self) -> Iterator[Dict]:
+        
+        index_by_id = self._index_by_id
+        for (from_id, to_id), edge in self.edges.items():
+            from_idx = index_by_id.get(from_id)
+            to_idx = index_by_id.get(to_id)
 
-            if from_state and to_state:
-                edge_data = {
-                    'from_state_index': self.nodes.index(from_state),
-                    'to_state_index': self.nodes.index(to_state),
+            if from_idx is not None and to_idx is not None:
+                yield {
+                    'from_state_index': from_idx,
+                    'to_state_index': to_idx,
                     'button_content': edge.button.content,
                     'button_id': edge.button.id,
                     'traversal_count': edge.traversal_count,
                     'last_traversed': edge.last_traversed
                 }
-                edges_data.append(edge_data)
 
+    def export_to_json(self) -> Dict:
+        
         return {
             'stats': self.get_stats(),
-            'states': states_data,
-            'edges': edges_data,
+            'states': [self._state_record(i, state) for i, state in enumerate(self.nodes)],
+            'edges': list(self._edge_records()),
             'dead_buttons': list(self.dead_buttons)
-        }
\ No newline at end of file
+        }
+
+    def write_json(self, path: str, indent: Optional[int] = None) -> None:
+        
+        pad = ' ' * indent if indent else ''
+        newline = '\n' if indent else ''
+        separators = (',', ': ') if indent else (',', ':')
+
+        def dump(value, depth: int) -> str:
+            text = json.dumps(value, indent=indent, separators=separators)
+            return text.replace('\n', '\n' + pad * depth) if indent else text
+
+        def write_list(f, items: Iterable) -> None:
+            f.write('[')
+            first = True
+            for item in items:
+                f.write(('' if first else ',') + newline + pad * 2 + dump(item, 2))
+                first = False
+            f.write(']' if first else newline + pad + ']')
+
+        sections = (
+            ('states', (self._state_record(i, state) for i, state in enumerate(self.nodes))),
+            ('edges', self._edge_records()),
+            ('dead_buttons', (list(dead) for dead in self.dead_buttons))
+        )
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write('{' + newline + pad + '"stats"' + separators[1] + dump(self.get_stats(), 1))
+            for key, items in sections:
+                f.write(',' + newline + pad + f'"{key}"' + separators[1])
+                write_list(f, items)
+            f.write(newline + '}')
+        os.replace(tmp_path, path)
+
+    def write_jsonl(self, path: str) -> None:
+        
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'type': 'stats', **self.get_stats()}) + '\n')
+            for i, state in enumerate(self.nodes):
+                f.write(json.dumps({'type': 'state', **self._state_record(i, state)}) + '\n')
+            for edge_data in self._edge_records():
+                f.write(json.dumps({'type': 'edge', **edge_data}) + '\n')
+            for state_id, button_id in self.dead_buttons:
+                f.write(json.dumps({'type': 'dead_button', 'state_id': state_id,
+                                    'button_id': button_id}) + '\n')
+        os.replace(tmp_path, path)
+
+    def export(self, path: str, export_format: str = "json") -> None:
+        
+        if export_format == "jsonl":
+            self.write_jsonl(path)
+        elif export_format == "compact":
+            self.write_json(path)
+        else:
+            self.write_json(path, indent=2)
+
+    @staticmethod
+    def load_export(path: str) -> Dict:
+        
+        if not path.endswith('.jsonl'):
+            with open(path, 'r') as f:
+                return json.load(f)
+
+        data: Dict = {'stats': {}, 'states': [], 'edges': [], 'dead_buttons': []}
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record_type = record.pop('type', None)
+                if record_type == 'state':
+                    data['states'].append(record)
+                elif record_type == 'edge':
+                    data['edges'].append(record)
+                elif record_type == 'dead_button':
+                    data['dead_buttons'].append([record['state_id'], record['button_id']])
+                elif record_type == 'stats':
+                    data['stats'] = record
+        return data
@@ -0,0 +1,122 @@
+import math
+import random
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+from core_types import State
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class StateIndex:
+
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, shingle_size: int = 3,
+                 size_tolerance: float = 0.7, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.size_tolerance = size_tolerance
+
+        rng = random.Random(seed)
+        self._perms: List[Tuple[int, int]] = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._band_buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self._count_buckets: Dict[int, List[int]] = {}
+        self._unhashed_by_count: Dict[int, List[int]] = {}
+        self._button_counts: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._button_counts)
+
+    def shingles(self, state: State) -> Set[str]:
+
+        result: Set[str] = set()
+        k = self.shingle_size
+        for button in state.buttons:
+            text = ' '.join(button.canonical.split())
+            if not text:
+                continue
+            if len(text) <= k:
+                result.add(text)
+                continue
+            for i in range(len(text) - k + 1):
+                result.add(text[i:i + k])
+        return result
+
+    def signature(self, state: State) -> Optional[Tuple[int, ...]]:
+
+        shingles = self.shingles(state)
+        if not shingles:
+            return None
+
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def _compatible_counts(self, count: int) -> List[int]:
+
+        if count == 0:
+            return [0] if 0 in self._count_buckets else []
+
+        low = max(1, int(math.floor(count * self.size_tolerance)))
+        high = int(math.ceil(count / self.size_tolerance))
+        return [c for c in range(low, high + 1)
+                if c in self._count_buckets
+                and min(c, count) / max(c, count) >= self.size_tolerance]
+
+    def add(self, position: int, state: State) -> None:
+
+        count = len(state.buttons)
+        self._button_counts[position] = count
+        self._count_buckets.setdefault(count, []).append(position)
+
+        signature = self.signature(state)
+        if signature is None:
+            self._unhashed_by_count.setdefault(count, []).append(position)
+            return
+
+        for band, key in zip(self._band_buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(position)
+
+    def candidates(self, state: State) -> List[int]:
+
+        count = len(state.buttons)
+        counts = self._compatible_counts(count)
+        if not counts:
+            return []
+
+        if count == 0:
+            return list(self._count_buckets[0])
+
+        signature = self.signature(state)
+        if signature is None:
+            result = [p for c in counts for p in self._count_buckets[c]]
+            return sorted(result)
+
+        allowed = set(counts)
+        result: Set[int] = set()
+        for band, key in zip(self._band_buckets, self._band_keys(signature)):
+            for position in band.get(key, ()):
+                if self._button_counts[position] in allowed:
+                    result.add(position)
+
+        for c in counts:
+            result.update(self._unhashed_by_count.get(c, ()))
+
+        return sorted(result)
@@ -0,0 +1,174 @@
+import json
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from core_types import Button, State, StateGraphEdge
+
+
+class StateGraphStore:
+
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS states ("
+        " position INTEGER PRIMARY KEY, state_id TEXT NOT NULL, buttons TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS explored ("
+        " state_id TEXT NOT NULL, button_id TEXT NOT NULL, PRIMARY KEY (state_id, button_id))",
+        "CREATE TABLE IF NOT EXISTS edges ("
+        " from_state_id TEXT NOT NULL, to_state_id TEXT NOT NULL, button_id TEXT NOT NULL,"
+        " traversal_count INTEGER NOT NULL, last_traversed REAL NOT NULL,"
+        " PRIMARY KEY (from_state_id, to_state_id))",
+        "CREATE TABLE IF NOT EXISTS dead_buttons ("
+        " state_id TEXT NOT NULL, button_id TEXT NOT NULL, PRIMARY KEY (state_id, button_id))",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+
+    @staticmethod
+    def _encode_buttons(buttons: List[Button]) -> str:
+
+        return json.dumps([
+            [b.id, b.content, list(b.bbox), b.interactivity, b.source]
+            for b in buttons
+        ])
+
+    @staticmethod
+    def _decode_buttons(data: str) -> List[Button]:
+
+        return [
+            Button(id=button_id, content=content, bbox=bbox,
+                   interactivity=interactivity, source=source)
+            for button_id, content, bbox, interactivity, source in json.loads(data)
+        ]
+
+    def _execute(self, sql: str, params: Tuple = ()) -> bool:
+
+        try:
+            with self._lock:
+                self.connection.execute(sql, params)
+            return True
+        except sqlite3.Error as e:
+            self.logger.warning(f"State store write failed: {e}")
+            return False
+
+    def record_state(self, position: int, state: State) -> bool:
+
+        return self._execute(
+            "INSERT OR REPLACE INTO states (position, state_id, buttons) VALUES (?, ?, ?)",
+            (position, state.state_id, self._encode_buttons(state.buttons))
+        )
+
+    def record_button_explored(self, state_id: str, button_id: str) -> bool:
+
+        return self._execute(
+            "INSERT OR IGNORE INTO explored (state_id, button_id) VALUES (?, ?)",
+            (state_id, button_id)
+        )
+
+    def record_edge(self, edge: StateGraphEdge) -> bool:
+
+        return self._execute(
+            "INSERT OR REPLACE INTO edges (from_state_id, to_state_id, button_id,"
+            " traversal_count, last_traversed) VALUES (?, ?, ?, ?, ?)",
+            (edge.from_state_id, edge.to_state_id, edge.button.id,
+             edge.traversal_count, edge.last_traversed)
+        )
+
+    def record_dead_button(self, state_id: str, button_id: str) -> bool:
+
+        return self._execute(
+            "INSERT OR IGNORE INTO dead_buttons (state_id, button_id) VALUES (?, ?)",
+            (state_id, button_id)
+        )
+
+    def set_meta(self, key: str, value: str) -> bool:
+
+        return self._execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def write_snapshot(self, graph) -> bool:
+
+        try:
+            with self._lock:
+                cursor = self.connection.cursor()
+                cursor.execute("BEGIN")
+                for table in ('states', 'explored', 'edges', 'dead_buttons', 'meta'):
+                    cursor.execute(f"DELETE FROM {table}")
+                for position, state in enumerate(graph.nodes):
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO states (position, state_id, buttons) VALUES (?, ?, ?)",
+                        (position, state.state_id, self._encode_buttons(state.buttons))
+                    )
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO explored (state_id, button_id) VALUES (?, ?)",
+                        [(state.state_id, button_id) for button_id in state.explored_ids]
+                    )
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO edges (from_state_id, to_state_id, button_id,"
+                    " traversal_count, last_traversed) VALUES (?, ?, ?, ?, ?)",
+                    [(e.from_state_id, e.to_state_id, e.button.id, e.traversal_count, e.last_traversed)
+                     for e in graph.edges.values()]
+                )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO dead_buttons (state_id, button_id) VALUES (?, ?)",
+                    list(graph.dead_buttons)
+                )
+                if graph.home_state is not None:
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        ('home_state_id', graph.home_state.state_id)
+                    )
+                cursor.execute("COMMIT")
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to write state graph snapshot: {e}")
+            try:
+                self.connection.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            return False
+
+    def load(self) -> Dict[str, Any]:
+
+        with self._lock:
+            states = [
+                (state_id, self._decode_buttons(buttons))
+                for state_id, buttons in self.connection.execute(
+                    "SELECT state_id, buttons FROM states ORDER BY position")
+            ]
+            explored: Dict[str, List[str]] = {}
+            for state_id, button_id in self.connection.execute(
+                    "SELECT state_id, button_id FROM explored"):
+                explored.setdefault(state_id, []).append(button_id)
+            edges = list(self.connection.execute(
+                "SELECT from_state_id, to_state_id, button_id, traversal_count, last_traversed FROM edges"))
+            dead_buttons = list(self.connection.execute(
+                "SELECT state_id, button_id FROM dead_buttons"))
+            meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+
+        return {
+            'states': states,
+            'explored': explored,
+            'edges': edges,
+            'dead_buttons': dead_buttons,
+            'home_state_id': meta.get('home_state_id')
+        }
+
+    def close(self):
+
+        try:
+            with self._lock:
+                self.connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error closing state store: {e}")
@@ -0,0 +1,121 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+
+OCR_CHAR_FOLDS = str.maketrans({
+    '0': 'o', '1': 'i', 'l': 'i', '2': 'z', '5': 's', '8': 'b', '9': 'g'
+})
+
+
+OCR_DIGRAPH_FOLDS = (
+    ('rn', 'm'), ('cl', 'd'), ('vv', 'w'), ('nn', 'm'),
+    ('ii', 'n'), ('il', 'n'), ('li', 'n')
+)
+
+
+SEMANTIC_GROUPS = {
+    'back': ['back', 'return', 'previous', 'go back'],
+    'next': ['next', 'continue', 'proceed', 'forward'],
+    'cancel': ['cancel', 'close', 'exit', 'quit'],
+    'ok': ['ok', 'confirm', 'accept', 'yes'],
+    'settings': ['settings', 'options', 'preferences', 'configuration'],
+    'help': ['help', 'support', 'assistance', 'guide']
+}
+
+
+SEMANTIC_LOOKUP: Dict[str, str] = {
+    word: group for group, words in SEMANTIC_GROUPS.items() for word in words
+}
+
+
+def canonical_text(text: str) -> str:
+
+    text = text.lower().strip()
+    for pattern, replacement in OCR_DIGRAPH_FOLDS:
+        text = text.replace(pattern, replacement)
+    return text.translate(OCR_CHAR_FOLDS)
+
+
+def same_semantic_group(s1: str, s2: str) -> bool:
+
+    group = SEMANTIC_LOOKUP.get(s1)
+    return group is not None and group == SEMANTIC_LOOKUP.get(s2)
+
+
+def distance_limit(threshold: float, max_len: int, semantic: bool) -> int:
+
+    if semantic:
+        if threshold < 0.7:
+            return max_len
+        threshold = (threshold - 0.7) / 0.3
+    return int(math.ceil((1.0 - threshold) * max_len + 1e-9)) - 1
+
+
+class PatternMatcher:
+
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.length = len(pattern)
+        self.peq: Dict[str, int] = {}
+        bit = 1
+        for char in pattern:
+            self.peq[char] = self.peq.get(char, 0) | bit
+            bit <<= 1
+        self.mask = (1 << self.length) - 1
+        self.high_bit = 1 << (self.length - 1) if self.length else 0
+
+    def distance(self, text: str, max_distance: Optional[int] = None) -> int:
+
+        m = self.length
+        n = len(text)
+        if max_distance is not None and abs(m - n) > max_distance:
+            return max_distance + 1
+        if m == 0:
+            return n
+        if n == 0:
+            return m
+
+        peq = self.peq
+        mask = self.mask
+        high_bit = self.high_bit
+        pv = mask
+        mv = 0
+        score = m
+
+        for j, char in enumerate(text):
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high_bit:
+                score += 1
+            elif mh & high_bit:
+                score -= 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+
+            if max_distance is not None and score - (n - j - 1) > max_distance:
+                return max_distance + 1
+
+        return score
+
+    def distances(self, texts: Sequence[str], max_distance: Optional[int] = None) -> List[int]:
+
+        return [self.distance(text, max_distance) for text in texts]
+
+
+def levenshtein(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    return PatternMatcher(s2).distance(s1, max_distance)
+
+
+def levenshtein_one_to_many(query: str, candidates: Sequence[str],
+                            max_distance: Optional[int] = None) -> List[int]:
+
+    return PatternMatcher(query).distances(candidates, max_distance)
@@ -0,0 +1,91 @@
+import queue
+
+import pytest
+
+import esp32_mouse
+from esp32_mouse import ESP32Mouse
+
+
+class FakeSerial:
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.replies = queue.Queue()
+        self.written = []
+
+    def write(self, data: bytes):
+        command = data.decode('utf-8').strip()
+        self.written.append(command)
+        for reply in self.responder(command):
+            self.replies.put(reply)
+
+    def readline(self) -> bytes:
+        try:
+            return (self.replies.get(timeout=0.02) + "\n").encode('utf-8')
+        except queue.Empty:
+            return b""
+
+    def reset_input_buffer(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def firmware(command: str):
+    if command == "PING":
+        return ["PONG"]
+    if command.startswith("MOVEPATH"):
+        for token in command.split()[1:]:
+            if len(token.split(":")) != 3:
+                return [f"MOVEPATH error: bad step '{token}'"]
+        return ["Moved path: reports=3, x=60, y=0"]
+    if command.startswith("MOVE"):
+        return [f"Moving mouse: x={command.split()[1]}, y={command.split()[2]}"]
+    return ["Unknown command."]
+
+
+@pytest.fixture
+def make_mouse(monkeypatch):
+    mice = []
+
+    def make(responder=firmware):
+        monkeypatch.setattr(esp32_mouse.serial, "Serial", lambda *args, **kwargs: FakeSerial(responder))
+        mouse = ESP32Mouse("/dev/fake", debug=False, heartbeat_interval=0)
+        mouse.command_timeout = 1
+        mouse.resets = []
+        mouse.reset_arduino_device = lambda: mouse.resets.append(True) or False
+        mice.append(mouse)
+        return mouse
+
+    yield make
+    for mouse in mice:
+        mouse.close()
+
+
+def test_move_path_succeeds_on_moved_reply(make_mouse):
+    mouse = make_mouse()
+    assert mouse.move_path([(20, 0, 3)])
+    assert mouse.connection.written == ["MOVEPATH 20:0:3"]
+
+
+def test_move_path_fails_on_error_reply(make_mouse):
+    mouse = make_mouse(lambda command: [f"MOVEPATH error: bad step '{command.split()[1]}'"])
+    assert not mouse.move_path([(20, 0, 3)])
+    assert mouse.resets == []
+    assert not mouse.pending
+
+
+def test_unexpected_heartbeat_reply_is_a_desync(make_mouse):
+    mouse = make_mouse(lambda command: ["Moving mouse: x=1, y=1"])
+
+    assert not mouse.ping()
+    assert mouse.resets == [True]
+    assert mouse.heartbeat_count == 0
+
+
+def test_late_pong_is_not_taken_as_the_next_reply(make_mouse):
+    mouse = make_mouse(lambda command: ["PONG", *firmware(command)] if command.startswith("MOVE") else [])
+
+    assert mouse.send_async("MOVE 5 7").result(timeout=1) == "Moving mouse: x=5, y=7"
+    assert mouse.move_path([(10, 0, 2)])
@@ -0,0 +1,92 @@
+import random
+import time
+
+import pytest
+
+from frame_grabber import JPEG_EOI, JPEG_SOI, FrameSource, JPEGScanner
+
+
+def fake_jpeg(index: int, size: int) -> bytes:
+    rng = random.Random(index)
+    body = bytes(rng.choice(b"\x00\x01\xfe\xd8\xd9\x7f") for _ in range(size))
+    return JPEG_SOI + body.replace(b"\xff", b"") + JPEG_EOI
+
+
+def stream_of(frames, junk: bytes = b"") -> bytes:
+    return b"".join(junk + frame for frame in frames)
+
+
+def test_every_split_point_of_two_frames():
+    frames = [fake_jpeg(0, 40), fake_jpeg(1, 25)]
+    data = stream_of(frames, junk=b"--frame\r\nContent-Type: image/jpeg\r\n\r\n")
+    for split in range(len(data) + 1):
+        scanner = JPEGScanner(capacity=4096)
+        found = scanner.feed(data[:split]) + scanner.feed(data[split:])
+        assert found == frames, split
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_chunking(seed):
+    rng = random.Random(seed)
+    frames = [fake_jpeg(i, rng.randint(1, 300)) for i in range(40)]
+    data = stream_of(frames, junk=b"\xff\x00junk")
+    scanner = JPEGScanner(capacity=4096)
+    found, offset = [], 0
+    while offset < len(data):
+        size = rng.choice((1, 2, 3, rng.randint(1, 700)))
+        found.extend(scanner.feed(data[offset:offset + size]))
+        offset += size
+    assert found == frames
+
+
+def test_writable_commit_with_compaction():
+    frames = [fake_jpeg(i, 150) for i in range(200)]
+    data = stream_of(frames)
+    scanner = JPEGScanner(capacity=1024, compact_threshold=256)
+    found, offset = [], 0
+    while offset < len(data):
+        target = scanner.writable(97)
+        chunk = data[offset:offset + len(target)]
+        target[:len(chunk)] = chunk
+        offset += len(chunk)
+        found.extend(scanner.commit(len(chunk)))
+    assert found == frames
+    assert scanner.filled < scanner.capacity
+
+
+def test_oversized_frame_is_dropped_and_scanner_recovers():
+    small = fake_jpeg(1, 50)
+    data = JPEG_SOI + b"\x00" * 5000 + JPEG_EOI + small
+    scanner = JPEGScanner(capacity=1024, compact_threshold=256)
+    found = []
+    for offset in range(0, len(data), 100):
+        found.extend(scanner.feed(data[offset:offset + 100]))
+    assert found == [small]
+
+
+class QueueSource(FrameSource):
+
+    def _connect(self) -> None:
+        pass
+
+    def _read_frames(self) -> None:
+        time.sleep(0.01)
+
+
+def test_frame_source_sequence_and_wait_for_frame_after():
+    source = QueueSource("test")
+    source._running.set()
+    source._publish(b"a", timestamp=1.0)
+    source._publish(b"b", timestamp=2.0)
+    assert [frame.seq for frame in source.frames] == [1, 2]
+    assert source.wait_for_frame_after(1.5, timeout=0.1).jpeg == b"b"
+    assert source.wait_for_frame_after(2.0, timeout=0.05) is None
+
+
+def test_frame_source_requires_reader_methods():
+    class Incomplete(FrameSource):
+        def _connect(self) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete")
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+
+from config import Config
+from motion_model import MotionModel
+
+SCREEN = (1920, 1080)
+
+
+def test_learns_per_region_gain():
+    model = MotionModel(learning_rate=0.5)
+    for _ in range(6):
+        assert model.update((100, 100), (200, 0), (240, 0), SCREEN)
+
+    assert model.gain((100, 100), (240, 0), SCREEN)[0] > 1.15
+    far_region = model.gain((1700, 900), (240, 0), SCREEN)[0]
+    assert 1.0 < far_region < model.gain((100, 100), (240, 0), SCREEN)[0]
+    assert model.gain((100, 100), (240, 0), SCREEN)[1] == 1.0
+    assert model.samples == 6
+
+
+def test_rejects_outliers_unless_trusted():
+    model = MotionModel()
+    assert not model.update((100, 100), (200, 0), (1000, 0), SCREEN)
+    assert not model.update((100, 100), (200, 0), (330, 0), SCREEN)
+    assert model.rejected == 2 and model.samples == 0
+
+    assert model.update((100, 100), (200, 0), (330, 0), SCREEN, trusted=True)
+    assert not model.update((100, 100), (200, 0), (1000, 0), SCREEN, trusted=True)
+    assert not model.update((100, 100), (20, 0), (40, 0), SCREEN)
+    assert model.samples == 1
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "models" / "mouse.json")
+    model = MotionModel(path=path, save_every=0)
+    for _ in range(3):
+        model.update((100, 100), (300, 150), (360, 165), SCREEN)
+    assert model.save()
+
+    loaded = MotionModel(path=path)
+    np.testing.assert_allclose(loaded.gains, model.gains)
+    np.testing.assert_array_equal(loaded.counts, model.counts)
+    np.testing.assert_allclose(loaded.global_gain, model.global_gain)
+    assert loaded.samples == 3
+    assert loaded.gain((100, 100), (360, 165), SCREEN) == model.gain((100, 100), (360, 165), SCREEN)
+
+
+def test_save_every_persists_automatically(tmp_path):
+    path = tmp_path / "mouse.json"
+    model = MotionModel(path=str(path), save_every=2)
+    model.update((100, 100), (200, 0), (220, 0), SCREEN)
+    assert not path.exists()
+    model.update((100, 100), (200, 0), (220, 0), SCREEN)
+    assert json.loads(path.read_text())['samples'] == 2
+
+
+def test_layout_change_keeps_only_global_gain(tmp_path):
+    path = str(tmp_path / "mouse.json")
+    model = MotionModel(path=path, save_every=0)
+    for _ in range(3):
+        model.update((100, 100), (200, 0), (240, 0), SCREEN)
+    model.save()
+
+    for layout in ({'grid': (4, 4)}, {'magnitude_edges': (100.0, 400.0)}, {'magnitude_edges': (80.0, 250.0, 600.0)}):
+        reloaded = MotionModel(path=path, **layout)
+        np.testing.assert_allclose(reloaded.global_gain, model.global_gain)
+        assert reloaded.samples == 3
+        assert not reloaded.counts.any()
+        assert (reloaded.gains == 1.0).all()
+
+
+def test_missing_or_corrupt_file_starts_from_unit_gain(tmp_path):
+    assert not MotionModel(path=str(tmp_path / "missing.json")).samples
+
+    path = tmp_path / "corrupt.json"
+    for content in ("{not json", json.dumps({'samples': 4})):
+        path.write_text(content)
+        model = MotionModel(path=str(path))
+        assert not model.load()
+        assert model.gain((100, 100), (200, 0), SCREEN) == (1.0, 1.0)
+
+
+def test_from_config_uses_sanitised_device_path(tmp_path):
+    config = Config()
+    config.paths.exploration_results_dir = str(tmp_path)
+    config.app.esp32_port = "/dev/ttyUSB0"
+    config.app.headset_name = "Quest 3 (lab)"
+
+    model = MotionModel.from_config(config)
+    assert model.path == str(tmp_path / "motion_models" / "ttyUSB0-Quest_3_lab_.json")
+
+    config.motion_model.persist = False
+    assert MotionModel.from_config(config).path is None
@@ -0,0 +1,123 @@
+from unittest import mock
+
+import numpy as np
+
+from config import Config
+from core_types import ScreenshotResult
+from motion_model import MotionModel
+from mouse_controller import MouseController
+
+
+class FakeDevice:
+
+    def __init__(self, config: Config, gain, position):
+        self.config = config
+        self.gain = gain
+        self.position = list(position)
+
+    def _apply(self, dx: int, dy: int, count: int):
+        for axis, value in ((0, dx), (1, dy)):
+            magnitude = abs(value)
+            if magnitude == 20:
+                distance = self.config.mouse.step20
+            elif magnitude == 10:
+                distance = self.config.mouse.step10
+            else:
+                distance = magnitude
+            self.position[axis] += np.sign(value) * distance * count * self.gain[axis]
+
+    def move_path(self, steps) -> bool:
+        for dx, dy, count in steps:
+            self._apply(dx, dy, count)
+        return True
+
+    def move_mouse(self, dx: int, dy: int) -> bool:
+        self._apply(dx, dy, 1)
+        return True
+
+
+class FakeScreen:
+
+    def __init__(self, device: FakeDevice):
+        self.device = device
+
+    def get_screen_dimensions(self):
+        return self.device.config.screen.width, self.device.config.screen.height
+
+    def wait_for_frame_after(self, after, timeout=None):
+        return ScreenshotResult(success=True, file_path=None, timestamp="", image=self.device)
+
+
+class SimulatedMouseController(MouseController):
+
+    def _find_pointer_full_frame(self, screenshot):
+        return int(round(screenshot.position[0])), int(round(screenshot.position[1]))
+
+
+def make_controller(gain=(1.2, 0.9), position=(1500, 1000), tracked_position=None):
+    config = Config()
+    config.mouse.roi_tracking = False
+    device = FakeDevice(config, gain, position)
+    model = MotionModel()
+    model.global_gain = np.array(gain)
+    controller = SimulatedMouseController(config, device, motion_model=model)
+    controller.tracked_position = tracked_position or position
+    return controller, device
+
+
+def test_predicted_position_follows_pointer_after_move():
+    controller, device = make_controller()
+
+    for command in ((500, -300), (-800, 450), (37, 12)):
+        assert controller.move_pixel(*command)
+        predicted = controller._predicted_position()
+        assert abs(predicted[0] - device.position[0]) <= 1
+        assert abs(predicted[1] - device.position[1]) <= 1
+
+
+def test_tracking_roi_is_centred_on_predicted_position():
+    controller, device = make_controller()
+    controller.config.mouse.roi_tracking = True
+    controller.move_pixel(1200, 600)
+
+    left, top, right, bottom = controller._tracking_roi()
+    assert left < device.position[0] < right and top < device.position[1] < bottom
+    assert abs((left + right) / 2 - device.position[0]) <= 1
+    assert abs((top + bottom) / 2 - device.position[1]) <= 1
+
+
+def run_predictive_move(controller, device):
+    controller.config.mouse.motion_mode = "predictive"
+    controller.motion_model.update = mock.Mock(wraps=controller.motion_model.update)
+    result = controller.move_to_target(2000, 1400, FakeScreen(device), tolerance=15)
+    return result, [call.args[0] for call in controller.motion_model.update.call_args_list]
+
+
+def test_predictive_move_detects_pointer_after_unverified_motion():
+    controller, device = make_controller(tracked_position=(400, 300))
+    controller.moves_since_detection = 1
+
+    result, starts = run_predictive_move(controller, device)
+
+    assert result.success
+    assert starts and abs(starts[0][0] - 1500) <= 3 and starts[0][1] == 1000
+
+
+def test_predictive_move_never_learns_from_unverified_start():
+    controller, device = make_controller(tracked_position=(400, 300))
+    controller.moves_since_detection = 0
+
+    _, starts = run_predictive_move(controller, device)
+
+    assert all(x > 1000 for x, _ in starts)
+
+
+def test_reset_tracking_forgets_prediction():
+    controller, _ = make_controller()
+    controller.reset_tracking()
+    assert controller._predicted_position() is None
+    assert controller._tracking_roi() is None
+
+
+def test_closed_loop_is_the_default_motion_mode():
+    assert Config().mouse.motion_mode == "closed_loop"
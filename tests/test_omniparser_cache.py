@@ -0,0 +1,25 @@
+from omniparser_cache import OmniParserCache
+
+
+ELEMENTS = [{'content': 'Wi-Fi', 'bbox': [0.1, 0.1, 0.3, 0.2], 'interactivity': True}]
+
+
+def test_cache_requires_exact_fingerprint_by_default(tmp_path):
+    cache = OmniParserCache(str(tmp_path))
+    params = OmniParserCache.params_key(0.05, 0.1, 640, False, 16)
+    assert cache.put(params, 0xF0F0, ELEMENTS)
+
+    assert cache.get(params, 0xF0F0) == (ELEMENTS, None)
+    assert cache.get(params, 0xF0F1) is None
+    assert cache.get(OmniParserCache.params_key(0.05, 0.1, 1280, False, 16), 0xF0F0) is None
+    cache.close()
+
+
+def test_cache_near_match_is_opt_in(tmp_path):
+    cache = OmniParserCache(str(tmp_path), max_distance=2)
+    params = OmniParserCache.params_key(0.05, 0.1, 640, False, 16)
+    cache.put(params, 0xF0F0, ELEMENTS)
+
+    assert cache.get(params, 0xF0F3) == (ELEMENTS, None)
+    assert cache.get(params, 0xF0F7) is None
+    cache.close()
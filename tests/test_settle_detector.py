@@ -0,0 +1,76 @@
+import numpy as np
+
+from core_types import ScreenshotResult
+from settle_detector import SettleDetector
+
+
+def make_frame(value: int, capture_time: float, seq: int) -> ScreenshotResult:
+    image = np.full((120, 160, 3), value, dtype=np.uint8)
+    image[40:80, 60:100] = 255 - value
+    return ScreenshotResult(success=True, file_path=None, timestamp=str(capture_time),
+                            image=image, seq=seq, capture_time=capture_time)
+
+
+class FakeScreenshotManager:
+
+    def __init__(self, values, start: float = 100.0, interval: float = 0.033):
+        self.frames = [make_frame(value, start + i * interval, i) for i, value in enumerate(values)]
+        self.requests = []
+
+    def wait_for_frame_after(self, after: float, timeout: float) -> ScreenshotResult:
+        self.requests.append(after)
+        for frame in self.frames:
+            if frame.capture_time > after:
+                return frame
+        return ScreenshotResult(success=False, file_path=None, timestamp="", error_message="timeout")
+
+
+def test_settles_after_stable_frames():
+    manager = FakeScreenshotManager([0, 40, 80, 120, 121, 121, 122, 122, 200])
+    detector = SettleDetector(stable_frames=3, min_wait=0.05)
+
+    result, settled = detector.wait_until_settled(manager, since=100.0)
+
+    assert settled
+    assert result.seq == 6
+    assert manager.requests[0] == 100.05
+    assert manager.requests[1:] == [frame.capture_time for frame in manager.frames[2:6]]
+
+
+def test_motion_resets_the_stable_count():
+    manager = FakeScreenshotManager([10, 10, 10, 90, 90, 90, 90])
+    detector = SettleDetector(stable_frames=3, min_wait=0.0)
+
+    result, settled = detector.wait_until_settled(manager, since=99.0)
+
+    assert settled and result.seq == 6
+
+
+def test_never_settles_returns_last_frame_at_deadline():
+    values = [(i * 37) % 256 for i in range(10000)]
+    manager = FakeScreenshotManager(values)
+    detector = SettleDetector(timeout=0.05, min_wait=0.0)
+
+    result, settled = detector.wait_until_settled(manager, since=99.0)
+
+    assert not settled
+    assert result.success and result is manager.frames[len(manager.requests) - 1]
+
+
+def test_failed_capture_returns_last_good_frame():
+    manager = FakeScreenshotManager([0, 60, 120])
+    result, settled = SettleDetector(min_wait=0.0).wait_until_settled(manager, since=99.0)
+    assert not settled and result.seq == 2
+
+    empty = FakeScreenshotManager([])
+    result, settled = SettleDetector().wait_until_settled(empty, since=99.0)
+    assert not settled and not result.success
+
+
+def test_difference_of_mismatched_thumbnails_is_infinite():
+    detector = SettleDetector(width=32)
+    wide = detector.thumbnail(np.zeros((100, 400, 3), dtype=np.uint8))
+    tall = detector.thumbnail(np.zeros((400, 100, 3), dtype=np.uint8))
+    assert wide.shape == (8, 32)
+    assert detector.difference(wide, tall) == float('inf')
+    assert detector.difference(wide, wide) == 0.0
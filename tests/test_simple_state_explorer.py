@@ -0,0 +1,173 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mss")
+
+from config import Config
+from core_types import Button, PointerMoveResult, ScreenshotResult, State
+from frame_fingerprint import FrameFingerprinter
+from simple_state_explorer import StateExplorer
+from state_graph import StateGraph
+from state_store import StateGraphStore
+
+
+SCREEN_SIZE = (3024, 1964)
+
+SCREENS = {
+    "launch": [("Open settings", [0.40, 0.40, 0.60, 0.50]), ("Refresh", [0.05, 0.05, 0.15, 0.10])],
+    "settings": [("Wi-Fi", [0.40, 0.20, 0.60, 0.30]), ("Bluetooth", [0.40, 0.60, 0.60, 0.70])],
+}
+
+TRANSITIONS = {
+    ("launch", "Open settings"): "settings",
+}
+
+
+class SimulatedApp:
+
+    def __init__(self, screen: str = "launch"):
+        self.screen = screen
+        self.target = None
+        self.clicked = []
+        self.restarts = 0
+
+    def elements(self):
+        return [{'content': content, 'bbox': bbox, 'interactivity': True, 'source': 'box_ocr_content_ocr'}
+                for content, bbox in SCREENS[self.screen]]
+
+    def click(self):
+        x = self.target[0] / SCREEN_SIZE[0]
+        y = self.target[1] / SCREEN_SIZE[1]
+        for content, (x1, y1, x2, y2) in SCREENS[self.screen]:
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                self.clicked.append((self.screen, content))
+                self.screen = TRANSITIONS.get((self.screen, content), self.screen)
+                return True
+        return False
+
+    def restart(self):
+        self.restarts += 1
+        self.screen = "launch"
+        return True
+
+
+def make_state(screen: str) -> State:
+    buttons = [Button(id=str(i), content=content, bbox=bbox, interactivity=True, source='box_ocr_content_ocr')
+               for i, (content, bbox) in enumerate(SCREENS[screen])]
+    return State(buttons, *SCREEN_SIZE)
+
+
+def make_explorer(graph: StateGraph, app: SimulatedApp, app_dir: str) -> StateExplorer:
+    config = Config()
+    config.settle.enabled = False
+    config.fingerprint.enabled = False
+
+    def move_to_target(x, y, screenshot_manager, tolerance=None):
+        app.target = (x, y)
+        return PointerMoveResult(success=True, final_x=x, final_y=y, accuracy=100.0, screenshots=1)
+
+    mouse_controller = mock.Mock()
+    mouse_controller.move_to_target.side_effect = move_to_target
+    mouse_controller.get_consecutive_no_movement.return_value = 0
+
+    screenshot_manager = mock.Mock()
+    screenshot_manager.get_screen_dimensions.return_value = SCREEN_SIZE
+    screenshot_manager.take_screenshot.return_value = ScreenshotResult(success=False, file_path=None, timestamp="")
+    screenshot_manager.wait_for_frame_after.return_value = ScreenshotResult(success=False, file_path=None, timestamp="")
+
+    omniparser_client = mock.Mock()
+    omniparser_client.get_ui_elements.side_effect = lambda **kwargs: app.elements()
+    omniparser_client.get_last_labeled_image.return_value = None
+
+    metrics_manager = mock.Mock()
+    metrics_manager.is_timeout_reached.return_value = False
+    metrics_manager.get_app_dir.return_value = app_dir
+    metrics_manager.get_remaining_time.return_value = 600.0
+
+    esp32 = mock.Mock()
+    esp32.click_mouse.side_effect = lambda button=1: app.click()
+
+    app_manager = mock.Mock()
+    app_manager.restart_app.side_effect = app.restart
+
+    return StateExplorer(config, graph, mouse_controller, screenshot_manager, omniparser_client,
+                         metrics_manager, esp32, app_manager)
+
+
+def prior_run_export(tmp_path) -> str:
+    graph = StateGraph()
+    launch, settings = make_state("launch"), make_state("settings")
+    graph.add_state(launch)
+    graph.add_state(settings)
+    graph.add_edge(launch, settings, launch.buttons[0])
+    path = str(tmp_path / "state_graph.json")
+    graph.export(path)
+    return path
+
+
+def test_warm_started_state_buttons_are_explored(tmp_path):
+    graph = StateGraph()
+    assert graph.warm_start_from_json(prior_run_export(tmp_path), *SCREEN_SIZE) == 2
+
+    app = SimulatedApp()
+    explorer = make_explorer(graph, app, str(tmp_path))
+    explorer.explore_all_states()
+
+    assert ("settings", "Wi-Fi") in app.clicked
+    assert ("settings", "Bluetooth") in app.clicked
+    assert not graph.has_unexplored_states()
+
+
+def test_resumed_run_returns_to_half_explored_state(tmp_path):
+    store = StateGraphStore(str(tmp_path / "state_graph.db"))
+    crashed = StateGraph()
+    crashed.attach_store(store)
+    launch, settings = make_state("launch"), make_state("settings")
+    crashed.add_state(launch)
+    crashed.add_state(settings)
+    while launch.has_unexplored_buttons():
+        launch.get_next_unexplored_button()
+    crashed.add_edge(launch, settings, launch.buttons[0])
+    explored = settings.get_next_unexplored_button()
+    store.close()
+
+    store = StateGraphStore(str(tmp_path / "state_graph.db"))
+    graph = StateGraph()
+    graph.restore_from_store(store, *SCREEN_SIZE)
+    store.close()
+    assert [state.state_id for state in graph.get_unexplored_states()] == [settings.state_id]
+
+    app = SimulatedApp()
+    explorer = make_explorer(graph, app, str(tmp_path))
+    explorer.explore_all_states()
+
+    remaining = next(b for b in settings.buttons if b.id != explored.id)
+    assert app.clicked == [("launch", "Open settings"), ("settings", remaining.content)]
+    assert not graph.has_unexplored_states()
+
+
+def test_click_requires_exact_fingerprint_match(tmp_path):
+    graph = StateGraph()
+    launch = make_state("launch")
+    graph.add_state(launch)
+    graph.add_fingerprint(launch, 0b1111)
+
+    app = SimulatedApp()
+    explorer = make_explorer(graph, app, str(tmp_path))
+    explorer.fingerprinter = FrameFingerprinter(max_distance=6)
+    frames = iter([0b1110, 0b1110])
+    explorer.fingerprinter.fingerprint = lambda image: next(frames)
+    explorer.screenshot_manager.wait_for_frame_after.return_value = ScreenshotResult(
+        success=True, file_path=None, timestamp="", image=np.zeros((4, 4, 3), dtype=np.uint8)
+    )
+    explorer.current_state = launch
+
+    is_known, state = explorer.check_current_state()
+    assert is_known and state is launch
+    assert not explorer.omniparser_client.get_ui_elements.called
+
+    is_known, state = explorer.check_current_state(launch.buttons[1].id)
+    assert is_known and state is launch
+    assert explorer.omniparser_client.get_ui_elements.called
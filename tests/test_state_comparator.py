@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from core_types import Button
+from state_comparator import LayoutAwareComparator
+from state_graph import StateGraph
+
+LABELS = ["Settings", "Sett1ngs", "options", "Back", "return", "Cancel", "close", "OK", "yes",
+          "Wi-Fi", "Wi Fi", "About", "Apps", "Library", "rn", "m", "Help", "guide", "", " "]
+
+
+def make_buttons(rng: random.Random, count: int):
+    return [Button(id=str(i), content=rng.choice(LABELS), bbox=[0.0, 0.0, 0.1, 0.1],
+                   interactivity=True, source='box_ocr_content_ocr')
+            for i in range(count)]
+
+
+@pytest.mark.parametrize("text_floor", [0.0, 0.3, 0.5, 0.8])
+def test_text_matrix_matches_button_similarity_above_floor(text_floor):
+    rng = random.Random(5)
+    for _ in range(300):
+        buttons1, buttons2 = make_buttons(rng, rng.randint(0, 6)), make_buttons(rng, rng.randint(0, 6))
+        matrix = LayoutAwareComparator.text_matrix(buttons1, buttons2, text_floor)
+        for i, b1 in enumerate(buttons1):
+            for j, b2 in enumerate(buttons2):
+                expected = StateGraph.button_similarity(b1, b2)
+                if expected <= text_floor + 1e-9:
+                    assert matrix[i, j] == 0.0 or matrix[i, j] == pytest.approx(expected)
+                else:
+                    assert matrix[i, j] == pytest.approx(expected)
@@ -0,0 +1,80 @@
+import json
+
+from core_types import Button, State
+from frame_fingerprint import FrameFingerprinter
+from state_graph import StateGraph
+
+
+def make_state(*contents) -> State:
+    buttons = [Button(id=str(i), content=content, bbox=[0.1 * i, 0.1, 0.1 * i + 0.08, 0.15],
+                      interactivity=True, source='box_ocr_content_ocr')
+               for i, content in enumerate(contents)]
+    return State(buttons)
+
+
+def test_warm_start_skips_edges_without_indexes(tmp_path):
+    graph = StateGraph()
+    home, settings = make_state("Home", "Settings"), make_state("Wi-Fi", "Bluetooth", "Back")
+    graph.add_state(home)
+    graph.add_state(settings)
+    graph.add_edge(home, settings, home.buttons[1])
+    data = graph.export_to_json()
+    data['edges'].insert(0, {'from_state_index': None, 'to_state_index': 1, 'button_id': '1'})
+    data['edges'].append({'to_state_index': 0, 'button_id': '2'})
+    path = tmp_path / "state_graph.json"
+    path.write_text(json.dumps(data))
+
+    warm = StateGraph()
+    assert warm.warm_start_from_json(str(path)) == 2
+    assert len(warm.nodes) == 2
+    assert list(warm.edges) == [(home.state_id, settings.state_id)]
+
+
+def test_fingerprint_near_match_only_for_preferred_state():
+    graph = StateGraph()
+    fingerprinter = FrameFingerprinter(max_distance=6)
+    settings, wifi = make_state("Wi-Fi", "Bluetooth"), make_state("Network", "Join")
+    graph.add_state(settings)
+    graph.add_state(wifi)
+    graph.add_fingerprint(settings, 0b1111 << 200)
+    graph.add_fingerprint(wifi, 0b1010 << 100)
+
+    assert graph.find_state_by_fingerprint(0b1010 << 100, fingerprinter) is wifi
+    assert graph.find_state_by_fingerprint(0b1011 << 100, fingerprinter) is None
+    assert graph.find_state_by_fingerprint(0b1011 << 100, fingerprinter, preferred=wifi) is wifi
+    assert graph.find_state_by_fingerprint(0b1011 << 100, fingerprinter, preferred=settings) is None
+
+
+def test_fingerprint_lookup_follows_eviction():
+    graph = StateGraph()
+    fingerprinter = FrameFingerprinter(max_distance=0)
+    settings, outside = make_state("Wi-Fi", "Bluetooth"), make_state("Network", "Join")
+    graph.add_state(settings)
+    for fingerprint in (1, 2, 3):
+        graph.add_fingerprint(settings, fingerprint, max_fingerprints=2)
+    graph.add_fingerprint(outside, 4)
+
+    assert settings.fingerprints == [2, 3]
+    assert graph.find_state_by_fingerprint(1, fingerprinter) is None
+    assert graph.find_state_by_fingerprint(3, fingerprinter) is settings
+    assert graph.find_state_by_fingerprint(4, fingerprinter) is None
+
+    outside.add_fingerprint(5)
+    graph.add_state(outside)
+    assert graph.find_state_by_fingerprint(5, fingerprinter) is outside
+
+
+def test_write_json_matches_json_dump(tmp_path):
+    graph = StateGraph()
+    home, settings = make_state("Home", "Settings"), make_state("Wi-Fi", "Bluetooth", "Back")
+    graph.add_state(home)
+    graph.add_state(settings)
+    graph.add_edge(home, settings, home.buttons[1])
+    graph.add_dead_button(settings.state_id, "2")
+    home.get_next_unexplored_button()
+
+    for indent in (2, None):
+        path = tmp_path / f"graph_{indent}.json"
+        graph.write_json(str(path), indent=indent)
+        separators = None if indent else (',', ':')
+        assert path.read_text() == json.dumps(graph.export_to_json(), indent=indent, separators=separators)
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from core_types import Button, State
+from state_graph import StateGraph
+from state_index import StateIndex
+
+WORDS = ["Settings", "Wi-Fi", "Bluetooth", "Display", "Sound", "Battery", "Storage", "About",
+         "Privacy", "Apps", "Library", "Store", "Camera", "Guardian", "Controllers", "Accounts"]
+
+
+def make_state(*contents) -> State:
+    buttons = [Button(id=str(i), content=content, bbox=[0.05 * i, 0.1, 0.05 * i + 0.04, 0.15],
+                      interactivity=True, source='box_ocr_content_ocr')
+               for i, content in enumerate(contents)]
+    return State(buttons)
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        StateIndex(num_perm=64, bands=10)
+
+
+def test_near_duplicate_is_candidate():
+    index = StateIndex()
+    index.add(0, make_state(*WORDS[:8]))
+    index.add(1, make_state(*WORDS[8:]))
+
+    assert index.candidates(make_state(*WORDS[:7], "Notifications")) == [0]
+    assert index.candidates(make_state(*WORDS[:8])) == [0]
+
+
+def test_size_incompatible_states_are_excluded():
+    index = StateIndex(size_tolerance=0.7)
+    index.add(0, make_state(*WORDS[:10]))
+
+    assert index.candidates(make_state(*WORDS[:4])) == []
+    assert index.candidates(make_state(*WORDS[:7])) == [0]
+
+
+def test_empty_and_unhashed_states():
+    index = StateIndex()
+    index.add(0, make_state())
+    index.add(1, make_state("", " "))
+    index.add(2, make_state("Home", "Apps"))
+
+    assert index.candidates(make_state()) == [0]
+    assert index.candidates(make_state("", "")) == [1, 2]
+    assert 1 in index.candidates(make_state("Store", "Camera"))
+    assert len(index) == 3
+
+
+def test_indexed_lookup_matches_linear_scan():
+    rng = random.Random(7)
+    indexed, linear = StateGraph(), StateGraph(use_index=False)
+    for _ in range(40):
+        words = rng.sample(WORDS, rng.randint(3, 10))
+        indexed.add_state(make_state(*words))
+        linear.add_state(make_state(*words))
+
+    for _ in range(200):
+        contents = [b.content for b in rng.choice(linear.nodes).buttons]
+        roll = rng.random()
+        if roll < 0.3:
+            contents = rng.sample(WORDS, rng.randint(3, 10))
+        elif roll < 0.7:
+            contents[rng.randrange(len(contents))] = rng.choice(WORDS) + " Menu"
+        probe = make_state(*contents)
+
+        expected = linear.find_similar_state(probe)
+        found = indexed.find_similar_state(probe)
+        assert (found is None) == (expected is None)
+        if expected is not None:
+            assert found.state_id == expected.state_id
+
+
+def one_typo(rng: random.Random, contents):
+    contents = list(contents)
+    i = rng.randrange(len(contents))
+    if rng.random() < 0.5:
+        contents[i] = rng.choice(WORDS + ["Help", "Cancel", "Save", "Open"])
+    else:
+        text = contents[i]
+        j = rng.randrange(len(text))
+        contents[i] = text[:j] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[j + 1:]
+    return contents
+
+
+def test_indexed_lookup_matches_linear_scan_on_near_misses():
+    rng = random.Random(3)
+    vocabulary = WORDS + ["Help", "Cancel", "Save", "Open"]
+    indexed, linear = StateGraph(), StateGraph(use_index=False)
+    for _ in range(40):
+        words = rng.sample(vocabulary, rng.randint(2, 5))
+        indexed.add_state(make_state(*words))
+        linear.add_state(make_state(*words))
+
+    misses = 0
+    for _ in range(2000):
+        probe = make_state(*one_typo(rng, [b.content for b in rng.choice(linear.nodes).buttons]))
+        expected = linear.find_similar_state(probe)
+        found = indexed.find_similar_state(probe)
+        assert (found is None) == (expected is None)
+        if found is not None:
+            assert indexed.same_states(probe, found)
+        misses += expected is None
+    assert 0 < misses < 2000
+
+
+def test_reported_index_miss_falls_back_to_full_scan():
+    graph = StateGraph()
+    for words in (["Help", "Cancel", "Save"], ["Library", "Store", "Camera", "Guardian"]):
+        graph.add_state(make_state(*words))
+
+    assert graph.find_similar_state(make_state("Help", "Settings", "Save")) is graph.nodes[0]
@@ -0,0 +1,98 @@
+from core_types import Button, State
+from state_graph import StateGraph
+from state_store import StateGraphStore
+
+
+def make_state(*contents) -> State:
+    buttons = [Button(id=str(i), content=content, bbox=[0.1 * i, 0.2, 0.1 * i + 0.08, 0.25],
+                      interactivity=True, source='box_ocr_content_ocr')
+               for i, content in enumerate(contents)]
+    return State(buttons)
+
+
+def build_crashed_run(path: str):
+    store = StateGraphStore(path)
+    graph = StateGraph()
+    graph.attach_store(store)
+
+    home, settings, wifi = make_state("Home", "Settings"), make_state("Wi-Fi", "Back", "About"), make_state("Join")
+    for state in (home, settings, wifi):
+        graph.add_state(state)
+    graph.set_home_state(home)
+    while home.has_unexplored_buttons():
+        home.get_next_unexplored_button()
+    graph.add_edge(home, settings, home.buttons[1])
+    graph.add_edge(home, settings, home.buttons[1])
+    settings.get_next_unexplored_button()
+    graph.add_edge(settings, wifi, settings.buttons[0])
+    graph.add_dead_button(settings.state_id, "1")
+    store.close()
+    return graph
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "state_graph.db")
+    graph = build_crashed_run(path)
+
+    store = StateGraphStore(path)
+    data = store.load()
+    store.close()
+
+    assert [state_id for state_id, _ in data['states']] == [state.state_id for state in graph.nodes]
+    for (_, buttons), state in zip(data['states'], graph.nodes):
+        assert [(b.id, b.content, list(b.bbox)) for b in buttons] == \
+            [(b.id, b.content, list(b.bbox)) for b in state.buttons]
+    assert {state_id: set(ids) for state_id, ids in data['explored'].items()} == \
+        {state.state_id: state.explored_ids for state in graph.nodes if state.explored_ids}
+    assert sorted((f, t, b, c) for f, t, b, c, _ in data['edges']) == \
+        sorted((e.from_state_id, e.to_state_id, e.button.id, e.traversal_count) for e in graph.edges.values())
+    assert set(data['dead_buttons']) == graph.dead_buttons
+    assert data['home_state_id'] == graph.home_state.state_id
+
+
+def test_resume_rebuilds_graph_and_frontier(tmp_path):
+    path = str(tmp_path / "state_graph.db")
+    crashed = build_crashed_run(path)
+
+    store = StateGraphStore(path)
+    resumed = StateGraph()
+    assert resumed.restore_from_store(store) == 3
+    resumed.attach_store(store, write_snapshot=False)
+
+    assert [state.state_id for state in resumed.nodes] == [state.state_id for state in crashed.nodes]
+    assert [state.explored_ids for state in resumed.nodes] == [state.explored_ids for state in crashed.nodes]
+    assert resumed.dead_buttons == crashed.dead_buttons
+    assert resumed.home_state.state_id == crashed.home_state.state_id
+    assert {key: edge.traversal_count for key, edge in resumed.edges.items()} == \
+        {key: edge.traversal_count for key, edge in crashed.edges.items()}
+    assert resumed.get_stats() == crashed.get_stats()
+
+    home, settings, wifi = resumed.nodes
+    assert {state.state_id for state in resumed.get_unexplored_states()} == {settings.state_id, wifi.state_id}
+    target, path_buttons = resumed.find_path_to_frontier(home)
+    assert target is settings and [b.content for b in path_buttons] == ["Settings"]
+
+    while settings.has_unexplored_buttons():
+        settings.get_next_unexplored_button()
+    assert not resumed.is_frontier_state(settings)
+    store.close()
+
+    store = StateGraphStore(path)
+    assert settings.state_id in store.load()['explored']
+    assert set(store.load()['explored'][settings.state_id]) == settings.explored_ids
+    store.close()
+
+
+def test_snapshot_replaces_previous_contents(tmp_path):
+    path = str(tmp_path / "state_graph.db")
+    build_crashed_run(path)
+
+    graph = StateGraph()
+    graph.add_state(make_state("Only"))
+    store = StateGraphStore(path)
+    graph.attach_store(store)
+    data = store.load()
+    store.close()
+
+    assert [state_id for state_id, _ in data['states']] == [graph.nodes[0].state_id]
+    assert data['edges'] == [] and data['dead_buttons'] == [] and data['home_state_id'] is None
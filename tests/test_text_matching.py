@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from text_matching import PatternMatcher, canonical_text, levenshtein, levenshtein_one_to_many
+
+
+def reference_levenshtein(s1: str, s2: str) -> int:
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        current = [i]
+        for j, c2 in enumerate(s2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (c1 != c2)))
+        previous = current
+    return previous[-1]
+
+
+def random_pairs(count: int, alphabet: str, max_length: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        s1 = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        if rng.random() < 0.5:
+            s2 = list(s1)
+            for _ in range(rng.randint(0, 4)):
+                position = rng.randint(0, len(s2))
+                operation = rng.choice(('insert', 'delete', 'replace'))
+                if operation == 'insert':
+                    s2.insert(position, rng.choice(alphabet))
+                elif s2 and position < len(s2):
+                    if operation == 'delete':
+                        del s2[position]
+                    else:
+                        s2[position] = rng.choice(alphabet)
+            s2 = ''.join(s2)
+        else:
+            s2 = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        yield s1, s2
+
+
+@pytest.mark.parametrize("alphabet,max_length,seed", [
+    ("ab", 12, 0),
+    ("abcdef", 30, 1),
+    ("abcdefghijklmnopqrstuvwxyz 0123456789", 90, 2),
+])
+def test_myers_matches_dynamic_programming(alphabet, max_length, seed):
+    for s1, s2 in random_pairs(400, alphabet, max_length, seed):
+        expected = reference_levenshtein(s1, s2)
+        assert levenshtein(s1, s2) == expected, (s1, s2)
+        assert PatternMatcher(s1).distance(s2) == expected, (s1, s2)
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 3, 8])
+def test_bounded_distance_saturates_at_limit(max_distance):
+    for s1, s2 in random_pairs(400, "abcde", 40, max_distance):
+        expected = reference_levenshtein(s1, s2)
+        assert levenshtein(s1, s2, max_distance) == min(expected, max_distance + 1), (s1, s2)
+
+
+def test_edge_cases():
+    assert levenshtein("", "") == 0
+    assert levenshtein("", "settings") == 8
+    assert levenshtein("settings", "") == 8
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("x" * 70, "x" * 69 + "y") == 1
+
+
+def test_one_to_many_matches_pairwise():
+    candidates = ["settings", "setting", "options", "", "sett1ngs"]
+    assert levenshtein_one_to_many("settings", candidates) == \
+        [reference_levenshtein("settings", c) for c in candidates]
+    assert levenshtein_one_to_many("settings", candidates, max_distance=2) == \
+        [min(reference_levenshtein("settings", c), 3) for c in candidates]
+
+
+def test_canonical_text_folds_ocr_confusions():
+    assert canonical_text("  Sett1ngs ") == canonical_text("settings")
+    assert canonical_text("rnenu") == canonical_text("menu")
+    assert canonical_text("C0ntinue") == canonical_text("continue")